@@ -106,6 +106,7 @@ DEFAULTS = {
     'settings_window_resizable': False,
     "limited_apps_history": ["Spotify"],
     "history_ignored_apps": ["Hyprshot"],
+    "notification_history_limit": 50,
     "selected_monitors": [],  # Empty array means show on all monitors
     "log_level": "INFO"
 }
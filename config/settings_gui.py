@@ -859,6 +859,24 @@ class HyprConfGUI(Window):
         )
         notif_grid.attach(ignored_apps_hint, 0, 3, 2, 1)
 
+        # History Retention
+        history_limit_label = Label(
+            label="History Size:", h_align="start", v_align="center"
+        )
+        notif_grid.attach(history_limit_label, 0, 4, 1, 1)
+
+        self.history_limit_scale = Scale(
+            min_value=10,
+            max_value=500,
+            value=bind_vars.get("notification_history_limit", 50),
+            increments=(10, 50),
+            draw_value=True,
+            value_position="right",
+            digits=0,
+            h_expand=True,
+        )
+        notif_grid.attach(self.history_limit_scale, 1, 4, 1, 1)
+
         metrics_header = Label(markup="<b>System Metrics Options</b>", h_align="start")
         vbox.add(metrics_header)
         metrics_grid = Gtk.Grid(
@@ -1143,6 +1161,9 @@ class HyprConfGUI(Window):
         current_bind_vars_snapshot["history_ignored_apps"] = parse_app_list(
             self.ignored_apps_entry.get_text()
         )
+        current_bind_vars_snapshot["notification_history_limit"] = int(
+            self.history_limit_scale.value
+        )
 
         # Save monitor selection
         selected_monitors = []
@@ -1467,6 +1488,9 @@ class HyprConfGUI(Window):
             ignored_apps_list = DEFAULTS.get("history_ignored_apps", ["Hyprshot"])
             ignored_apps_text = ", ".join(f'"{app}"' for app in ignored_apps_list)
             self.ignored_apps_entry.set_text(ignored_apps_text)
+            self.history_limit_scale.set_value(
+                DEFAULTS.get("notification_history_limit", 50)
+            )
 
             # Reset monitor selection
             default_monitors = DEFAULTS.get("selected_monitors", [])
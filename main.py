@@ -17,6 +17,7 @@ from modules.dock import Dock
 from modules.notch import Notch
 from modules.notifications import NotificationPopup
 from modules.updater import run_updater
+from services.command_server import CommandServer
 
 fonts_updated_file = f"{CACHE_DIR}/fonts_updated"
 
@@ -176,4 +177,30 @@ if __name__ == "__main__":
 
     app.set_css = set_css
     app.set_css()
+
+    # Keybinds reach the shell through this socket (scripts/ax_send.py);
+    # open_notch itself moves to the focused monitor's notch
+    commands = CommandServer.get_initial()
+
+    def open_module(module: str):
+        if not module:
+            raise ValueError("missing module name")
+        notch.open_notch(module)
+
+    commands.register("open", open_module, "open <module>: open (or toggle) a notch module")
+    commands.register("close", lambda _: notch.close_notch(), "close: close the notch")
+    commands.register(
+        "random-wallpaper",
+        lambda _: notch.dashboard.wallpapers.set_random_wallpaper(None, external=True),
+        "random-wallpaper: set a random wallpaper",
+    )
+    commands.register(
+        "toggle-caffeine",
+        lambda _: notch.dashboard.widgets.buttons.caffeine_button.toggle_inhibit(external=True),
+        "toggle-caffeine: toggle the idle inhibitor",
+    )
+    commands.register("reload-css", lambda _: app.set_css(), "reload-css: reload the stylesheet")
+    commands.start()
+
     app.run()
+    commands.stop()
@@ -1,16 +1,15 @@
-import subprocess
-
 import gi
 from fabric.utils.helpers import exec_shell_command_async
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.label import Label
-from gi.repository import Gdk, GLib, Gtk
+from gi.repository import Gdk, Gtk
 
 import config.data as data
 
 gi.require_version('Gtk', '3.0')
 import modules.icons as icons
+from services.process_watch import ProcessWatch
 
 def add_hover_cursor(widget):
     widget.add_events(Gdk.EventMask.ENTER_NOTIFY_MASK | Gdk.EventMask.LEAVE_NOTIFY_MASK)
@@ -62,6 +61,11 @@ class NightModeButton(Button):
         add_hover_cursor(self)
 
         self.widgets = [self, self.night_mode_label, self.night_mode_status, self.night_mode_icon]
+
+        self.process_watch = ProcessWatch.get_initial()
+        self.process_watch.watch("hyprsunset", "hyprsunset")
+        self.process_watch.connect("started", self._on_process_state)
+        self.process_watch.connect("stopped", self._on_process_state)
         self.check_hyprsunset()
 
     def toggle_hyprsunset(self, *args):
@@ -70,19 +74,19 @@ class NightModeButton(Button):
           - If running, kill it and mark as 'Disabled'.
           - If not running, start it and mark as 'Enabled'.
         """
-        GLib.Thread.new("hyprsunset-toggle", self._toggle_hyprsunset_thread, None)
-    
-    def _toggle_hyprsunset_thread(self, user_data):
-        """Background thread to check and toggle hyprsunset without blocking UI."""
-        try:
-            subprocess.check_output(["pgrep", "hyprsunset"])
-            exec_shell_command_async("pkill hyprsunset")
-            GLib.idle_add(self.night_mode_status.set_label, "Disabled")
-            GLib.idle_add(self._add_disabled_style)
-        except subprocess.CalledProcessError:
-            exec_shell_command_async("hyprsunset -t 3500")
-            GLib.idle_add(self.night_mode_status.set_label, "Enabled")
-            GLib.idle_add(self._remove_disabled_style)
+        if self.process_watch.is_running("hyprsunset"):
+            self.process_watch.terminate("hyprsunset")
+            self._set_enabled(False)
+        else:
+            self.process_watch.spawn("hyprsunset", ["hyprsunset", "-t", "3500"])
+            self._set_enabled(True)
+
+    def _set_enabled(self, enabled):
+        self.night_mode_status.set_label("Enabled" if enabled else "Disabled")
+        if enabled:
+            self._remove_disabled_style()
+        else:
+            self._add_disabled_style()
     
     def _add_disabled_style(self):
         """Helper to add disabled style to all widgets."""
@@ -94,21 +98,15 @@ class NightModeButton(Button):
         for widget in self.widgets:
             widget.remove_style_class("disabled")
 
+    def _on_process_state(self, _watch, name):
+        if name == "hyprsunset":
+            self.check_hyprsunset()
+
     def check_hyprsunset(self, *args):
         """
         Update the button state based on whether hyprsunset is running.
         """
-        GLib.Thread.new("hyprsunset-check", self._check_hyprsunset_thread, None)
-    
-    def _check_hyprsunset_thread(self, user_data):
-        """Background thread to check hyprsunset status without blocking UI."""
-        try:
-            subprocess.check_output(["pgrep", "hyprsunset"])
-            GLib.idle_add(self.night_mode_status.set_label, "Enabled")
-            GLib.idle_add(self._remove_disabled_style)
-        except subprocess.CalledProcessError:
-            GLib.idle_add(self.night_mode_status.set_label, "Disabled")
-            GLib.idle_add(self._add_disabled_style)
+        self._set_enabled(self.process_watch.is_running("hyprsunset"))
 
 class CaffeineButton(Button):
     def __init__(self):
@@ -150,6 +148,11 @@ class CaffeineButton(Button):
         add_hover_cursor(self)
 
         self.widgets = [self, self.caffeine_label, self.caffeine_status, self.caffeine_icon]
+
+        self.process_watch = ProcessWatch.get_initial()
+        self.process_watch.watch("ax-inhibit", "ax-inhibit")
+        self.process_watch.connect("started", self._on_process_state)
+        self.process_watch.connect("stopped", self._on_process_state)
         self.check_inhibit()
 
     def toggle_inhibit(self, *args, external=False):
@@ -158,25 +161,28 @@ class CaffeineButton(Button):
           - If running, kill it and mark as 'Disabled' (add 'disabled' class).
           - If not running, start it and mark as 'Enabled' (remove 'disabled' class).
         """
-        GLib.Thread.new("caffeine-toggle", self._toggle_inhibit_thread, external)
-    
-    def _toggle_inhibit_thread(self, external):
-        """Background thread to toggle inhibit without blocking UI."""
-        try:
-            subprocess.check_output(["pgrep", "ax-inhibit"])
-            exec_shell_command_async("pkill ax-inhibit")
-            GLib.idle_add(self.caffeine_status.set_label, "Disabled")
-            GLib.idle_add(self._add_disabled_style)
-        except subprocess.CalledProcessError:
-            exec_shell_command_async(f"python {data.HOME_DIR}/.config/{data.APP_NAME_CAP}/scripts/inhibit.py")
-            GLib.idle_add(self.caffeine_status.set_label, "Enabled")
-            GLib.idle_add(self._remove_disabled_style)
+        if self.process_watch.is_running("ax-inhibit"):
+            self.process_watch.terminate("ax-inhibit")
+            self._set_enabled(False)
+        else:
+            self.process_watch.spawn(
+                "ax-inhibit",
+                ["python", f"{data.HOME_DIR}/.config/{data.APP_NAME_CAP}/scripts/inhibit.py"],
+            )
+            self._set_enabled(True)
 
         if external:
             # Different if enabled or disabled
             status = "Disabled" if self.caffeine_status.get_label() == "Disabled" else "Enabled"
             message = "Disabled 💤" if status == "Disabled" else "Enabled ☀️"
             exec_shell_command_async(f"notify-send '☕ Caffeine' '{message}' -a '{data.APP_NAME_CAP}' -e")
+
+    def _set_enabled(self, enabled):
+        self.caffeine_status.set_label("Enabled" if enabled else "Disabled")
+        if enabled:
+            self._remove_disabled_style()
+        else:
+            self._add_disabled_style()
     
     def _add_disabled_style(self):
         """Helper to add disabled style to all widgets."""
@@ -188,18 +194,12 @@ class CaffeineButton(Button):
         for widget in self.widgets:
             widget.remove_style_class("disabled")
 
+    def _on_process_state(self, _watch, name):
+        if name == "ax-inhibit":
+            self.check_inhibit()
+
     def check_inhibit(self, *args):
-        GLib.Thread.new("caffeine-check", self._check_inhibit_thread, None)
-    
-    def _check_inhibit_thread(self, user_data):
-        """Background thread to check inhibit status without blocking UI."""
-        try:
-            subprocess.check_output(["pgrep", "ax-inhibit"])
-            GLib.idle_add(self.caffeine_status.set_label, "Enabled")
-            GLib.idle_add(self._remove_disabled_style)
-        except subprocess.CalledProcessError:
-            GLib.idle_add(self.caffeine_status.set_label, "Disabled")
-            GLib.idle_add(self._add_disabled_style)
+        self._set_enabled(self.process_watch.is_running("ax-inhibit"))
 
 class Buttons(Gtk.Grid):
     def __init__(self, **kwargs):
@@ -1,4 +1,3 @@
-from fabric.audio.service import Audio
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.circularprogressbar import CircularProgressBar
@@ -17,6 +16,7 @@ from gi.repository import Gdk, GLib
 import json
 import config.data as data
 import modules.icons as icons
+from services.audio_control import AudioControl
 from services.brightness import Brightness
 from utils.debounce import DebouncedSetter
 from config.loguru_config import logger
@@ -32,7 +32,8 @@ def pct_int(x) -> int:
 class VolumeSmall(Box):
     def __init__(self, **kwargs):
         super().__init__(name="button-bar-vol", **kwargs)
-        self.audio = Audio()
+        self.control = AudioControl.get_initial()
+        self.audio = self.control.audio
         self.progress_bar = CircularProgressBar(
             name="button-volume", size=28, line_width=2,
             start_angle=150, end_angle=390,
@@ -43,40 +44,23 @@ class VolumeSmall(Box):
             events=["scroll", "smooth-scroll"],
             child=Overlay(child=self.progress_bar, overlays=self.vol_button),
         )
-        self.audio.connect("notify::speaker", self.on_new_speaker)
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
+        self.control.connect("changed", lambda _, kind: kind == "speaker" and self.on_speaker_changed())
         self.event_box.connect("scroll-event", self.on_scroll)
         self.add(self.event_box)
         self.on_speaker_changed()
         self.add_events(Gdk.EventMask.SCROLL_MASK | Gdk.EventMask.SMOOTH_SCROLL_MASK)
 
-    def on_new_speaker(self, *_):
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
-            self.on_speaker_changed()
-
     def toggle_mute(self, _):
-        current_stream = self.audio.speaker
-        if current_stream:
-            current_stream.muted = not current_stream.muted
-            if current_stream.muted:
-                self.on_speaker_changed()
-                self.progress_bar.add_style_class("muted")
-                self.vol_label.add_style_class("muted")
-            else:
-                self.on_speaker_changed()
-                self.progress_bar.remove_style_class("muted")
-                self.vol_label.remove_style_class("muted")
+        self.control.toggle_mute("speaker")
 
     def on_scroll(self, _, event):
         if self.audio.speaker and event.direction == Gdk.ScrollDirection.SMOOTH:
-            v = self.audio.speaker.volume
+            v = self.control.volume("speaker")
             if abs(event.delta_y) > 0:
                 v = pct_int(v - event.delta_y)
             if abs(event.delta_x) > 0:
                 v = pct_int(v + event.delta_x)
-            self.audio.speaker.volume = v
+            self.control.set_volume("speaker", v)
 
     def on_speaker_changed(self, *_):
         if not self.audio.speaker:
@@ -93,7 +77,8 @@ class VolumeSmall(Box):
             vol_mute_icon = icons.bluetooth_off
             vol_off_icon = icons.bluetooth_disconnected
 
-        self.progress_bar.value = self.audio.speaker.volume / 100
+        volume = self.control.volume("speaker")
+        self.progress_bar.value = volume / 100
 
         if self.audio.speaker.muted:
             self.vol_button.get_child().set_markup(vol_mute_icon)
@@ -104,10 +89,10 @@ class VolumeSmall(Box):
         else:
             self.progress_bar.remove_style_class("muted")
             self.vol_label.remove_style_class("muted")
-        self.set_tooltip_text(f"{round(self.audio.speaker.volume)}%")
-        if self.audio.speaker.volume > 74:
+        self.set_tooltip_text(f"{round(volume)}%")
+        if volume > 74:
             self.vol_button.get_child().set_markup(vol_high_icon)
-        elif self.audio.speaker.volume > 0:
+        elif volume > 0:
             self.vol_button.get_child().set_markup(vol_medium_icon)
         else:
             self.vol_button.get_child().set_markup(vol_off_icon)
@@ -115,7 +100,8 @@ class VolumeSmall(Box):
 class MicSmall(Box):
     def __init__(self, **kwargs):
         super().__init__(name="button-bar-mic", **kwargs)
-        self.audio = Audio()
+        self.control = AudioControl.get_initial()
+        self.audio = self.control.audio
         self.progress_bar = CircularProgressBar(
             name="button-mic", size=28, line_width=2,
             start_angle=150, end_angle=390,
@@ -126,40 +112,23 @@ class MicSmall(Box):
             events=["scroll", "smooth-scroll"],
             child=Overlay(child=self.progress_bar, overlays=self.mic_button),
         )
-        self.audio.connect("notify::microphone", self.on_new_microphone)
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
+        self.control.connect("changed", lambda _, kind: kind == "microphone" and self.on_microphone_changed())
         self.event_box.connect("scroll-event", self.on_scroll)
         self.add_events(Gdk.EventMask.SCROLL_MASK | Gdk.EventMask.SMOOTH_SCROLL_MASK)
         self.add(self.event_box)
         self.on_microphone_changed()
 
-    def on_new_microphone(self, *_):
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
-            self.on_microphone_changed()
-
     def toggle_mute(self, _):
-        current_stream = self.audio.microphone
-        if current_stream:
-            current_stream.muted = not current_stream.muted
-            if current_stream.muted:
-                self.mic_button.get_child().set_markup(icons.mic_mute)
-                self.progress_bar.add_style_class("muted")
-                self.mic_label.add_style_class("muted")
-            else:
-                self.on_microphone_changed()
-                self.progress_bar.remove_style_class("muted")
-                self.mic_label.remove_style_class("muted")
+        self.control.toggle_mute("microphone")
 
     def on_scroll(self, _, event):
         if self.audio.microphone and event.direction == Gdk.ScrollDirection.SMOOTH:
-            v = self.audio.microphone.volume
+            v = self.control.volume("microphone")
             if abs(event.delta_y) > 0:
                 v = pct_int(v - event.delta_y)
             if abs(event.delta_x) > 0:
                 v = pct_int(v + event.delta_x)
-            self.audio.microphone.volume = v
+            self.control.set_volume("microphone", v)
 
     def on_microphone_changed(self, *_):
         if not self.audio.microphone:
@@ -173,17 +142,33 @@ class MicSmall(Box):
         else:
             self.progress_bar.remove_style_class("muted")
             self.mic_label.remove_style_class("muted")
-        self.progress_bar.value = self.audio.microphone.volume / 100
-        self.set_tooltip_text(f"{round(self.audio.microphone.volume)}%")
-        if self.audio.microphone.volume >= 1:
+        volume = self.control.volume("microphone")
+        self.progress_bar.value = volume / 100
+        self.set_tooltip_text(f"{round(volume)}%")
+        if volume >= 1:
             self.mic_button.get_child().set_markup(icons.mic)
         else:
             self.mic_button.get_child().set_markup(icons.mic_mute)
 
+def _scroll_step(event, current_volume, step_size=5):
+    """New volume for a scroll event on the dashboard icons, or None."""
+    if event.direction == Gdk.ScrollDirection.SMOOTH:
+        if event.delta_y < 0:
+            return pct_int(current_volume + step_size)
+        if event.delta_y > 0:
+            return pct_int(current_volume - step_size)
+        return None
+    if event.direction == Gdk.ScrollDirection.UP:
+        return pct_int(current_volume + step_size)
+    if event.direction == Gdk.ScrollDirection.DOWN:
+        return pct_int(current_volume - step_size)
+    return None
+
 class VolumeIcon(Box):
     def __init__(self, **kwargs):
         super().__init__(name="vol-icon", **kwargs)
-        self.audio = Audio()
+        self.control = AudioControl.get_initial()
+        self.audio = self.control.audio
 
         self.vol_label = Label(name="vol-label-dash", markup="", h_align="center", v_align="center", h_expand=True, v_expand=True)
         self.vol_button = Button(on_clicked=self.toggle_mute, child=self.vol_label, h_align="center", v_align="center", h_expand=True, v_expand=True)
@@ -199,13 +184,9 @@ class VolumeIcon(Box):
         self.event_box.connect("scroll-event", self.on_scroll)
         self.add(self.event_box)
 
-        self._pending_value = None
-        self._update_source_id = None
         self._periodic_update_source_id = None
 
-        self.audio.connect("notify::speaker", self.on_new_speaker)
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
+        self.control.connect("changed", lambda _, kind: kind == "speaker" and self.on_speaker_changed())
 
         self._periodic_update_source_id = GLib.timeout_add_seconds(1, self.update_device_icon)
         self.add_events(Gdk.EventMask.SCROLL_MASK | Gdk.EventMask.SMOOTH_SCROLL_MASK)
@@ -213,49 +194,12 @@ class VolumeIcon(Box):
     def on_scroll(self, _, event):
         if not self.audio.speaker:
             return
-
-        step_size = 5
-        current_volume = self.audio.speaker.volume
-
-        if event.direction == Gdk.ScrollDirection.SMOOTH:
-            if event.delta_y < 0:
-                new_volume = pct_int(current_volume + step_size)
-            elif event.delta_y > 0:
-                new_volume = pct_int(current_volume - step_size)
-            else:
-                return
-        else:
-            if event.direction == Gdk.ScrollDirection.UP:
-                new_volume = pct_int(current_volume + step_size)
-            elif event.direction == Gdk.ScrollDirection.DOWN:
-                new_volume = pct_int(current_volume - step_size)
-            else:
-                return
-
-        self._pending_value = new_volume
-        if self._update_source_id is None:
-            self._update_source_id = GLib.timeout_add(50, self._update_volume_callback)
-
-    def _update_volume_callback(self):
-        if self._pending_value is not None and self._pending_value != self.audio.speaker.volume:
-            self.audio.speaker.volume = self._pending_value
-            self._pending_value = None
-            return True
-        else:
-            self._update_source_id = None
-            return False
-
-    def on_new_speaker(self, *_):
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
-            self.on_speaker_changed()
+        new_volume = _scroll_step(event, self.control.volume("speaker"))
+        if new_volume is not None:
+            self.control.set_volume("speaker", new_volume)
 
     def toggle_mute(self, _):
-        current_stream = self.audio.speaker
-        if current_stream:
-            current_stream.muted = not current_stream.muted
-
-            self.on_speaker_changed()
+        self.control.toggle_mute("speaker")
 
     def on_speaker_changed(self, *_):
         if not self.audio.speaker:
@@ -279,7 +223,7 @@ class VolumeIcon(Box):
             self.vol_button.remove_style_class("muted")
 
             self.update_device_icon()
-            self.set_tooltip_text(f"{round(self.audio.speaker.volume)}%")
+            self.set_tooltip_text(f"{round(self.control.volume('speaker'))}%")
 
     def update_device_icon(self):
         if not self.audio.speaker:
@@ -303,9 +247,6 @@ class VolumeIcon(Box):
         return True
 
     def destroy(self):
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-
         if hasattr(self, '_periodic_update_source_id') and self._periodic_update_source_id is not None:
             GLib.source_remove(self._periodic_update_source_id)
         super().destroy()
@@ -313,7 +254,8 @@ class VolumeIcon(Box):
 class MicIcon(Box):
     def __init__(self, **kwargs):
         super().__init__(name="mic-icon", **kwargs)
-        self.audio = Audio()
+        self.control = AudioControl.get_initial()
+        self.audio = self.control.audio
 
         self.mic_label = Label(name="mic-label-dash", markup=icons.mic, h_align="center", v_align="center", h_expand=True, v_expand=True)
         self.mic_button = Button(on_clicked=self.toggle_mute, child=self.mic_label, h_align="center", v_align="center", h_expand=True, v_expand=True)
@@ -329,67 +271,19 @@ class MicIcon(Box):
         self.event_box.connect("scroll-event", self.on_scroll)
         self.add(self.event_box)
 
-        self._pending_value = None
-        self._update_source_id = None
-
-        self.audio.connect("notify::microphone", self.on_new_microphone)
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
+        self.control.connect("changed", lambda _, kind: kind == "microphone" and self.on_microphone_changed())
         self.on_microphone_changed()
         self.add_events(Gdk.EventMask.SCROLL_MASK | Gdk.EventMask.SMOOTH_SCROLL_MASK)
 
     def on_scroll(self, _, event):
         if not self.audio.microphone:
             return
-
-        step_size = 5
-        current_volume = self.audio.microphone.volume
-
-        if event.direction == Gdk.ScrollDirection.SMOOTH:
-            if event.delta_y < 0:
-                new_volume = pct_int(current_volume + step_size)
-            elif event.delta_y > 0:
-                new_volume = pct_int(current_volume - step_size)
-            else:
-                return
-        else:
-            if event.direction == Gdk.ScrollDirection.UP:
-                new_volume = pct_int(current_volume + step_size)
-            elif event.direction == Gdk.ScrollDirection.DOWN:
-                new_volume = pct_int(current_volume - step_size)
-            else:
-                return
-
-        self._pending_value = new_volume
-        if self._update_source_id is None:
-            self._update_source_id = GLib.timeout_add(50, self._update_volume_callback)
-
-    def _update_volume_callback(self):
-        if self._pending_value is not None and self._pending_value != self.audio.microphone.volume:
-            self.audio.microphone.volume = self._pending_value
-            self._pending_value = None
-            return True
-        else:
-            self._update_source_id = None
-            return False
-
-    def on_new_microphone(self, *_):
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
-            self.on_microphone_changed()
+        new_volume = _scroll_step(event, self.control.volume("microphone"))
+        if new_volume is not None:
+            self.control.set_volume("microphone", new_volume)
 
     def toggle_mute(self, _):
-        current_stream = self.audio.microphone
-        if current_stream:
-            current_stream.muted = not current_stream.muted
-            if current_stream.muted:
-                self.mic_button.get_child().set_markup(icons.mic_mute)
-                self.mic_label.add_style_class("muted")
-                self.mic_button.add_style_class("muted")
-            else:
-                self.on_microphone_changed()
-                self.mic_label.remove_style_class("muted")
-                self.mic_button.remove_style_class("muted")
+        self.control.toggle_mute("microphone")
 
     def on_microphone_changed(self, *_):
         if not self.audio.microphone:
@@ -398,96 +292,77 @@ class MicIcon(Box):
             self.mic_button.get_child().set_markup(icons.mic_mute)
             self.add_style_class("muted")
             self.mic_label.add_style_class("muted")
+            self.mic_button.add_style_class("muted")
             self.set_tooltip_text("Muted")
             return
         else:
             self.remove_style_class("muted")
             self.mic_label.remove_style_class("muted")
+            self.mic_button.remove_style_class("muted")
 
-        self.set_tooltip_text(f"{round(self.audio.microphone.volume)}%")
-        if self.audio.microphone.volume >= 1:
+        volume = self.control.volume("microphone")
+        self.set_tooltip_text(f"{round(volume)}%")
+        if volume >= 1:
             self.mic_button.get_child().set_markup(icons.mic)
         else:
             self.mic_button.get_child().set_markup(icons.mic_filled)
 
-    def destroy(self):
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-        super().destroy()
+class _AudioSlider(Scale):
+    """Slider bound to one default device through the shared AudioControl."""
+
+    kind = ""
 
-class VolumeSlider(Scale):
     def __init__(self, **kwargs):
         super().__init__(
             name="control-slider",
             orientation="h",
             h_expand=True,
-            h_align="fill",
             has_origin=True,
             increments=(0.01, 0.1),
             **kwargs,
         )
-        self.audio = Audio()
-        self.audio.connect("notify::speaker", self.on_new_speaker)
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
+        self.control = AudioControl.get_initial()
+        self.audio = self.control.audio
+        self._syncing = False
+        self.control.connect("changed", lambda _, kind: kind == self.kind and self.on_device_changed())
         self.connect("value-changed", self.on_value_changed)
-        self.add_style_class("vol")
-        self.on_speaker_changed()
-
-    def on_new_speaker(self, *_):
-        if self.audio.speaker:
-            self.audio.speaker.connect("changed", self.on_speaker_changed)
-            self.on_speaker_changed()
+        self.connect("button-release-event", lambda *_: self.control.flush(self.kind))
+        self.on_device_changed()
 
     def on_value_changed(self, _):
-        if self.audio.speaker:
-            self.audio.speaker.volume = pct_int(self.value * 100)
+        if self._syncing or not self.control.stream(self.kind):
+            return
+        self.control.set_volume(self.kind, pct_int(self.value * 100))
 
-    def on_speaker_changed(self, *_):
-        if not self.audio.speaker:
+    def on_device_changed(self, *_):
+        if not self.control.stream(self.kind):
             return
-        self.value = self.audio.speaker.volume / 100
-        if self.audio.speaker.muted:
+        # Updates from the service must not be written back
+        self._syncing = True
+        try:
+            self.value = self.control.volume(self.kind) / 100
+        finally:
+            self._syncing = False
+        if self.control.muted(self.kind):
             self.add_style_class("muted")
         else:
             self.remove_style_class("muted")
 
 
-class MicSlider(Scale):
+class VolumeSlider(_AudioSlider):
+    kind = "speaker"
+
     def __init__(self, **kwargs):
-        super().__init__(
-            name="control-slider",
-            orientation="h",
-            h_expand=True,
-            has_origin=True,
-            increments=(0.01, 0.1),
-            **kwargs,
-        )
-        self.audio = Audio()
-        self.audio.connect("notify::microphone", self.on_new_microphone)
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
-        self.connect("value-changed", self.on_value_changed)
-        self.add_style_class("mic")
-        self.on_microphone_changed()
+        super().__init__(h_align="fill", **kwargs)
+        self.add_style_class("vol")
 
-    def on_new_microphone(self, *_):
-        if self.audio.microphone:
-            self.audio.microphone.connect("changed", self.on_microphone_changed)
-            self.on_microphone_changed()
 
-    def on_value_changed(self, _):
-        if self.audio.microphone:
-            self.audio.microphone.volume = pct_int(self.value * 100)
+class MicSlider(_AudioSlider):
+    kind = "microphone"
 
-    def on_microphone_changed(self, *_):
-        if not self.audio.microphone:
-            return
-        self.value = self.audio.microphone.volume / 100
-        if self.audio.microphone.muted:
-            self.add_style_class("muted")
-        else:
-            self.remove_style_class("muted")
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.add_style_class("mic")
 
 
 class BrightnessSlider(Scale):
@@ -516,7 +391,9 @@ class BrightnessSlider(Scale):
         def _apply(v: int):
             v = pct_int(v)
             bus = getattr(self.client, "primary_bus", None)
-            if bus is not None and hasattr(self.client, "set_percent"):
+            if self._uses_internal():
+                self.client.screen_brightness = int(round(v / 100 * self.client.max_screen))
+            elif bus is not None and hasattr(self.client, "set_percent"):
                 self.client.set_percent(bus, v)
             elif hasattr(self.client, "set_all_percent"):
                 self.client.set_all_percent(v)
@@ -531,6 +408,7 @@ class BrightnessSlider(Scale):
 
         # listen to service
         self.client.connect("external", self.on_brightness_changed)
+        self.client.connect("notify::screen-brightness", self.on_brightness_changed)
         try:
             self.client.connect("displays_changed", self._on_displays_changed)
         except Exception:
@@ -545,14 +423,21 @@ class BrightnessSlider(Scale):
 
     # --- helpers ---
 
+    def _uses_internal(self) -> bool:
+        # Laptop panel drives the slider only when no external display is present
+        return getattr(self.client, "external_count", 0) <= 0 and getattr(self.client, "max_screen", -1) > 0
+
     def _on_displays_changed(self, *_):
-        if getattr(self.client, "external_count", 0) > 0:
+        if getattr(self.client, "external_count", 0) > 0 or self._uses_internal():
             self.set_sensitive(True)
             self._set_value_from_client()
         else:
             self.set_sensitive(False)
 
     def _avg_percent(self) -> int:
+        if self._uses_internal():
+            cur = self.client.screen_brightness
+            return int(round(cur / self.client.max_screen * 100)) if cur >= 0 else -1
         try:
             bus = getattr(self.client, "primary_bus", None)
             if bus is not None:
@@ -684,8 +569,7 @@ class BrightnessSmall(Box):
             self.client.connect("displays_changed", self._maybe_show)
         except Exception:
             pass
-        # Poll once a second as a fallback until internal props show up
-        GLib.timeout_add_seconds(1, self._maybe_show)
+        # The internal backlight is known as soon as the service exists
         self._maybe_show()
 
         self.progress_bar.connect("notify::value", self.on_progress_value_changed)
@@ -705,11 +589,11 @@ class BrightnessSmall(Box):
         return has_internal or has_external
 
     def _maybe_show(self, *_):
-        if self._has_any() and not self.get_visible():
-            self.show_all()
+        if self._has_any():
+            if not self.get_visible():
+                self.show_all()
         else:
             self.hide()
-        return not self._has_any()
 
     def _apply_pct(self, pct: int):
         pct = max(0, min(100, int(pct)))
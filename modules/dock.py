@@ -1,9 +1,7 @@
 import json
-import logging
 
-import cairo
 from fabric.hyprland.widgets import get_hyprland_connection
-from fabric.utils import (exec_shell_command, exec_shell_command_async, get_relative_path, idle_add, remove_handler)
+from fabric.utils import (exec_shell_command, exec_shell_command_async, idle_add, remove_handler)
 from fabric.utils.helpers import get_desktop_applications
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
@@ -14,57 +12,13 @@ from gi.repository import Gdk, GLib, Gtk
 
 import config.data as data
 from modules.corners import MyCorner
+from services.pinned_apps import PinnedApps, app_data_from_desktop_app
 from utils.icon_resolver import IconResolver
+from utils.drag_surface import set_drag_icon
 from utils.occlusion import check_occlusion
 from widgets.wayland import WaylandWindow as Window
 
 
-def read_config():
-    """Read and return the full configuration from the JSON file, handling missing file."""
-    config_path = get_relative_path("../config/dock.json")
-    try:
-        with open(config_path, "r") as file:
-            config_data = json.load(file)
-            
-        if "pinned_apps" in config_data and config_data["pinned_apps"] and isinstance(config_data["pinned_apps"][0], str):
-            all_apps = get_desktop_applications()
-            app_map = {app.name: app for app in all_apps if app.name}
-            
-            old_pinned = config_data["pinned_apps"]
-            config_data["pinned_apps"] = []
-            
-            for app_id in old_pinned:
-                app = app_map.get(app_id)
-                if app:
-                    app_data_obj = {
-                        "name": app.name,
-                        "display_name": app.display_name,
-                        "window_class": app.window_class,
-                        "executable": app.executable,
-                        "command_line": app.command_line
-                    }
-                    config_data["pinned_apps"].append(app_data_obj)
-                else:
-                    config_data["pinned_apps"].append({"name": app_id})
-                
-    except (FileNotFoundError, json.JSONDecodeError):
-        config_data = {"pinned_apps": []}
-    return config_data
-
-def create_surface_from_widget(widget: Gtk.Widget) -> cairo.ImageSurface:
-    alloc = widget.get_allocation()
-    surface = cairo.ImageSurface(
-        cairo.Format.ARGB32,
-        alloc.width,
-        alloc.height,
-    )
-    cr = cairo.Context(surface)
-    cr.set_source_rgba(255, 255, 255, 0)
-    cr.rectangle(0, 0, alloc.width, alloc.height)
-    cr.fill()
-    widget.draw(cr)
-    return surface
-
 class Dock(Window):
     _instances = []
     
@@ -128,11 +82,10 @@ class Dock(Window):
             main_box_orientation_val = Gtk.Orientation.VERTICAL
             main_box_h_align_val = "center"
 
-        self.config = read_config()
+        self.pinned_store = PinnedApps.get_initial()
+        self._ignore_pinned_change = False
         self.conn = get_hyprland_connection()
         self.icon_resolver = IconResolver() 
-        self.pinned = self.config.get("pinned_apps", [])
-        self.config_path = get_relative_path("../config/dock.json")
         self.app_map = {}
         self._all_apps = get_desktop_applications()
         self.app_identifiers = self._build_app_identifiers_map()
@@ -280,13 +233,22 @@ class Dock(Window):
         if not self.integrated_mode:
             self.conn.connect("event::workspace", self.check_hide)
         
-        GLib.timeout_add_seconds(1, self.check_config_change)
+        self.pinned_store.connect("changed", self._on_pinned_changed)
         if getattr(self, "_deferred_all_visible", False):
             self.show_all()
         elif getattr(self, "_deferred_visible", False):
             self.show()
 
-            
+
+    @property
+    def pinned(self):
+        return self.pinned_store.pinned
+
+    def _on_pinned_changed(self, *args):
+        if self._ignore_pinned_change:
+            return
+        self.update_dock()
+
     def _build_app_identifiers_map(self):
         identifiers = {}
         for app in self._all_apps:
@@ -314,7 +276,7 @@ class Dock(Window):
 
     def on_drag_begin(self, widget, drag_context):
         self._drag_in_progress = True
-        Gtk.drag_set_icon_surface(drag_context, create_surface_from_widget(widget))
+        set_drag_icon(drag_context, widget)
 
     def _on_hover_enter(self, *args):
         if self.integrated_mode: return 
@@ -388,20 +350,16 @@ class Dock(Window):
         display_name = None
         
         if desktop_app:
-            icon_img = desktop_app.get_icon_pixbuf(size=self.icon_size) 
             display_name = desktop_app.display_name or desktop_app.name
         
         id_value = app_identifier["name"] if isinstance(app_identifier, dict) else app_identifier
         
-        if not icon_img:
-            icon_img = self.icon_resolver.get_icon_pixbuf(id_value, self.icon_size) 
-        
-        if not icon_img:
-            icon_img = self.icon_resolver.get_icon_pixbuf("application-x-executable-symbolic", self.icon_size) 
-            if not icon_img:
-                icon_img = self.icon_resolver.get_icon_pixbuf("image-missing", self.icon_size) 
-                
-        items = [Image(pixbuf=icon_img)]
+        icon_img = Image()
+        icon_img.set_from_surface(self.icon_resolver.get_app_surface(
+            id_value, self.icon_size, self.get_scale_factor(), desktop_app=desktop_app
+        ))
+
+        items = [icon_img]
         tooltip = display_name or (id_value if isinstance(id_value, str) else "Unknown")
         if not display_name and instances and instances[0].get("title"):
             tooltip = instances[0]["title"]
@@ -479,60 +437,21 @@ class Dock(Window):
 
     def _is_app_pinned(self, app_identifier):
         """Check if an app is currently pinned"""
-        for pinned_app in self.pinned:
-            if isinstance(app_identifier, dict) and isinstance(pinned_app, dict):
-                if app_identifier.get("name") == pinned_app.get("name"):
-                    return True
-            elif app_identifier == pinned_app:
-                return True
-        return False
+        return self.pinned_store.is_pinned(app_identifier)
 
     def _pin_app(self, menu_item, app_identifier, desktop_app):
         """Pin an app to the dock"""
         if self._is_app_pinned(app_identifier): return  # Already pinned
 
         # Create app data object for pinning
-        if desktop_app:
-            app_data_obj = {
-                "name": desktop_app.name,
-                "display_name": desktop_app.display_name,
-                "window_class": desktop_app.window_class,
-                "executable": desktop_app.executable,
-                "command_line": desktop_app.command_line
-            }
-
-        else:
-            app_data_obj = app_identifier
+        app_data_obj = app_data_from_desktop_app(desktop_app) if desktop_app else app_identifier
 
-        # Add to pinned apps
-        self.pinned.append(app_data_obj)
-        self.config["pinned_apps"] = self.pinned
-
-        # Save and update dock
-        if self.update_pinned_apps_file():
-            self.update_dock()
+        # Saving notifies every dock, this one included
+        self.pinned_store.pin(app_data_obj)
 
     def _unpin_app(self, menu_item, app_identifier):
         """Unpin an app from the dock"""
-        # Find and remove the pinned app
-        app_index = -1
-
-        for i, pinned_app in enumerate(self.pinned):
-            if isinstance(app_identifier, dict) and isinstance(pinned_app, dict):
-                if app_identifier.get("name") == pinned_app.get("name"):
-                    app_index = i
-                    break
-            elif app_identifier == pinned_app:
-                app_index = i
-                break
-
-        if app_index >= 0:
-            self.pinned.pop(app_index)
-            self.config["pinned_apps"] = self.pinned
-
-            # Save and update dock
-            if self.update_pinned_apps_file():
-                self.update_dock()
+        self.pinned_store.unpin(app_identifier)
 
     def _close_app(self, menu_item, instance):
         """Close a single app instance"""
@@ -830,21 +749,8 @@ class Dock(Window):
                 instances_dragged = widget.instances
 
                 # Remove pinned app
-                app_index_dragged = -1
-                for i, pinned_app_item in enumerate(self.pinned):
-                    if isinstance(app_id_dragged, dict) and isinstance(pinned_app_item, dict):
-                        if app_id_dragged.get("name") == pinned_app_item.get("name"):
-                            app_index_dragged = i
-                            break
-                    elif app_id_dragged == pinned_app_item:
-                        app_index_dragged = i
-                        break
-                
-                if app_index_dragged >= 0:
-                    self.pinned.pop(app_index_dragged)
-                    self.config["pinned_apps"] = self.pinned
-                    self.update_pinned_apps_file()
-                    self.update_dock()
+                if self.pinned_store.is_pinned(app_id_dragged):
+                    self.pinned_store.unpin(app_id_dragged)
                 elif instances_dragged:
                     address = instances_dragged[0].get("address")
                     if address:
@@ -855,30 +761,6 @@ class Dock(Window):
                 self.check_occlusion_state()
 
         GLib.idle_add(process_drag_end)
-    def check_config_change(self):
-        new_config = read_config()
-        if not self.integrated_mode:
-            new_always_occluded = data.DOCK_ALWAYS_OCCLUDED 
-            if self.always_occluded != new_always_occluded:
-                self.always_occluded = new_always_occluded
-                self.check_occlusion_state() 
-
-        if new_config.get("pinned_apps", []) != self.config.get("pinned_apps", []):
-            self.config = new_config
-            self.pinned = self.config.get("pinned_apps", [])
-            self.update_app_map()
-            self.update_dock()
-        return True 
-
-    def update_pinned_apps_file(self):
-        config_path = get_relative_path("../config/dock.json")
-        try:
-            with open(config_path, "w") as file:
-                json.dump(self.config, file, indent=4)
-            return True
-        except Exception as e:
-            logging.error(f"Failed to write dock config: {e}")
-            return False
 
     def update_pinned_apps(self, skip_update=False):
         pinned_children_data = [] 
@@ -886,21 +768,16 @@ class Dock(Window):
             if child_widget.get_name() == "dock-separator": break
             if hasattr(child_widget, "app_identifier"):
                 if hasattr(child_widget, "desktop_app") and child_widget.desktop_app:
-                    app = child_widget.desktop_app
-                    app_data_obj = {
-                        "name": app.name, "display_name": app.display_name,
-                        "window_class": app.window_class, "executable": app.executable,
-                        "command_line": app.command_line
-                    }
-                    pinned_children_data.append(app_data_obj)
+                    pinned_children_data.append(app_data_from_desktop_app(child_widget.desktop_app))
                 else:
                     pinned_children_data.append(child_widget.app_identifier)
 
-        self.config["pinned_apps"] = pinned_children_data
-        self.pinned = pinned_children_data
-        file_updated = self.update_pinned_apps_file()
-        if file_updated and not skip_update:
-            self.update_dock()
+        # The view already shows the new order; only the other docks need to rebuild
+        self._ignore_pinned_change = skip_update
+        try:
+            self.pinned_store.set_pinned(pinned_children_data)
+        finally:
+            self._ignore_pinned_change = False
 
     @staticmethod
     def notify_config_change():
@@ -908,8 +785,6 @@ class Dock(Window):
              GLib.idle_add(dock_instance.check_config_change_immediate)
 
     def check_config_change_immediate(self): 
-        new_config = read_config()
-        
         if not self.integrated_mode:
             previous_always_occluded = self.always_occluded
             self.always_occluded = data.DOCK_ALWAYS_OCCLUDED 
@@ -917,11 +792,8 @@ class Dock(Window):
             if previous_always_occluded != self.always_occluded:
                 self.check_occlusion_state() 
         
-        if new_config.get("pinned_apps", []) != self.config.get("pinned_apps", []):
-            self.config = new_config
-            self.pinned = self.config.get("pinned_apps", [])
-            self.update_app_map()
-            self.update_dock()
+        # Pins come from the shared store, which emits "changed" itself
+        self.pinned_store.reload()
         return False 
 
     @staticmethod
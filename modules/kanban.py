@@ -2,7 +2,6 @@ import json
 import os
 from pathlib import Path
 
-import cairo
 import gi
 from fabric.widgets.box import Box
 from fabric.widgets.centerbox import CenterBox
@@ -16,20 +15,10 @@ gi.require_version('Gtk', '3.0')
 from gi.repository import Gdk, GLib, GObject, Gtk
 
 from config.loguru_config import logger
+from utils.drag_surface import set_drag_icon
 
 logger = logger.bind(name="Kanban", type="Module")
 
-def create_surface_from_widget(widget: Gtk.Widget) -> cairo.ImageSurface:
-    alloc = widget.get_allocation()
-    surface = cairo.ImageSurface(cairo.Format.ARGB32, alloc.width, alloc.height)
-    cr = cairo.Context(surface)
-
-    cr.set_source_rgba(0, 0, 0, 0)
-    cr.rectangle(0, 0, alloc.width, alloc.height)
-    cr.fill()
-    widget.draw(cr)
-    return surface
-
 class InlineEditor(Gtk.Box):
     __gsignals__ = {
         'confirmed': (GObject.SignalFlags.RUN_LAST, None, (str,)),
@@ -154,8 +143,7 @@ class KanbanNote(Gtk.EventBox):
         return False
 
     def on_drag_begin(self, widget, context):
-        surface = create_surface_from_widget(self)
-        Gtk.drag_set_icon_surface(context, surface)
+        set_drag_icon(context, self)
 
     def on_drag_data_get(self, widget, drag_context, data, info, time):
         data.set_text(self.label.get_text(), -1)
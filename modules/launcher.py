@@ -19,8 +19,8 @@ from gi.repository import Gdk, GLib
 
 import config.data as data
 import modules.icons as icons
-from modules.dock import Dock
 from modules.updater import run_updater
+from services.pinned_apps import PinnedApps
 from utils.conversion import Conversion
 
 from config.loguru_config import logger
@@ -419,7 +419,7 @@ class AppLauncher(Box):
             self.arrange_viewport(text)
 
     def add_selected_app_to_dock(self):
-        """Adds the currently selected application to the dock.json file with comprehensive metadata."""
+        """Pins the currently selected application to the dock with comprehensive metadata."""
         children = self.viewport.get_children()
         if not children or self.selected_index == -1 or self.selected_index >= len(children):
             return
@@ -439,36 +439,8 @@ class AppLauncher(Box):
             "icon_name": selected_app.icon_name
         }.items() if v is not None}
 
-        config_path = get_relative_path("../config/dock.json")
-        try:
-            with open(config_path, "r") as file:
-                data = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = {"pinned_apps": []}
-
-        already_pinned = False
-        for pinned_app in data.get("pinned_apps", []):
-            if isinstance(pinned_app, dict) and pinned_app.get("name") == app_data["name"]:
-                already_pinned = True
-
-                pinned_app.update(app_data)
-                break
-            elif isinstance(pinned_app, str) and pinned_app == app_data["name"]:
-                already_pinned = True
-
-                data["pinned_apps"].remove(pinned_app)
-                data["pinned_apps"].append(app_data)
-                break
-
-        if not already_pinned:
-            data.setdefault("pinned_apps", []).append(app_data)
-        
-
-        with open(config_path, "w") as file:
-            json.dump(data, file, indent=4)
-            
-
-        Dock.notify_config_change()
+        # The store persists dock.json and notifies every dock
+        PinnedApps.get_initial().pin(app_data)
 
     def move_selection(self, delta: int):
         children = self.viewport.get_children()
@@ -2,7 +2,6 @@ import math
 
 import gi
 import contextlib
-from fabric.audio.service import Audio
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.scale import Scale
@@ -12,6 +11,7 @@ gi.require_version("Gtk", "3.0")
 from gi.repository import GLib, GObject, Gtk
 
 import config.data as data
+from services.audio_control import AudioControl
 
 vertical_mode = (
     True
@@ -47,6 +47,7 @@ class MixerSlider(Scale):
 
         self.stream = stream
         self._updating_from_stream = False
+        self._tick_id = 0
         self._hid_value = self.connect("value-changed", self.on_value_changed)
 
         self._stream_changed_id = stream.connect("changed", self.on_stream_changed)
@@ -96,9 +97,15 @@ class MixerSlider(Scale):
             self._updating_from_stream = False
 
     def _on_mapped_first_set(self, *_):
+        # Tick callbacks don't run while unmapped; catch up on anything missed
         self._set_slider_silently(self.stream.volume / 100.0)
+        self.set_tooltip_text(f"{self.stream.volume:.0f}%")
+        self.update_muted_state()
 
     def _on_destroy(self, *_):
+        if self._tick_id:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = 0
         if self._hid_value:
             try: self.disconnect(self._hid_value)
             except Exception: pass
@@ -180,10 +187,19 @@ class MixerSlider(Scale):
         self.set_tooltip_text(f"{new_vol:.0f}%")
 
     def on_stream_changed(self, stream):
-        # programmatic update from the service -> silent
-        self._set_slider_silently(stream.volume / 100.0)
-        self.set_tooltip_text(f"{stream.volume:.0f}%")
+        # programmatic update from the service -> silent, at most once per frame
+        if self._tick_id:
+            return
+        self._tick_id = self.add_tick_callback(self._apply_stream_state)
+
+    def _apply_stream_state(self, *_):
+        self._tick_id = 0
+        if not self.stream:
+            return False
+        self._set_slider_silently(self.stream.volume / 100.0)
+        self.set_tooltip_text(f"{self.stream.volume:.0f}%")
         self.update_muted_state()
+        return False
 
     def update_muted_state(self):
         if getattr(self.stream, "muted", False):
@@ -192,6 +208,63 @@ class MixerSlider(Scale):
             self.remove_style_class("muted")
 
 
+def _stream_key(stream):
+    key = getattr(stream, "id", None)
+    return key if key is not None else id(stream)
+
+
+class MixerStreamRow(Box):
+    """Label and slider for one stream; follows the stream until destroyed."""
+
+    def __init__(self, stream, **kwargs):
+        super().__init__(orientation="v", spacing=4, h_expand=True, v_align="center", **kwargs)
+        self.stream = stream
+        self._tick_id = 0
+
+        self.label = Label(
+            name="mixer-stream-label",
+            h_expand=True, h_align="start", v_align="center",
+            ellipsization="end", max_chars_width=45,
+        )
+        self.add(self.label)
+        self._update_label()
+
+        if _supports_writable_volume(stream):
+            self.add(MixerSlider(stream))
+
+        self._stream_changed_id = stream.connect("changed", self._on_stream_changed)
+        self.connect("map", lambda *_: self._update_label())
+        self.connect("destroy", self._on_destroy)
+
+    def _update_label(self, *_):
+        self._tick_id = 0
+        if not self.stream:
+            return False
+        try:
+            vol_text = f"{math.ceil(getattr(self.stream, 'volume', 0))}%"
+        except Exception:
+            vol_text = "--%"
+        text = f"[{vol_text}] {getattr(self.stream, 'description', 'Unknown')}"
+        if self.label.get_label() != text:
+            self.label.set_label(text)
+        return False
+
+    def _on_stream_changed(self, *_):
+        # A slider drag fires many changes per frame; relabel once
+        if not self._tick_id:
+            self._tick_id = self.add_tick_callback(self._update_label)
+
+    def _on_destroy(self, *_):
+        if self._tick_id:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = 0
+        if self._stream_changed_id and self.stream:
+            with contextlib.suppress(Exception):
+                self.stream.disconnect(self._stream_changed_id)
+        self._stream_changed_id = 0
+        self.stream = None
+
+
 class MixerSection(Box):
     def __init__(self, title, **kwargs):
         super().__init__(
@@ -220,39 +293,25 @@ class MixerSection(Box):
         self.add(self.title_label)
         self.add(self.content_box)
 
-    def update_streams(self, streams):
-        for child in self.content_box.get_children():
-            child.destroy()
-
-        for stream in streams:
-            stream_container = Box(
-                orientation="v", spacing=4, h_expand=True, v_align="center"
-            )
+        # stream id -> MixerStreamRow
+        self._rows = {}
 
-            try:
-                vol_text = f"{math.ceil(getattr(stream, 'volume', 0))}%"
-            except Exception:
-                vol_text = "--%"
-
-            label = Label(
-                name="mixer-stream-label",
-                label=f"[{vol_text}] {getattr(stream, 'description', 'Unknown')}",
-                h_expand=True, h_align="start", v_align="center",
-                ellipsization="end", max_chars_width=45,
-            )
-            stream_container.add(label)
-
-            if _supports_writable_volume(stream):
-                slider = MixerSlider(stream)
-                stream_container.add(slider)
-            else:
-                # Optional: gray the label or add a tiny note
-                # label.add_style_class("muted")  # or another style to indicate read-only
-                pass
-
-            self.content_box.add(stream_container)
-
-        self.content_box.show_all()
+    def update_streams(self, streams):
+        """Reconcile rows with `streams`: only added/removed streams touch widgets."""
+        wanted = {_stream_key(stream): stream for stream in streams}
+
+        for key in [k for k, row in self._rows.items() if wanted.get(k) is not row.stream]:
+            self._rows.pop(key).destroy()
+
+        for position, (key, stream) in enumerate(wanted.items()):
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = MixerStreamRow(stream)
+                self.content_box.add(row)
+                row.show_all()
+            children = self.content_box.get_children()
+            if position >= len(children) or children[position] is not row:
+                self.content_box.reorder_child(row, position)
 
 class Mixer(Box):
     def __init__(self, **kwargs):
@@ -265,7 +324,7 @@ class Mixer(Box):
         )
 
         try:
-            self.audio = Audio()
+            self.audio = AudioControl.get_initial().audio
         except Exception as e:
             error_label = Label(
                 label=f"Audio service unavailable: {str(e)}",
@@ -300,6 +359,9 @@ class Mixer(Box):
 
         self.add(self.scrolled)
 
+        # "changed" also fires on every volume change; rows follow their own
+        # stream, so only the stream set needs reconciling here
+        self._update_id = 0
         self.audio.connect("changed", self.on_audio_changed)
         self.audio.connect("stream-added", self.on_audio_changed)
         self.audio.connect("stream-removed", self.on_audio_changed)
@@ -307,7 +369,13 @@ class Mixer(Box):
         self.update_mixer()
 
     def on_audio_changed(self, *args):
+        if not self._update_id:
+            self._update_id = GLib.idle_add(self._on_update_idle)
+
+    def _on_update_idle(self):
+        self._update_id = 0
         self.update_mixer()
+        return False
 
     def update_mixer(self):
         outputs, inputs = [], []
@@ -1,4 +1,7 @@
+import json
+
 from fabric.hyprland.widgets import HyprlandActiveWindow as ActiveWindow
+from fabric.hyprland.widgets import get_hyprland_connection
 from fabric.utils.helpers import FormattedString, get_desktop_applications
 from fabric.widgets.box import Box
 from fabric.widgets.centerbox import CenterBox
@@ -27,7 +30,13 @@ from config.loguru_config import logger
 
 logger = logger.bind(name="Notch", type="Module")
 
+WINDOW_ICON_SIZE = 20
+
+
 class Notch(Window):
+    # Shared by the notches on every monitor
+    _app_identifiers = None
+
     def __init__(self, monitor_id: int = 0, **kwargs):
         self.monitor_id = monitor_id
         self.monitor_manager = None
@@ -141,8 +150,8 @@ class Notch(Window):
         self._occlusion_timer_id = None
 
         self.icon_resolver = IconResolver()
-        self._all_apps = get_desktop_applications()
-        self.app_identifiers = self._build_app_identifiers_map()
+        if Notch._app_identifiers is None:
+            Notch._app_identifiers = self._build_app_identifiers_map(get_desktop_applications())
 
         self.dashboard = Dashboard(notch=self)
         self.nhistory = self.dashboard.widgets.notification_history
@@ -189,10 +198,11 @@ class Notch(Window):
             lambda widget, event: (self.open_notch("dashboard"), False)[1],
         )
 
-        self.active_window.connect("notify::label", self.update_window_icon)
-
-        if data.PANEL_THEME == "Notch":
-            self.active_window.connect("notify::label", self.on_active_window_changed)
+        # The activewindow event already carries the class, so focus changes
+        # need no extra round trip to the compositor
+        self._current_window_class = self._get_current_window_class()
+        self.conn = get_hyprland_connection()
+        self.conn.connect("event::activewindow", self.on_active_window_changed)
 
         self.active_window.get_children()[0].set_hexpand(True)
         self.active_window.get_children()[0].set_halign(Gtk.Align.FILL)
@@ -398,6 +408,8 @@ class Notch(Window):
         )
 
         self.update_window_icon()
+        # Rendered for scale 1 until the notch is realized on its output
+        self.window_icon.connect("notify::scale-factor", self.update_window_icon)
 
         self.active_window.connect(
             "button-press-event",
@@ -408,8 +420,6 @@ class Notch(Window):
             for corner in [self.corner_left, self.corner_right]:
                 corner.set_visible(False)
 
-        self._current_window_class = self._get_current_window_class()
-
         if data.PANEL_THEME == "Notch" and data.BAR_POSITION != "Top":
             GLib.timeout_add(250, self._check_occlusion)
         elif data.PANEL_THEME == "Notch":
@@ -704,10 +714,11 @@ class Notch(Window):
 
             self.update_window_icon()
 
-    def _build_app_identifiers_map(self):
+    @staticmethod
+    def _build_app_identifiers_map(apps):
         """Build a mapping of app identifiers (class names, executables, names) to DesktopApp objects"""
         identifiers = {}
-        for app in self._all_apps:
+        for app in apps:
             if app.name:
                 identifiers[app.name.lower()] = app
 
@@ -730,73 +741,36 @@ class Notch(Window):
     def find_app(self, app_id: str):
         """Find a DesktopApp object by various identifiers using the pre-built map."""
         normalized_id = app_id.lower()
-        return self.app_identifiers.get(normalized_id)
+        return Notch._app_identifiers.get(normalized_id)
 
-    def update_window_icon(self, *args):
-        """Update the window icon based on the current active window title"""
+    def _resolve_window_icon(self, app_id: str, icon_size: int):
+        """Resolve a window class to a surface through the shared app icon cache."""
+        try:
+            return self.icon_resolver.get_app_surface(
+                app_id, icon_size, self.window_icon.get_scale_factor(), desktop_app=self.find_app(app_id)
+            )
+        except Exception as e:
+            logger.error(f"Unable to resolve icon for '{app_id}': {e}")
+            return None
 
-        label_widget = self.active_window.get_children()[0]
-        if not isinstance(label_widget, Gtk.Label):
-            return
+    def update_window_icon(self, *args):
+        """Update the window icon for the current active window class"""
 
-        title = label_widget.get_text()
-        if title == "Desktop" or not title:
+        app_id = self._current_window_class
+        if not app_id:
             self.window_icon.set_visible(False)
             return
 
         self.window_icon.set_visible(True)
 
-        from fabric.hyprland.widgets import get_hyprland_connection
-
-        conn = get_hyprland_connection()
-        if conn:
-            try:
-                import json
-
-                active_window_json = conn.send_command("j/activewindow").reply.decode()
-                active_window_data = json.loads(active_window_json)
-                app_id = active_window_data.get(
-                    "initialClass", ""
-                ) or active_window_data.get("class", "")
-
-                icon_size = 20
-                desktop_app = self.find_app(app_id)
-
-                icon_pixbuf = None
-                if desktop_app:
-                    icon_pixbuf = desktop_app.get_icon_pixbuf(size=icon_size)
-
-                if not icon_pixbuf:
-                    icon_pixbuf = self.icon_resolver.get_icon_pixbuf(app_id, icon_size)
-
-                if not icon_pixbuf and "-" in app_id:
-                    base_app_id = app_id.split("-")[0]
-                    icon_pixbuf = self.icon_resolver.get_icon_pixbuf(
-                        base_app_id, icon_size
-                    )
-
-                if icon_pixbuf:
-                    self.window_icon.set_from_pixbuf(icon_pixbuf)
-                else:
-                    try:
-                        self.window_icon.set_from_icon_name(
-                            "application-x-executable", 20
-                        )
-                    except:
-                        self.window_icon.set_from_icon_name(
-                            "application-x-executable-symbolic", 20
-                        )
-            except Exception as e:
-                logger.error(f"Unable to update window icon: {e}")
-                try:
-                    self.window_icon.set_from_icon_name("application-x-executable", 20)
-                except:
-                    self.window_icon.set_from_icon_name("application-x-executable-symbolic", 20)
+        icon_surface = self._resolve_window_icon(app_id, WINDOW_ICON_SIZE)
+        if icon_surface:
+            self.window_icon.set_from_surface(icon_surface)
         else:
             try:
-                self.window_icon.set_from_icon_name("application-x-executable", 20)
+                self.window_icon.set_from_icon_name("application-x-executable", WINDOW_ICON_SIZE)
             except:
-                self.window_icon.set_from_icon_name("application-x-executable-symbolic", 20)
+                self.window_icon.set_from_icon_name("application-x-executable-symbolic", WINDOW_ICON_SIZE)
 
     def _check_occlusion(self):
         """
@@ -816,45 +790,44 @@ class Notch(Window):
     def _get_current_window_class(self):
         """Get the class of the currently active window"""
         try:
-            from fabric.hyprland.widgets import get_hyprland_connection
-
             conn = get_hyprland_connection()
             if conn:
-                import json
-
                 active_window_json = conn.send_command("j/activewindow").reply.decode()
                 active_window_data = json.loads(active_window_json)
-                return active_window_data.get(
-                    "initialClass", ""
-                ) or active_window_data.get("class", "")
+                # The same key the activewindow event reports
+                return active_window_data.get("class", "")
         except Exception as e:
             logger.error(f"Unable to get window class: {e}")
         return ""
 
-    def on_active_window_changed(self, *args):
+    def on_active_window_changed(self, _conn=None, event=None):
         """
-        Temporarily remove the 'occluded' class when active window class changes
-        to make the notch visible momentarily.
+        Update the window icon from the activewindow event payload and, in the
+        Notch theme, temporarily remove the 'occluded' state when the active
+        window class changes to make the notch visible momentarily.
         """
 
-        if data.PANEL_THEME != "Notch":
+        new_window_class = event.data[0] if event and event.data else ""
+
+        if new_window_class == self._current_window_class:
             return
 
-        new_window_class = self._get_current_window_class()
+        self._current_window_class = new_window_class
+        self.update_window_icon()
 
-        if new_window_class != self._current_window_class:
-            self._current_window_class = new_window_class
+        if data.PANEL_THEME != "Notch":
+            return
 
-            if self._occlusion_timer_id is not None:
-                GLib.source_remove(self._occlusion_timer_id)
-                self._occlusion_timer_id = None
+        if self._occlusion_timer_id is not None:
+            GLib.source_remove(self._occlusion_timer_id)
+            self._occlusion_timer_id = None
 
-            self._prevent_occlusion = True
-            self.notch_revealer.set_reveal_child(True)
+        self._prevent_occlusion = True
+        self.notch_revealer.set_reveal_child(True)
 
-            self._occlusion_timer_id = GLib.timeout_add(
-                500, self._restore_occlusion_check
-            )
+        self._occlusion_timer_id = GLib.timeout_add(
+            500, self._restore_occlusion_check
+        )
 
     def _restore_occlusion_check(self):
         """Re-enable occlusion checking after temporary visibility"""
@@ -1,7 +1,9 @@
-import json
+import bisect
 import locale
 import os
+import time
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Literal
 
@@ -18,13 +20,30 @@ from gi.repository import GdkPixbuf, GLib, Gtk
 import config.data as data
 from config.loguru_config import logger
 import modules.icons as icons
+from services.notification_image_cache import NotificationImageCache
+from services.notification_store import HistoryPager, NotificationStore
 from widgets.image import CustomImage
 from widgets.wayland import WaylandWindow as Window
 
 logger = logger.bind(name="Notifications", type="Module")
 
 PERSISTENT_DIR = f"/tmp/{data.APP_NAME}/notifications"
+# Legacy JSON array, migrated into the log on first load
 PERSISTENT_HISTORY_FILE = os.path.join(PERSISTENT_DIR, "notification_history.json")
+PERSISTENT_HISTORY_LOG = os.path.join(PERSISTENT_DIR, "notification_history.jsonl")
+# History widgets are built this many at a time as the user scrolls
+HISTORY_PAGE_SIZE = 20
+
+# Arrivals within this window are ingested as one batch
+NOTIFICATION_BATCH_MS = 50
+MAX_VISIBLE_NOTIFICATIONS = 5
+# Popups allowed per app within the window; the rest go straight to history
+APP_POPUP_RATE_LIMIT = 4
+APP_POPUP_RATE_WINDOW_S = 10
+
+# Shared by popups and history; repeated avatars/icons are stored once
+image_cache = NotificationImageCache(os.path.join(PERSISTENT_DIR, "images"))
+
 # Get configurable app lists from settings
 def get_limited_apps_history():
     config = data.load_config()
@@ -35,27 +54,25 @@ def get_history_ignored_apps():
     
     return config.get("history_ignored_apps", ["Hyprshot"])
 
+def get_history_limit():
+    config = data.load_config()
+    return config.get("notification_history_limit", 50)
+
+
+def release_cached_image(path):
+    image_cache.release(path)
+
 
 def cache_notification_pixbuf(notification_box):
     """
-    Saves a scaled pixbuf (48x48) in the cache directory and returns the cache file path.
+    Stores a scaled pixbuf (48x48) in the shared image cache and returns its path.
+    Identical images from repeated notifications resolve to the same file.
     """
     notification = notification_box.notification
     if notification.image_pixbuf:
-        os.makedirs(PERSISTENT_DIR, exist_ok=True)
-        cache_file = os.path.join(PERSISTENT_DIR, f"notification_{notification_box.uuid}.png")
-        logger.debug(f"Caching image for notification {notification.id} to: {cache_file}")
-        try:
-            scaled = notification.image_pixbuf.scale_simple(48, 48, GdkPixbuf.InterpType.BILINEAR
-)
-            scaled.savev(cache_file, "png", [], [])
-            logger.info(
-                f"Successfully cached image for notification {notification.id} to: {cache_file}"
-            )
-            return cache_file
-        except Exception as e:
-            logger.error(f"Error caching image for notification {notification.id}: {e}")
-            return None
+        cache_file = image_cache.put(notification.image_pixbuf, 48)
+        logger.debug(f"Cached image for notification {notification.id} at: {cache_file}")
+        return cache_file
     else:
         logger.debug(f"Notification {notification.id} has no image_pixbuf to cache.")
         return None
@@ -72,27 +89,15 @@ def load_scaled_pixbuf(notification_box, width, height):
         )
         return None
 
-    if (
-        hasattr(notification_box, "cached_image_path")
-        and notification_box.cached_image_path
-        and os.path.exists(notification_box.cached_image_path)
-    ):
+    cached_image_path = getattr(notification_box, "cached_image_path", None)
+    if cached_image_path:
         try:
-            logger.debug(
-                f"Attempting to load cached image from: {notification_box.cached_image_path} for notification {notification.id}"
-            )
-            pixbuf = GdkPixbuf.Pixbuf.new_from_file(notification_box.cached_image_path)
+            pixbuf = image_cache.load_pixbuf(cached_image_path, width, height)
             if pixbuf:
-                pixbuf = pixbuf.scale_simple(
-                    width, height, GdkPixbuf.InterpType.BILINEAR
-                )
-                logger.info(
-                    f"Successfully loaded cached image from: {notification_box.cached_image_path} for notification {notification.id}"
-                )
-            return pixbuf
+                return pixbuf
         except Exception as e:
             logger.error(
-                f"Error loading cached image from {notification_box.cached_image_path} for notification {notification.id}: {e}"
+                f"Error loading cached image from {cached_image_path} for notification {notification.id}: {e}"
             )
             logger.warning(
                 f"Falling back to notification.image_pixbuf for notification {notification.id}"
@@ -125,13 +130,31 @@ def get_app_icon_pixbuf(icon_path, width, height):
         logger.warning(f"Icon path does not exist: {icon_path}")
         return None
     try:
-        pixbuf = GdkPixbuf.Pixbuf.new_from_file(icon_path)
-        return pixbuf.scale_simple(width, height, GdkPixbuf.InterpType.BILINEAR)
+        return image_cache.load_pixbuf(icon_path, width, height)
     except Exception as e:
         logger.error(f"Failed to load or scale icon: {e}")
         return None
 
 
+class AppRateLimiter:
+    """Sliding-window limit on how many popups each app may raise."""
+
+    def __init__(self, limit=APP_POPUP_RATE_LIMIT, window_s=APP_POPUP_RATE_WINDOW_S):
+        self.limit = limit
+        self.window_s = window_s
+        self._history = {}
+
+    def allow(self, app_name) -> bool:
+        now = time.monotonic()
+        stamps = self._history.setdefault(app_name, deque())
+        while stamps and now - stamps[0] > self.window_s:
+            stamps.popleft()
+        if len(stamps) >= self.limit:
+            return False
+        stamps.append(now)
+        return True
+
+
 class ActionButton(Button):
     def __init__(
         self, action: NotificationAction, index: int, total: int, notification_box
@@ -408,18 +431,11 @@ class NotificationBox(Box):
             f"NotificationBox destroy called for notification: {self.notification.id}, from_history_delete: {from_history_delete}, is_history: {self._is_history}"
         )
         if (
-            hasattr(self, "cached_image_path")
-            and self.cached_image_path
-            and os.path.exists(self.cached_image_path)
+            getattr(self, "cached_image_path", None)
             and (not self._is_history or from_history_delete)
         ):
-            try:
-                os.remove(self.cached_image_path)
-                logger.info(f"Deleted cached image: {self.cached_image_path}")
-            except Exception as e:
-                logger.error(
-                    f"Error deleting cached image {self.cached_image_path}: {e}"
-                )
+            release_cached_image(self.cached_image_path)
+            self.cached_image_path = None
         self._destroyed = True
         self.stop_timeout()
         super().destroy()
@@ -510,7 +526,12 @@ class NotificationHistory(Box):
         self.current_notif_summary_label = None
         self.current_notif_image_box = None
         self.current_time_label = None
+        # Newest first; _container_keys holds -timestamp for bisecting
         self.containers = []
+        self._container_keys = []
+        # Day -> separator widget; _separator_keys holds -ordinal, newest first
+        self._separators = {}
+        self._separator_keys = []
         self.header_label = Label(
             name="nhh",
             label="Notifications",
@@ -578,10 +599,21 @@ class NotificationHistory(Box):
             children=[self.notifications_list, self.no_notifications_box],
         )
         self.scrolled_window.add(self.scrolled_window_viewport_box)
-        self.persistent_notifications = []
+        self.scrolled_window.connect("edge-reached", self._on_edge_reached)
+        # Deleting entries or resizing can leave the list too short to scroll
+        self.scrolled_window.get_vadjustment().connect("changed", self._queue_fill)
+        self.scrolled_window.connect("map", self._queue_fill)
+        self._store = NotificationStore(
+            PERSISTENT_HISTORY_LOG,
+            limit=get_history_limit(),
+            legacy_path=PERSISTENT_HISTORY_FILE,
+        )
+        # Stored notes without widgets yet
+        self._history_pager = HistoryPager(HISTORY_PAGE_SIZE)
+        self._fill_src = None
         self.add(self.history_header)
         self.add(self.scrolled_window)
-        GLib.idle_add(lambda: self._load_persistent_history().__next__ or False)
+        GLib.idle_add(self._load_persistent_history)
 
     def schedule_midnight_update(self):
         now = datetime.now()
@@ -592,40 +624,87 @@ class NotificationHistory(Box):
         GLib.timeout_add_seconds(int(delta_seconds), self.on_midnight)
 
     def on_midnight(self):
-        self.rebuild_with_separators()
+        # Headers are relative ("Today", "Yesterday"); only their labels change
+        for day, sep in self._separators.items():
+            sep.get_children()[0].set_label(
+                get_date_header(datetime.combine(day, datetime.min.time()))
+            )
         self.schedule_midnight_update()
         return GLib.SOURCE_REMOVE
 
-    def rebuild_with_separators(self):
-        GLib.idle_add(self._do_rebuild_with_separators)
+    @staticmethod
+    def _container_key(container) -> float:
+        return -container.arrival_time.timestamp()
+
+    def _newer_count(self, key: float) -> int:
+        return bisect.bisect_left(self._container_keys, key)
+
+    def _insert_container(self, container):
+        """Place a container at its time-sorted slot, adding its day header if needed."""
+        key = self._container_key(container)
+        index = bisect.bisect_right(self._container_keys, key)
+        self._container_keys.insert(index, key)
+        self.containers.insert(index, container)
+
+        day = container.arrival_time.date()
+        if day not in self._separators:
+            self._insert_separator(day)
+        day_index = bisect.bisect_left(self._separator_keys, -day.toordinal())
+
+        self.notifications_list.add(container)
+        self.notifications_list.reorder_child(container, index + day_index + 1)
+        container.show_all()
+
+    def _remove_container(self, container) -> bool:
+        """Detach a container, dropping its day header if it was the day's last entry."""
+        key = self._container_key(container)
+        index = self._newer_count(key)
+        while index < len(self.containers) and self.containers[index] is not container:
+            if self._container_keys[index] != key:
+                return False
+            index += 1
+        if index >= len(self.containers):
+            return False
 
-    def _do_rebuild_with_separators(self) -> bool:
-        children = list(self.notifications_list.get_children())
-        for child in children:
-            self.notifications_list.remove(child)
+        del self.containers[index]
+        del self._container_keys[index]
+        if container.get_parent() is self.notifications_list:
+            self.notifications_list.remove(container)
 
-        current_date_header = None
-        last_date_header = None
-        for container in sorted(
-            self.containers, key=lambda x: x.arrival_time, reverse=True
-        ):
-            arrival_time = container.arrival_time
-            date_header = get_date_header(arrival_time)
-            if date_header != current_date_header:
-                sep = create_date_separator(date_header)
-                self.notifications_list.add(sep)
-                current_date_header = date_header
-                last_date_header = date_header
-            self.notifications_list.add(container)
-
-        if not self.containers and last_date_header:
-            for child in list(self.notifications_list.get_children()):
-                if child.get_name() == "notif-date-sep":
-                    self.notifications_list.remove(child)
-
-        self.notifications_list.show_all()
-        self.update_no_notifications_label_visibility()
-        return False
+        day = container.arrival_time.date()
+        same_day = lambda i: (
+            0 <= i < len(self.containers)
+            and self.containers[i].arrival_time.date() == day
+        )
+        if not same_day(index - 1) and not same_day(index):
+            self._remove_separator(day)
+        return True
+
+    def _insert_separator(self, day):
+        sep_key = -day.toordinal()
+        day_index = bisect.bisect_left(self._separator_keys, sep_key)
+        self._separator_keys.insert(day_index, sep_key)
+        sep = create_date_separator(
+            get_date_header(datetime.combine(day, datetime.min.time()))
+        )
+        self._separators[day] = sep
+
+        # Everything newer than this day sits above it
+        next_day_start = datetime.combine(day + timedelta(days=1), datetime.min.time())
+        newer = bisect.bisect_right(self._container_keys, -next_day_start.timestamp())
+        self.notifications_list.add(sep)
+        self.notifications_list.reorder_child(sep, newer + day_index)
+        sep.show_all()
+
+    def _remove_separator(self, day):
+        sep = self._separators.pop(day, None)
+        if sep is None:
+            return
+        sep_key = -day.toordinal()
+        day_index = bisect.bisect_left(self._separator_keys, sep_key)
+        if day_index < len(self._separator_keys) and self._separator_keys[day_index] == sep_key:
+            del self._separator_keys[day_index]
+        sep.destroy()
 
     def on_do_not_disturb_changed(self, switch, _pspec):
         self.do_not_disturb_enabled = switch.get_active()
@@ -644,38 +723,76 @@ class NotificationHistory(Box):
             self.notifications_list.remove(child)
             child.destroy()
 
-        if os.path.exists(PERSISTENT_HISTORY_FILE):
-            try:
-                os.remove(PERSISTENT_HISTORY_FILE)
-                logger.info("Notification history cleared and persistent file deleted.")
-            except Exception as e:
-                logger.error(f"Error deleting persistent history file: {e}")
-        self.persistent_notifications = []
+        for note in self._history_pager.discard(lambda _note: True):
+            release_cached_image(note.get("cached_image_path"))
+        self._store.clear()
+        logger.info("Notification history cleared and persistent log deleted.")
         self.containers = []
-        self.rebuild_with_separators()
+        self._container_keys = []
+        self._separators = {}
+        self._separator_keys = []
+        self.update_no_notifications_label_visibility()
 
     def _load_persistent_history(self):
-        if not os.path.exists(PERSISTENT_DIR):
-            os.makedirs(PERSISTENT_DIR, exist_ok=True)
-        if os.path.exists(PERSISTENT_HISTORY_FILE):
+        try:
+            for note in self._store.load():
+                release_cached_image(note.get("cached_image_path"))
+        except Exception as e:
+            logger.error(f"Error loading persistent history: {e}")
+        self._history_pager.reset(self._store.notes())
+        # Every stored entry holds a reference to its image
+        for note in self._history_pager:
+            image_cache.acquire(note.get("cached_image_path"))
+        self._load_history_page()
+        self.schedule_midnight_update()
+        return False
+
+    def _load_history_page(self) -> bool:
+        """Build widgets for the next page of older stored notifications."""
+        for note in self._history_pager.next_page():
             try:
-                with open(PERSISTENT_HISTORY_FILE, "r") as f:
-                    self.persistent_notifications = json.load(f)
-                for note in reversed(self.persistent_notifications):
-                    self._add_historical_notification(note)
-                    yield True
+                self._add_historical_notification(note)
             except Exception as e:
-                logger.error(f"Error loading persistent history: {e}")
-        GLib.idle_add(self.update_no_notifications_label_visibility)
-        self._cleanup_orphan_cached_images()
-        self.schedule_midnight_update()
+                logger.error(f"Error restoring notification {note.get('id')}: {e}")
+        self.update_no_notifications_label_visibility()
+        return False
 
-    def _save_persistent_history(self):
-        try:
-            with open(PERSISTENT_HISTORY_FILE, "w") as f:
-                json.dump(self.persistent_notifications, f)
-        except Exception as e:
-            logger.error(f"Error saving persistent history: {e}")
+    def _on_edge_reached(self, _scrolled_window, pos):
+        if pos == Gtk.PositionType.BOTTOM:
+            self._load_history_page()
+
+    def _queue_fill(self, *_):
+        """Check on idle whether older notes must be built to fill the list."""
+        if self._fill_src is None and len(self._history_pager):
+            self._fill_src = GLib.idle_add(self._fill_history)
+
+    def _fill_history(self):
+        self._fill_src = None
+        viewport_filled = True
+        # Allocation is only meaningful while shown; hidden, count entries only
+        if self.scrolled_window.get_mapped():
+            adjustment = self.scrolled_window.get_vadjustment()
+            viewport_filled = adjustment.get_upper() > adjustment.get_page_size()
+        if self._history_pager.needs_page(len(self.containers), viewport_filled):
+            # The new page changes the adjustment, which checks again
+            self._load_history_page()
+        return False
+
+    def _drop_evicted(self, notes):
+        """Remove widgets and cached images of notes evicted by the retention limit."""
+        if not notes:
+            return
+        evicted_ids = {str(note.get("id")) for note in notes}
+        for note in self._history_pager.discard(lambda note: str(note.get("id")) in evicted_ids):
+            release_cached_image(note.get("cached_image_path"))
+        # Materialized entries release their image when their box is destroyed
+        for container in list(self.containers):
+            notif_box = getattr(container, "notification_box", None)
+            if notif_box is not None and str(notif_box.uuid) in evicted_ids:
+                self._remove_container(container)
+                notif_box.destroy(from_history_delete=True)
+                container.destroy()
+        logger.info(f"Dropped {len(notes)} notification(s) beyond the history limit")
 
     def delete_historical_notification(self, note_id, container):
         if hasattr(container, "notification_box"):
@@ -684,30 +801,18 @@ class NotificationHistory(Box):
 
         target_note_id_str = str(note_id)
 
-        new_persistent_notifications = []
-        removed_from_list = False
-        for note_in_list in self.persistent_notifications:
-            current_note_id_str = str(note_in_list.get("id"))
-            if current_note_id_str == target_note_id_str:
-                removed_from_list = True
-
-                continue
-            new_persistent_notifications.append(note_in_list)
-
-        if removed_from_list:
-            self.persistent_notifications = new_persistent_notifications
-            logger.info(f"Notification with ID {target_note_id_str} was marked for removal from persistent_notifications list.")
+        if self._store.remove(target_note_id_str) is not None:
+            logger.info(f"Notification with ID {target_note_id_str} was removed from persistent history.")
         else:
-            logger.warning(f"Notification with ID {target_note_id_str} was NOT found in persistent_notifications list. The list remains unchanged.")
+            logger.warning(f"Notification with ID {target_note_id_str} was NOT found in persistent history.")
 
-        self._save_persistent_history()
+        self._remove_container(container)
         container.destroy()
-        self.containers = [c for c in self.containers if c != container]
-        self.rebuild_with_separators()
+        self.update_no_notifications_label_visibility()
 
     def _add_historical_notification(self, note):
         hist_notif = HistoricalNotification(
-            id=note.get("id"),
+            _id=note.get("id"),
             app_icon=note.get("app_icon"),
             summary=note.get("summary"),
             body=note.get("body"),
@@ -839,48 +944,56 @@ class NotificationHistory(Box):
             ],
         )
         container.add(content_box)
-        self.containers.insert(0, container)
-        self.rebuild_with_separators()
-        self.update_no_notifications_label_visibility()
+        self._insert_container(container)
 
     def add_notification(self, notification_box):
-        app_name = notification_box.notification.app_name
-        if app_name in get_history_ignored_apps():
-            logger.info(
-                f"Ignoring notification from {app_name} as it is in the ignored list."
-            )
-            notification_box.destroy(from_history_delete=True)
-            return
+        self.add_notifications([notification_box])
+
+    def add_notifications(self, notification_boxes):
+        """Add a batch of notifications with a single log write."""
+        ignored_apps = get_history_ignored_apps()
+        limited_apps = get_limited_apps_history()
+
+        # Only the newest notification of a limited app would survive the batch
+        last_limited = {}
+        for box in notification_boxes:
+            if box.notification.app_name in limited_apps:
+                last_limited[box.notification.app_name] = box
+
+        notes = []
+        for notification_box in notification_boxes:
+            app_name = notification_box.notification.app_name
+            if app_name in ignored_apps:
+                logger.info(
+                    f"Ignoring notification from {app_name} as it is in the ignored list."
+                )
+                notification_box.destroy(from_history_delete=True)
+                continue
 
-        if app_name in get_limited_apps_history():
-            self.clear_history_for_app(app_name)
+            if app_name in limited_apps:
+                if last_limited[app_name] is not notification_box:
+                    notification_box.destroy(from_history_delete=True)
+                    continue
+                self.clear_history_for_app(app_name)
 
-        if len(self.containers) >= 50:
-            oldest_container = self.containers.pop()
-            if (
-                hasattr(oldest_container, "notification_box")
-                and hasattr(oldest_container.notification_box, "cached_image_path")
-                and oldest_container.notification_box.cached_image_path
-                and os.path.exists(oldest_container.notification_box.cached_image_path)
-            ):
-                try:
-                    os.remove(oldest_container.notification_box.cached_image_path)
-                    logger.info(
-                        f"Deleted cached image of oldest notification due to history limit: {oldest_container.notification_box.cached_image_path}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error deleting cached image of oldest notification: {e}"
-                    )
-            oldest_container.destroy()
+            notes.append(self._add_live_notification(notification_box))
 
+        if not notes:
+            return
+        self._drop_evicted(self._store.add_many(notes))
+        self.update_no_notifications_label_visibility()
+
+    def _add_live_notification(self, notification_box) -> dict:
+        """Build the history widget for a notification and return its stored note."""
         def on_container_destroy(_container):
             timer_id = getattr(_container, "_timestamp_timer_id", None)
             if timer_id:
                 GLib.source_remove(timer_id)
+            if not self._remove_container(_container):
+                return
+            self._store.remove(notification_box.uuid)
+            notification_box.destroy(from_history_delete=True)
             _container.destroy()
-            self.containers.remove(_container)
-            self.rebuild_with_separators()
             self.update_no_notifications_label_visibility()
 
         container = Box(
@@ -998,13 +1111,12 @@ class NotificationHistory(Box):
             "clicked", lambda *_: on_container_destroy(container)
         )
         container.add(hist_box)
-        self.containers.insert(0, container)
-        self.rebuild_with_separators()
-        self._append_persistent_notification(notification_box, container.arrival_time)
-        self.update_no_notifications_label_visibility()
+        self._insert_container(container)
+        return self._note_from_box(notification_box, container.arrival_time)
 
-    def _append_persistent_notification(self, notification_box, arrival_time):
-        note = {
+    @staticmethod
+    def _note_from_box(notification_box, arrival_time) -> dict:
+        return {
             "id": notification_box.uuid,
             "app_icon": notification_box.notification.app_icon,
             "summary": notification_box.notification.summary,
@@ -1013,57 +1125,13 @@ class NotificationHistory(Box):
             "timestamp": arrival_time.isoformat(),
             "cached_image_path": notification_box.cached_image_path,
         }
-        self.persistent_notifications.insert(0, note)
-        self.persistent_notifications = self.persistent_notifications[:50]
-        self._save_persistent_history()
-
-    def _cleanup_orphan_cached_images(self):
-        logger.debug("Starting orphan cached image cleanup.")
-        if not os.path.exists(PERSISTENT_DIR):
-            logger.debug("Cache directory does not exist, skipping cleanup.")
-            return
-
-        cached_files = [
-            f
-            for f in os.listdir(PERSISTENT_DIR)
-            if f.startswith("notification_") and f.endswith(".png")
-        ]
-        if not cached_files:
-            logger.debug("No cached image files found, skipping cleanup.")
-            return
-
-        history_uuids = {
-            note.get("id") for note in self.persistent_notifications if note.get("id")
-        }
-        deleted_count = 0
-        for cached_file in cached_files:
-            try:
-                uuid_from_filename = cached_file[len("notification_") : -len(".png")]
-                if uuid_from_filename not in history_uuids:
-                    cache_file_path = os.path.join(PERSISTENT_DIR, cached_file)
-                    os.remove(cache_file_path)
-                    logger.info(f"Deleted orphan cached image: {cache_file_path}")
-                    deleted_count += 1
-                else:
-                    logger.debug(
-                        f"Cached image {cached_file} found in history, keeping it."
-                    )
-            except Exception as e:
-                logger.error(
-                    f"Error processing cached file {cached_file} during cleanup: {e}"
-                )
-
-        if deleted_count > 0:
-            logger.info(
-                f"Orphan cached image cleanup finished. Deleted {deleted_count} images."
-            )
-        else:
-            logger.info("Orphan cached image cleanup finished. No orphan images found.")
 
     def update_no_notifications_label_visibility(self) -> bool:
-        has_notifications = bool(self.containers)
+        # Stored notes without widgets yet still count, they are built next
+        has_notifications = bool(self.containers) or len(self._history_pager) > 0
         self.no_notifications_box.set_visible(not has_notifications)
         self.notifications_list.set_visible(has_notifications)
+        self._queue_fill()
         return False
 
     def clear_history_for_app(self, app_name):
@@ -1078,34 +1146,16 @@ class NotificationHistory(Box):
                 containers_to_remove.append(container)
                 persistent_notes_to_remove_ids.add(container.notification_box.uuid)
 
+        for note in self._history_pager.discard(lambda note: note.get("app_name") == app_name):
+            persistent_notes_to_remove_ids.add(note.get("id"))
+            release_cached_image(note.get("cached_image_path"))
+
         for container in containers_to_remove:
-            if (
-                hasattr(container, "notification_box")
-                and hasattr(container.notification_box, "cached_image_path")
-                and container.notification_box.cached_image_path
-                and os.path.exists(container.notification_box.cached_image_path)
-            ):
-                try:
-                    os.remove(container.notification_box.cached_image_path)
-                    logger.info(
-                        f"Deleted cached image of replaced history notification: {container.notification_box.cached_image_path}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error deleting cached image of replaced history notification: {e}"
-                    )
-            self.containers.remove(container)
-            self.notifications_list.remove(container)
+            self._remove_container(container)
             container.notification_box.destroy(from_history_delete=True)
             container.destroy()
 
-        self.persistent_notifications = [
-            note
-            for note in self.persistent_notifications
-            if note.get("id") not in persistent_notes_to_remove_ids
-        ]
-        self._save_persistent_history()
-        self.rebuild_with_separators()
+        self._store.remove_many(persistent_notes_to_remove_ids)
         self.update_no_notifications_label_visibility()
 
 
@@ -1191,70 +1241,117 @@ class NotificationContainer(Box):
         self.current_index = 0
         self.update_navigation_buttons()
         self._destroyed_notifications = set()
+        self._pending = {}
+        self._batch_src = None
+        self._rate_limiter = AppRateLimiter()
 
     def on_new_notification(self, fabric_notif, _id):
-        notification_history_instance = self.notification_history
-        if notification_history_instance.do_not_disturb_enabled:
-            logger.info(
-                "Do Not Disturb mode enabled: adding notification directly to history."
-            )
-            notification = fabric_notif.get_notification_from_id(_id)
-            new_box = NotificationBox(notification)
-            if notification.image_pixbuf:
-                cache_notification_pixbuf(new_box)
-            notification_history_instance.add_notification(new_box)
+        notification = fabric_notif.get_notification_from_id(_id)
+        if notification is None:
             return
+        # A replaces-id update inside the window supersedes the queued one
+        self._pending.pop(_id, None)
+        self._pending[_id] = notification
+        if self._batch_src is None:
+            self._batch_src = GLib.timeout_add(NOTIFICATION_BATCH_MS, self._flush_pending)
+
+    def _flush_pending(self):
+        """Ingest every notification that arrived during the batch window."""
+        self._batch_src = None
+        pending = list(self._pending.items())
+        self._pending.clear()
+        if not pending:
+            return False
 
-        notification = fabric_notif.get_notification_from_id(_id)
+        notification_history_instance = self.notification_history
+        limited_apps = get_limited_apps_history()
+        to_history = []
+        to_show = []
+        # Updates of a popup already on screen (replaces-id) take its place
+        to_replace = []
+        on_screen = {box.notification.id for box in self.notifications}
+
+        # Only the newest notification of a limited app is worth showing
+        last_limited = {}
+        for _id, notification in pending:
+            if notification.app_name in limited_apps:
+                last_limited[notification.app_name] = _id
+
+        for _id, notification in pending:
+            app_name = notification.app_name
+            if app_name in limited_apps and last_limited[app_name] != _id:
+                continue
+            if notification_history_instance.do_not_disturb_enabled:
+                logger.info(
+                    "Do Not Disturb mode enabled: adding notification directly to history."
+                )
+                to_history.append(NotificationBox(notification))
+            elif _id in on_screen:
+                # Not a new popup, so not counted against the app's rate
+                to_replace.append((_id, notification))
+            elif not self._rate_limiter.allow(app_name):
+                logger.debug(f"Rate limiting popups from {app_name}; adding to history.")
+                to_history.append(NotificationBox(notification))
+            else:
+                to_show.append((_id, notification))
+
+        # Only the newest few can ever be visible at once
+        overflow = to_show[:-MAX_VISIBLE_NOTIFICATIONS]
+        to_show = to_show[-MAX_VISIBLE_NOTIFICATIONS:]
+        to_history.extend(NotificationBox(n) for _, n in overflow)
+
+        for _id, notification in to_replace + to_show:
+            to_history.extend(self._show_notification(_id, notification, limited_apps))
+
+        if to_history:
+            notification_history_instance.add_notifications(to_history)
+
+        if to_show or to_replace:
+            for notification_box in self.notifications:
+                notification_box.start_timeout()
+            self.main_revealer.show_all()
+            self.main_revealer.set_reveal_child(True)
+            self.update_navigation_buttons()
+        return False
+
+    def _show_notification(self, _id, notification, limited_apps):
+        """Put a popup on the stack; returns boxes pushed out to history."""
         new_box = NotificationBox(notification)
         new_box.set_container(self)
         notification.connect("closed", self.on_notification_closed)
-
+        self._destroyed_notifications.discard(notification.id)
         app_name = notification.app_name
+        evicted = []
+
+        if app_name in limited_apps:
+            self.notification_history.clear_history_for_app(app_name)
 
-        def cycle_notification():
-            while len(self.notifications) >= 5:
-                oldest_notification = self.notifications[0]
-                notification_history_instance.add_notification(oldest_notification)
+        replace_index = next(
+            (
+                i
+                for i, box in enumerate(self.notifications)
+                if box.notification.id == _id
+                or (app_name in limited_apps and box.notification.app_name == app_name)
+            ),
+            -1,
+        )
+        if replace_index != -1:
+            old_notification_box = self.notifications.pop(replace_index)
+            self.stack.remove(old_notification_box)
+            old_notification_box.destroy()
+        else:
+            while len(self.notifications) >= MAX_VISIBLE_NOTIFICATIONS:
+                oldest_notification = self.notifications.pop(0)
                 self.stack.remove(oldest_notification)
-                self.notifications.pop(0)
+                evicted.append(oldest_notification)
                 if self.current_index > 0:
                     self.current_index -= 1
-            self.stack.add_named(new_box, str(_id))
-            self.notifications.append(new_box)
-            self.current_index = len(self.notifications) - 1
-            self.stack.set_visible_child(new_box)
-
-        if app_name in get_limited_apps_history():
-            notification_history_instance.clear_history_for_app(app_name)
-
-            existing_notification_index = -1
-            for index, existing_box in enumerate(self.notifications):
-                if existing_box.notification.app_name == app_name:
-                    existing_notification_index = index
-                    break
-
-            if existing_notification_index != -1:
-                old_notification_box = self.notifications.pop(
-                    existing_notification_index
-                )
-                self.stack.remove(old_notification_box)
-                old_notification_box.destroy()
 
-                self.stack.add_named(new_box, str(_id))
-                self.notifications.append(new_box)
-                self.current_index = len(self.notifications) - 1
-                self.stack.set_visible_child(new_box)
-            else:
-                cycle_notification()
-        else:
-            cycle_notification()
-
-        for notification_box in self.notifications:
-            notification_box.start_timeout()
-        self.main_revealer.show_all()
-        self.main_revealer.set_reveal_child(True)
-        self.update_navigation_buttons()
+        self.stack.add_named(new_box, str(_id))
+        self.notifications.append(new_box)
+        self.current_index = len(self.notifications) - 1
+        self.stack.set_visible_child(new_box)
+        return evicted
 
     def show_previous(self, *_):
         if self.current_index > 0:
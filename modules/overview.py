@@ -1,7 +1,6 @@
 # Thanks to https://github.com/muhchaudhary for the original code. You are a legend.
 import json
 
-import cairo
 import gi
 from fabric.hyprland.service import Hyprland
 from fabric.utils.helpers import get_desktop_applications
@@ -16,9 +15,10 @@ import config.data as data
 import modules.icons as icons
 # WIP icon resolver (app_id to guessing the icon name)
 from utils.icon_resolver import IconResolver
+from utils.drag_surface import set_drag_icon
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gdk, Gtk, GdkPixbuf
+from gi.repository import Gdk, Gtk
 
 screen = Gdk.Screen.get_default()
 CURRENT_WIDTH = screen.get_width()
@@ -32,21 +32,6 @@ BASE_SCALE = 0.1  # Base scale factor for overview
 # Credit to Aylur for the drag and drop code
 TARGET = [Gtk.TargetEntry.new("text/plain", Gtk.TargetFlags.SAME_APP, 0)]
 
-# Credit to Aylur for the createSurfaceFromWidget code
-def create_surface_from_widget(widget: Gtk.Widget) -> cairo.ImageSurface:
-    alloc = widget.get_allocation()
-    surface = cairo.ImageSurface(
-        cairo.Format.ARGB32,
-        alloc.width,
-        alloc.height,
-    )
-    cr = cairo.Context(surface)
-    cr.set_source_rgba(255, 255, 255, 0)
-    cr.rectangle(0, 0, alloc.width, alloc.height)
-    cr.fill()
-    widget.draw(cr)
-    return surface
-
 class HyprlandWindowButton(Button):
     def __init__(
         self,
@@ -68,35 +53,16 @@ class HyprlandWindowButton(Button):
         # Using the minimum dimension of the button for scaling.
         icon_size_main = int(min(self.size) * 0.5)  # adjust factor as needed
 
-        # Enhanced icon resolution using desktop apps
+        # Icon lookup and scaling are shared with the dock and notch
         desktop_app = window.find_app(app_id)
-        
-        # Get icon using improved method with fallbacks
-        icon_pixbuf = None
-        if desktop_app:
-            icon_pixbuf = desktop_app.get_icon_pixbuf(size=icon_size_main)
-        
-        if not icon_pixbuf:
-            # Fallback to IconResolver
-            icon_pixbuf = icon_resolver.get_icon_pixbuf(app_id, icon_size_main)
-        
-        if not icon_pixbuf:
-            # Additional fallbacks for common apps
-            icon_pixbuf = icon_resolver.get_icon_pixbuf("application-x-executable-symbolic", icon_size_main)
-            if not icon_pixbuf:
-                icon_pixbuf = icon_resolver.get_icon_pixbuf("image-missing", icon_size_main)
-                
-        # Ensure icon is scaled to the correct size
-        if icon_pixbuf and (icon_pixbuf.get_width() != icon_size_main or icon_pixbuf.get_height() != icon_size_main):
-            icon_pixbuf = icon_pixbuf.scale_simple(
-                icon_size_main, 
-                icon_size_main, 
-                GdkPixbuf.InterpType.BILINEAR
-            )
+        icon_image = Image()
+        icon_image.set_from_surface(icon_resolver.get_app_surface(
+            app_id, icon_size_main, window.get_scale_factor(), desktop_app=desktop_app
+        ))
 
         super().__init__(
             name="overview-client-box",
-            image=Image(pixbuf=icon_pixbuf),
+            image=icon_image,
             tooltip_text=title,
             size=size,
             on_clicked=self.on_button_click,
@@ -105,9 +71,7 @@ class HyprlandWindowButton(Button):
             on_drag_data_get=lambda _s, _c, data, *_: data.set_text(
                 address, len(address)
             ),
-            on_drag_begin=lambda _, context: Gtk.drag_set_icon_surface(
-                context, create_surface_from_widget(self)
-            ),
+            on_drag_begin=lambda _, context: set_drag_icon(context, self),
         )
 
         # Store the desktop_app for later use
@@ -132,39 +96,18 @@ class HyprlandWindowButton(Button):
         # Compute overlay icon size dynamically.
         icon_size_overlay = int(min(self.size) * 0.5)  # adjust factor as needed
         
-        # Enhanced icon resolution for overlay
-        icon_pixbuf = None
-        if hasattr(self, 'desktop_app') and self.desktop_app:
-            icon_pixbuf = self.desktop_app.get_icon_pixbuf(size=icon_size_overlay)
-            
-        if not icon_pixbuf:
-            icon_pixbuf = icon_resolver.get_icon_pixbuf(self.app_id, icon_size_overlay)
-            
-        if not icon_pixbuf:
-            icon_pixbuf = icon_resolver.get_icon_pixbuf("application-x-executable-symbolic", icon_size_overlay)
-            if not icon_pixbuf:
-                icon_pixbuf = icon_resolver.get_icon_pixbuf("image-missing", icon_size_overlay)
-        
-        # Ensure icon is scaled to the correct size
-        if icon_pixbuf and (icon_pixbuf.get_width() != icon_size_overlay or icon_pixbuf.get_height() != icon_size_overlay):
-            icon_pixbuf = icon_pixbuf.scale_simple(
-                icon_size_overlay, 
-                icon_size_overlay, 
-                GdkPixbuf.InterpType.BILINEAR
-            )
-                
-        self.set_image(
-            Overlay(
-                child=image,
-                overlays=Image(
-                    name="overview-icon",
-                    pixbuf=icon_pixbuf,
-                    h_align="center",
-                    v_align="end",
-                    tooltip_text=self.title,
-                ),
-            )
+        icon_image = Image(
+            name="overview-icon",
+            h_align="center",
+            v_align="end",
+            tooltip_text=self.title,
         )
+        icon_image.set_from_surface(icon_resolver.get_app_surface(
+            self.app_id, icon_size_overlay, self.get_scale_factor(),
+            desktop_app=getattr(self, "desktop_app", None),
+        ))
+
+        self.set_image(Overlay(child=image, overlays=icon_image))
 
     def on_button_click(self, *_):
         connection.send_command(f"/dispatch focuswindow address:{self.address}")
@@ -10,7 +10,6 @@ import subprocess
 import tempfile
 from urllib import parse, request
 
-import cairo
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.scrolledwindow import ScrolledWindow
@@ -21,6 +20,7 @@ from watchdog.observers import Observer
 import modules.icons as icons
 
 from config.loguru_config import logger
+from utils.drag_surface import set_drag_icon
 
 logger = logger.bind(name="Pins", type="Module")
 
@@ -30,16 +30,6 @@ icon_size = 80
 if data.PANEL_THEME == "Panel" and data.BAR_POSITION in ["Left", "Right"] or data.PANEL_POSITION in ["Start", "End"]:
     icon_size = 36
 
-def create_surface_from_widget(widget: Gtk.Widget) -> cairo.ImageSurface:
-    alloc = widget.get_allocation()
-    surface = cairo.ImageSurface(cairo.Format.ARGB32, alloc.width, alloc.height)
-    cr = cairo.Context(surface)
-    cr.set_source_rgba(1, 1, 1, 0)
-    cr.rectangle(0, 0, alloc.width, alloc.height)
-    cr.fill()
-    widget.draw(cr)
-    return surface
-
 def open_file(filepath):
     try:
         subprocess.Popen(["xdg-open", filepath])
@@ -309,8 +299,7 @@ class Cell(Gtk.EventBox):
     def on_drag_begin(self, widget, context):
 
         if self.content_type == 'file':
-            surface = create_surface_from_widget(self)
-            Gtk.drag_set_icon_surface(context, surface)
+            set_drag_icon(context, self)
 
     def on_button_press(self, widget, event):
         if self.content is None:
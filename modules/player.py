@@ -1,7 +1,5 @@
 import os
-import tempfile
 import urllib.parse
-import urllib.request
 
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
@@ -15,6 +13,7 @@ from gi.repository import Gdk, Gio, GLib, Gtk
 import config.data as data
 import modules.icons as icons
 from modules.cavalcade import SpectrumRender
+from services.album_art import AlbumArtCache
 from services.mpris import MprisPlayer, MprisPlayerManager
 from widgets.circle_image import CircleImage
 
@@ -22,6 +21,9 @@ vertical_mode = False
 if data.PANEL_THEME == "Panel" and (data.BAR_POSITION in ["Left", "Right"] or data.PANEL_POSITION in ["Start", "End"]):
     vertical_mode = True
 
+# Smallest progress change worth redrawing the arc for (~1/3 px on the 198 px ring)
+PROGRESS_EPSILON = 0.001
+
 def get_player_icon_markup_by_name(player_name):
     if player_name:
         pn = player_name.lower()
@@ -44,10 +46,15 @@ class PlayerBox(Box):
         super().__init__(orientation="v", h_align="fill", spacing=0, h_expand=False, v_expand=not vertical_mode)
         self.mpris_player = mpris_player
         
-        self._progress_timer_id = 0
+        self._progress_tick_id = 0
+        self._length_us = 0
+        self._shown_progress = None
+        # -1 until something is shown, None while the length is unknown
+        self._shown_second = -1
         self._wallpaper_monitor = None
+        self._art_url = None
 
-        # Stop/start timer when page visibility changes
+        # Stop/start the progress tick when page visibility changes
         self.connect("unmap", self._stop_progress_timer)
         self.connect("destroy", self._stop_progress_timer)
         self.connect("map", self._try_start_progress_timer)
@@ -59,6 +66,8 @@ class PlayerBox(Box):
             h_align="center",
             v_align="center",
         )
+        # Covers fetched before realize, or on another output, are the wrong size
+        self.cover.connect("notify::scale-factor", self._request_artwork)
         self.cover_placerholder = CircleImage(
             name="player-cover",
             size=198 if not vertical_mode else 132,
@@ -218,13 +227,14 @@ class PlayerBox(Box):
         self.artist.set_visible(bool(mp.artist and mp.artist.strip()))
         if mp.artist and mp.artist.strip():
             self.artist.set_text(mp.artist)
+        self._art_url = mp.arturl
         if mp.arturl:
             parsed = urllib.parse.urlparse(mp.arturl)
             if parsed.scheme == "file":
                 local_arturl = urllib.parse.unquote(parsed.path)
                 self._set_cover_image(local_arturl)
             elif parsed.scheme in ("http", "https"):
-                GLib.Thread.new("download-artwork", self._download_and_set_artwork, mp.arturl)
+                self._request_artwork()
             else:
                 self._set_cover_image(mp.arturl)
         else:
@@ -239,6 +249,13 @@ class PlayerBox(Box):
         self.progressbar.set_visible(True)
         self.time.set_visible(True)
 
+        try:
+            self._length_us = int(mp.length or 0)
+        except (TypeError, ValueError):
+            self._length_us = 0
+        self._shown_progress = None
+        self._shown_second = -1
+
         player_name = (mp.player_name or "").lower() if hasattr(mp, "player_name") else ""
         can_seek = bool(getattr(mp, "can_seek", False))
 
@@ -247,7 +264,7 @@ class PlayerBox(Box):
             self.forward.add_style_class("disabled")
             self.progressbar.set_value(0.0)
             self.time.set_text("--:-- / --:--")
-            # timer already stopped above
+            # tick already stopped above
         else:
             self.backward.remove_style_class("disabled")
             self.forward.remove_style_class("disabled")
@@ -271,34 +288,24 @@ class PlayerBox(Box):
         # Only for seekable players
         if (not self.mpris_player) or (not getattr(self.mpris_player, "can_seek", False)):
             return
-        if self._progress_timer_id:
+        if self._progress_tick_id or not self.get_mapped():
             return
-        # Match your “adaptive” cadence
-        playing = getattr(self.mpris_player, "playback_status", "").lower() == "playing"
-        interval = 1000 if playing else 5000
-        self._progress_timer_id = GLib.timeout_add(interval, self._update_progress)
-        # Immediate refresh, but only if mapped
-        if self.get_mapped():
-            self._update_progress()
+        # The position is interpolated by the service, so reading it every
+        # frame is cheap; paused players only need the one refresh
+        self._update_progress()
+        if self.mpris_player.playback_status == "playing":
+            self._progress_tick_id = self.add_tick_callback(self._on_progress_tick)
 
     def _stop_progress_timer(self, *a):
-        if self._progress_timer_id:
-            GLib.source_remove(self._progress_timer_id)
-            self._progress_timer_id = 0
-
-    def _start_adaptive_progress_timer(self):
-        """Start progress timer with adaptive interval based on playback status"""
-        if self._progress_timer_id:
-            GLib.source_remove(self._progress_timer_id)
-        
-        # Use longer intervals when paused to reduce CPU usage
-        if hasattr(self.mpris_player, 'playback_status') and self.mpris_player.playback_status == "playing":
-            interval = 1000  # 1 second when playing
-        else:
-            interval = 5000  # 5 seconds when paused/stopped
-            
-        self._progress_timer_id = GLib.timeout_add(interval, self._update_progress)
-        self._update_progress()  # Update immediately
+        if self._progress_tick_id:
+            self.remove_tick_callback(self._progress_tick_id)
+            self._progress_tick_id = 0
+
+    def _on_progress_tick(self, widget, frame_clock):
+        if self._update_progress():
+            return GLib.SOURCE_CONTINUE
+        self._progress_tick_id = 0
+        return GLib.SOURCE_REMOVE
 
     def _set_cover_image(self, image_path):
         if getattr(self, "_wallpaper_monitor", None):
@@ -329,24 +336,29 @@ class PlayerBox(Box):
             self._wallpaper_monitor = None
         super().do_destroy()
 
-    def _download_and_set_artwork(self, arturl):
-        """
-        Download the artwork from the given URL asynchronously and update the cover image
-        using GLib.idle_add to ensure UI updates occur on the main thread.
-        """
-        try:
-            parsed = urllib.parse.urlparse(arturl)
-            suffix = os.path.splitext(parsed.path)[1] or ".png"
-            with urllib.request.urlopen(arturl) as response:
-                data = response.read()
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            temp_file.write(data)
-            temp_file.close()
-            local_arturl = temp_file.name
-        except Exception:
-            local_arturl = os.path.expanduser("~/.current.wall")
-        GLib.idle_add(self._set_cover_image, local_arturl)
-        return None
+    def _request_artwork(self, *_):
+        """Ask the shared album art cache for the current remote cover."""
+        arturl = self._art_url
+        if not arturl or urllib.parse.urlparse(arturl).scheme not in ("http", "https"):
+            return
+        # Pre-scaled to device pixels, so CircleImage paints it as is
+        art_size = self.cover.size * self.cover.get_scale_factor()
+        AlbumArtCache.get_initial().request(arturl, art_size, self._on_artwork_ready)
+
+    def _on_artwork_ready(self, arturl, pixbuf):
+        """Show a cover from the shared album art cache, unless the track moved on meanwhile."""
+        if arturl != self._art_url:
+            return
+        if pixbuf is None:
+            self._set_cover_image(None)
+            return
+        if getattr(self, "_wallpaper_monitor", None):
+            try:
+                self._wallpaper_monitor.disconnect_by_func(self.on_wallpaper_changed)
+            except Exception:
+                pass
+            self._wallpaper_monitor = None
+        self.cover.set_image_from_pixbuf(pixbuf)
 
     def update_play_pause_icon(self):
         if self.mpris_player.playback_status == "playing":
@@ -385,35 +397,35 @@ class PlayerBox(Box):
             self.mpris_player.next()
 
     def _update_progress(self):
-        # If widget is not visible/mapped anymore, stop the timer.
-        if not self.get_mapped():
-            self._stop_progress_timer()
-            return False
-    
-        mp = self.mpris_player
-        if not mp:
-            self._stop_progress_timer()
+        # If widget is not visible/mapped anymore, stop ticking.
+        if not self.get_mapped() or not self.mpris_player:
             return False
-    
+
         try:
-            current = int(getattr(mp, "position", 0))
+            current = int(self.mpris_player.position)
         except Exception:
             current = 0
-    
-        try:
-            total = int(getattr(mp, "length", 0) or 0)
-        except Exception:
-            total = 0
-    
+
+        total = self._length_us
         if total <= 0:
             progress = 0.0
-            self.time.set_text("--:-- / --:--")
+            second = None
         else:
+            current = min(current, total)
             progress = max(0.0, min(1.0, current / total))
-            self.time.set_text(f"{self._format_time(current)} / {self._format_time(total)}")
-    
-        # CircularProgressBar expects 0..1 — safe call
-        self.progressbar.set_value(progress)
+            second = current // 1000000
+
+        # Most frames move the arc by less than a pixel and the label not at all
+        if self._shown_progress is None or abs(progress - self._shown_progress) >= PROGRESS_EPSILON:
+            # CircularProgressBar expects 0..1
+            self.progressbar.set_value(progress)
+            self._shown_progress = progress
+        if second != self._shown_second:
+            if second is None:
+                self.time.set_text("--:-- / --:--")
+            else:
+                self.time.set_text(f"{self._format_time(current)} / {self._format_time(total)}")
+            self._shown_second = second
         return True  # keep running while mapped
 
     def _format_time(self, us):
@@ -440,10 +452,8 @@ class PlayerBox(Box):
         if self.mpris_player:
             self._apply_mpris_properties()
         else:
-            # Clean up timer when player is removed
-            if self._progress_timer_id:
-                GLib.source_remove(self._progress_timer_id)
-                self._progress_timer_id = None
+            # Clean up the tick when player is removed
+            self._stop_progress_timer()
         self._update_pending = False
         return False
 
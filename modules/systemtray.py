@@ -3,8 +3,10 @@ from typing import Literal
 import gi
 
 gi.require_version("Gray", "0.1")
+import hashlib
 import logging
 import os
+from collections import OrderedDict
 
 from fabric.widgets.box import Box
 from gi.repository import Gdk, GdkPixbuf, GLib, Gray, Gtk, GObject
@@ -13,12 +15,81 @@ import config.data as data
 
 logger = logging.getLogger(__name__)
 
+# Rendered icons kept across items and refreshes
+PIXBUF_CACHE_SIZE = 128
+
+# Item properties Gray updates on NewIcon / NewAttentionIcon / NewStatus
+ICON_PROPERTIES = ("icon-pixmaps", "icon-name", "icon-theme-path", "status")
+# ...and on NewTitle / NewToolTip
+TOOLTIP_PROPERTIES = ("tooltip", "title")
+
+# One IconTheme per custom theme path, shared by every tray item using it
+_icon_themes: dict[str, Gtk.IconTheme] = {}
+# (pixmap digest, None, size), (icon file, mtime, size) or
+# (icon name, theme path, mtime of its file in that path, size) -> pixbuf
+_pixbuf_cache: "OrderedDict[tuple, GdkPixbuf.Pixbuf]" = OrderedDict()
+
+
+def _icon_theme_for_path(path: str | None) -> Gtk.IconTheme:
+    if not path:
+        return Gtk.IconTheme.get_default()
+    theme = _icon_themes.get(path)
+    if theme is None:
+        theme = Gtk.IconTheme.new()
+        theme.prepend_search_path(path)
+        _icon_themes[path] = theme
+    return theme
+
+
+def _mtime(path: str | None) -> int | None:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _pixmap_digest(pixmap) -> str | None:
+    """Hash of a Gray.Pixmap's pixel data, or None if it cannot be read."""
+    buf = getattr(pixmap, "buf", None)
+    if buf is None:
+        return None
+    try:
+        digest = hashlib.blake2b(bytes(buf), digest_size=16)
+    except TypeError:
+        return None
+    digest.update(f"{getattr(pixmap, 'width', 0)}x{getattr(pixmap, 'height', 0)}".encode())
+    return digest.hexdigest()
+
+
+def _cached_pixbuf(key: tuple) -> GdkPixbuf.Pixbuf | None:
+    cached = _pixbuf_cache.get(key)
+    if cached is not None:
+        _pixbuf_cache.move_to_end(key)
+    return cached
+
+
+def _remember_pixbuf(key: tuple, pixbuf: GdkPixbuf.Pixbuf) -> GdkPixbuf.Pixbuf:
+    _pixbuf_cache[key] = pixbuf
+    _pixbuf_cache.move_to_end(key)
+    while len(_pixbuf_cache) > PIXBUF_CACHE_SIZE:
+        _pixbuf_cache.popitem(last=False)
+    return pixbuf
+
+
+def _clear_icon_caches(*_):
+    _pixbuf_cache.clear()
+    for theme in _icon_themes.values():
+        theme.rescan_if_needed()
+
+
 class SystemTray(Box):
     __gsignals__ = {
         "items-present-changed": (GObject.SIGNAL_RUN_FIRST, None, (bool,))
     }
 
-    def __init__(self, pixel_size: int = 20, refresh_interval: int = 1, **kwargs) -> None:
+    def __init__(self, pixel_size: int = 20, **kwargs) -> None:
         orientation: Literal["horizontal", "vertical", "h", "v"] = "horizontal" if not data.VERTICAL else "vertical"
         super().__init__(
             name="systray",
@@ -31,7 +102,6 @@ class SystemTray(Box):
         self.enabled = True
         super().set_visible(False)
         self.pixel_size = pixel_size
-        self.refresh_interval = refresh_interval
 
         self.buttons_by_id = {}
         self.items_by_id = {}
@@ -39,7 +109,8 @@ class SystemTray(Box):
         self.watcher = Gray.Watcher()
         self.watcher.connect("item-added", self.on_watcher_item_added)
 
-        GLib.timeout_add_seconds(self.refresh_interval, self._refresh_all_items)
+        # Items are redrawn only when they announce a change
+        Gtk.IconTheme.get_default().connect("changed", self._on_icon_theme_changed)
 
         self._has_items = False
         self.connect("add", self._on_child_changed)
@@ -67,17 +138,33 @@ class SystemTray(Box):
         return self._has_items
 
     def _get_item_pixbuf(self, item: Gray.Item) -> GdkPixbuf.Pixbuf:
+        size = self.pixel_size
+        theme_path = item.get_icon_theme_path()
         try:
-            pm = Gray.get_pixmap_for_pixmaps(item.get_icon_pixmaps(), self.pixel_size)
+            pm = Gray.get_pixmap_for_pixmaps(item.get_icon_pixmaps(), size)
             if pm:
-                return pm.as_pixbuf(self.pixel_size, GdkPixbuf.InterpType.HYPER)
+                digest = _pixmap_digest(pm)
+                if digest is None:
+                    return pm.as_pixbuf(size, GdkPixbuf.InterpType.HYPER)
+                key = (digest, None, size)
+                cached = _cached_pixbuf(key)
+                if cached is not None:
+                    return cached
+                return _remember_pixbuf(key, pm.as_pixbuf(size, GdkPixbuf.InterpType.HYPER))
 
             name = item.get_icon_name()
-            # If IconName is a file path, prioritize loading directly from the file
-            if name and os.path.exists(name):
+
+            # If IconName is a file path, prioritize loading directly from the file.
+            # Apps rewrite that file before emitting NewIcon, hence the mtime
+            mtime = _mtime(name)
+            if mtime is not None:
+                key = (name, mtime, size)
+                cached = _cached_pixbuf(key)
+                if cached is not None:
+                    return cached
                 try:
-                    return GdkPixbuf.Pixbuf.new_from_file_at_scale(
-                        name, self.pixel_size, self.pixel_size, True
+                    return _remember_pixbuf(
+                        key, GdkPixbuf.Pixbuf.new_from_file_at_scale(name, size, size, True)
                     )
                 except Exception as e:
                     # The file path exists but loading fails, falling back to theme search
@@ -85,42 +172,71 @@ class SystemTray(Box):
                         f"Load icon from file failed: {e}; fallback to theme for '{name}'"
                     )
 
-            theme = Gtk.IconTheme.new()
-            path = item.get_icon_theme_path()
-            if path:
-                theme.prepend_search_path(path)
-            return theme.load_icon(name, self.pixel_size, Gtk.IconLookupFlags.FORCE_SIZE)
+            theme = _icon_theme_for_path(theme_path)
+            # Icons in the item's own theme path get rewritten in place too
+            info = theme.lookup_icon(name, size, Gtk.IconLookupFlags.FORCE_SIZE) if theme_path and name else None
+            key = (name, theme_path, _mtime(info.get_filename()) if info else None, size)
+            cached = _cached_pixbuf(key)
+            if cached is not None:
+                return cached
+            return _remember_pixbuf(
+                key,
+                info.load_icon() if info else theme.load_icon(name, size, Gtk.IconLookupFlags.FORCE_SIZE),
+            )
         except GLib.Error as e:
             logger.debug(f"Icon load error {e}")
             return Gtk.IconTheme.get_default().load_icon(
-                "image-missing", self.pixel_size, Gtk.IconLookupFlags.FORCE_SIZE
+                "image-missing", size, Gtk.IconLookupFlags.FORCE_SIZE
             )
 
-    def _refresh_item_ui(self, _identifier: str, item: Gray.Item, button: Gtk.Button):
+    @staticmethod
+    def _get_item_tooltip(item: Gray.Item) -> str | None:
+        if hasattr(item, 'get_tooltip_text'):
+            return item.get_tooltip_text()
+        if hasattr(item, 'get_title'):
+            return item.get_title()
+        return None
+
+    def _refresh_item_icon(self, item: Gray.Item, button: Gtk.Button):
         pixbuf = self._get_item_pixbuf(item)
         img = button.get_image()
         if isinstance(img, Gtk.Image):
-            img.set_from_pixbuf(pixbuf)
+            if img.get_pixbuf() is not pixbuf:
+                img.set_from_pixbuf(pixbuf)
         else:
             new = Gtk.Image.new_from_pixbuf(pixbuf)
             button.set_image(new)
             new.show()
-        tip = None
-        if hasattr(item, 'get_tooltip_text'):
-            tip = item.get_tooltip_text()
-        elif hasattr(item, 'get_title'):
-            tip = item.get_title()
+
+    def _on_item_icon_changed(self, item: Gray.Item, button: Gtk.Button):
+        theme_path = item.get_icon_theme_path()
+        if theme_path:
+            # The app may have added the new icon to its theme path
+            _icon_theme_for_path(theme_path).rescan_if_needed()
+        self._refresh_item_icon(item, button)
+
+    def _refresh_item_tooltip(self, item: Gray.Item, button: Gtk.Button):
+        tip = self._get_item_tooltip(item)
         if tip:
-            button.set_tooltip_text(tip)
+            if button.get_tooltip_text() != tip:
+                button.set_tooltip_text(tip)
         else:
             button.set_has_tooltip(False)
 
+    def _refresh_item_ui(self, _identifier: str, item: Gray.Item, button: Gtk.Button):
+        self._refresh_item_icon(item, button)
+        self._refresh_item_tooltip(item, button)
+
     def _refresh_all_items(self) -> bool:
         for ident, item in self.items_by_id.items():
             btn = self.buttons_by_id.get(ident)
             if btn:
                 self._refresh_item_ui(ident, item, btn)
-        return True
+        return False
+
+    def _on_icon_theme_changed(self, *_):
+        _clear_icon_caches()
+        self._refresh_all_items()
 
     def on_watcher_item_added(self, _, identifier: str):
         item = self.watcher.get_item_for_identifier(identifier)
@@ -136,8 +252,10 @@ class SystemTray(Box):
         self.buttons_by_id[identifier] = btn
         self.items_by_id[identifier] = item
 
-        item.connect("notify::icon-pixmaps", lambda itm, pspec: self._refresh_item_ui(identifier, itm, btn))
-        item.connect("notify::icon-name", lambda itm, pspec: self._refresh_item_ui(identifier, itm, btn))
+        for prop in ICON_PROPERTIES:
+            item.connect(f"notify::{prop}", lambda itm, pspec: self._on_item_icon_changed(itm, btn))
+        for prop in TOOLTIP_PROPERTIES:
+            item.connect(f"notify::{prop}", lambda itm, pspec: self._refresh_item_tooltip(itm, btn))
 
         try:
             item.connect("updated", lambda itm: self._refresh_item_ui(identifier, itm, btn))
@@ -155,7 +273,7 @@ class SystemTray(Box):
         btn.connect("button-press-event", lambda b, e: self.on_button_click(b, item, e))
         img = Gtk.Image.new_from_pixbuf(self._get_item_pixbuf(item))
         btn.set_image(img)
-        tip = item.get_tooltip_text() if hasattr(item, 'get_tooltip_text') else getattr(item, 'get_title', lambda: None)()
+        tip = self._get_item_tooltip(item)
         if tip:
             btn.set_tooltip_text(tip)
         btn.connect("notify::visible", lambda *a: self._update_visibility())
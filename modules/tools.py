@@ -1,14 +1,19 @@
+import json
 import os
-import subprocess
 
+from fabric.hyprland.widgets import get_hyprland_connection
 from fabric.utils.helpers import exec_shell_command_async, get_relative_path
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.label import Label
-from gi.repository import Gdk, GLib
+from gi.repository import Gdk, Gio, GLib
 
 import config.data as data
 import modules.icons as icons
+from config.loguru_config import logger
+from services.process_watch import ProcessWatch
+
+logger = logger.bind(name="Toolbox", type="Module")
 
 SCREENSHOT_SCRIPT = get_relative_path("../scripts/screenshot.sh")
 POMODORO_SCRIPT = get_relative_path("../scripts/pomodoro.sh")
@@ -231,9 +236,24 @@ class Toolbox(Box):
 
         self.show_all()
 
-        self.recorder_timer_id = GLib.timeout_add_seconds(1, self.update_screenrecord_state)
-        self.gamemode_updater = GLib.timeout_add_seconds(1, self.gamemode_check)
-        self.pomodoro_updater = GLib.timeout_add_seconds(1, self.pomodoro_check)
+        self.process_watch = ProcessWatch.get_initial()
+        self.process_watch.watch("screenrecord", "gpu-screen-recorder", full=True)
+        self.process_watch.watch("pomodoro", r"pomodoro\.sh", full=True)
+        self.process_watch.connect("started", lambda _, name: self._on_process_state(name, True))
+        self.process_watch.connect("stopped", lambda _, name: self._on_process_state(name, False))
+        self._update_screenrecord_ui(self.process_watch.is_running("screenrecord"))
+        self._update_pomodoro_ui(self.process_watch.is_running("pomodoro"))
+
+        # Game mode only changes when toggled here or when Hyprland reloads
+        self.conn = get_hyprland_connection()
+        self.conn.connect("event::configreloaded", lambda *_: self.gamemode_check())
+        self.gamemode_check()
+
+    def _on_process_state(self, name, running):
+        if name == "screenrecord":
+            self._update_screenrecord_ui(running)
+        elif name == "pomodoro":
+            self._update_pomodoro_ui(running)
 
     def close_menu(self):
         self.notch.close_notch()
@@ -323,21 +343,6 @@ class Toolbox(Box):
         exec_shell_command_async(f"bash -c 'nohup bash {POMODORO_SCRIPT} > /dev/null 2>&1 & disown'")
         self.close_menu()
 
-    def pomodoro_check(self):
-        """Check pomodoro status using proper background threading"""
-        GLib.Thread.new("pomodoro-check", self._pomodoro_check_thread, None)
-        return True
-    
-    def _pomodoro_check_thread(self, user_data):
-        """Background thread to check pomodoro status"""
-        try:
-            result = subprocess.run("pgrep -f pomodoro.sh", shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            running = result.returncode == 0
-        except Exception:
-            running = False
-
-        GLib.idle_add(self._update_pomodoro_ui, running)
-    
     def _update_pomodoro_ui(self, running):
         """Update pomodoro UI from main thread"""
         if running:
@@ -353,25 +358,37 @@ class Toolbox(Box):
         self.close_menu()
 
     def gamemode(self, *args):
-        exec_shell_command_async(f"bash {GAMEMODE_SCRIPT}")
-        self.gamemode_check()
+        try:
+            proc = Gio.Subprocess.new(["bash", GAMEMODE_SCRIPT], Gio.SubprocessFlags.NONE)
+            proc.wait_async(None, self._on_gamemode_toggled)
+        except GLib.Error as e:
+            logger.error(f"Failed to toggle game mode: {e}")
         self.close_menu()
 
+    def _on_gamemode_toggled(self, proc, result):
+        try:
+            proc.wait_finish(result)
+        except GLib.Error as e:
+            logger.error(f"Game mode script failed: {e}")
+        self.gamemode_check()
+
     def gamemode_check(self):
         """Check gamemode status using proper background threading"""
         GLib.Thread.new("gamemode-check", self._gamemode_check_thread, None)
         return True
-    
+
     def _gamemode_check_thread(self, user_data):
-        """Background thread to check gamemode status"""
+        """Background thread asking Hyprland whether animations are enabled"""
+        enabled = False
         try:
-            result = subprocess.run(f"bash {GAMEMODE_SCRIPT} check", shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            enabled = result.stdout == b'true\n'
-        except Exception:
-            enabled = False
-
+            # Same result as `gamemode.sh check`, without forking bash + hyprctl;
+            # a slow or stuck Hyprland socket only blocks this thread
+            reply = self.conn.send_command("j/getoption animations:enabled").reply.decode()
+            enabled = json.loads(reply).get("int") != 0
+        except Exception as e:
+            logger.error(f"Unable to get game mode state: {e}")
         GLib.idle_add(self._update_gamemode_ui, enabled)
-    
+
     def _update_gamemode_ui(self, enabled):
         """Update gamemode UI from main thread"""
         if enabled:
@@ -408,21 +425,6 @@ class Toolbox(Box):
             return True
         return False
 
-    def update_screenrecord_state(self):
-        """Check screen recording status using proper background threading"""
-        GLib.Thread.new("screenrecord-check", self._screenrecord_check_thread, None)
-        return True
-    
-    def _screenrecord_check_thread(self, user_data):
-        """Background thread to check screen recording status"""
-        try:
-            result = subprocess.run("pgrep -f gpu-screen-recorder", shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            running = result.returncode == 0
-        except Exception:
-            running = False
-
-        GLib.idle_add(self._update_screenrecord_ui, running)
-    
     def _update_screenrecord_ui(self, running):
         """Update screen recording UI from main thread"""
         if running:
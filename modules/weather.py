@@ -1,10 +1,10 @@
 import gi
-import requests
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.label import Label
-from gi.repository import Gdk, GLib
+from gi.repository import Gdk
 
+from services.weather import WeatherService
 from utils.conversion import Conversion
 from utils.weather import WeatherUtils
 
@@ -25,14 +25,6 @@ def on_button_leave(widget, _):
     if window:
         window.set_cursor(None)
 
-def get_location_label(session: requests.Session) -> str:
-    try:
-        lat, lon, city = WeatherUtils.get_coordinates(session)
-        return city or "Unknown Location"
-    except Exception as e:
-        logger.warning(f"Location lookup failed: {e}")
-        return "Unknown Location"
-
 class Weather(Box):
     def __init__(self, **kwargs) -> None:
         super().__init__(name="weather", orientation="h", spacing=8, **kwargs)
@@ -53,14 +45,15 @@ class Weather(Box):
         self.lon: float | None = None
         self.notch = None
         self.has_weather_data = False
-        self.session = requests.Session()
 
         self.add(self.button)
         self.show_all()
 
-        # Refresh every 10 minutes
-        GLib.timeout_add_seconds(600, self.fetch_weather)
-        self.fetch_weather()
+        # Fetching, caching and refresh timing live in the shared service
+        self.service = WeatherService.get_initial()
+        self.service.connect("changed", self._on_weather_changed)
+        if self.service.data or self.service.error:
+            self._on_weather_changed()
 
     def set_notch(self, notch) -> None:
         self.notch = notch
@@ -69,40 +62,23 @@ class Weather(Box):
         if self.notch:
             self.notch.open_notch("weather")
 
-    # --- data fetching ---
-
-    def get_coordinates(self) -> bool:
-        self.lat, self.lon, _ = WeatherUtils.get_coordinates(self.session)
-        return self.lat is not None and self.lon is not None
-
-    def fetch_weather(self) -> bool:
-        GLib.Thread.new("weather-fetch", self._fetch_weather_thread)
-        return True
-
-    def _fetch_weather_thread(self):
-        # Get coordinates automatically
-        if not self.get_coordinates():
+    def _on_weather_changed(self, *_):
+        weather = self.service.data
+        if weather is None:
             self.has_weather_data = False
-            GLib.idle_add(lambda: (self.label.set_markup, f"{icons.cloud_off} Location Error") or False)
+            if self.service.error == "location":
+                self.label.set_markup(f"{icons.cloud_off} Location Error")
+            else:
+                self.label.set_markup(f"{icons.cloud_off} Unavailable")
             return
 
-        url = WeatherUtils.get_met_api_url(self.lat, self.lon)
-        try:
-            response = self.session.get(url, headers={"User-Agent": WeatherUtils.get_user_agent()}, timeout=8)
-            if response.status_code == 200:
-                data = response.json()["properties"]["timeseries"][0]["data"]
-                temp = data["instant"]["details"]["air_temperature"]
-                temp = self.converter.convert(temp, "c", "f")
-                # prefer next_1_hours, fallback to next_6_hours
-                code = (data.get("next_1_hours") or data.get("next_6_hours") or {}).get("summary", {}).get("symbol_code")
-                emoji = WeatherUtils.get_weather_emoji(code or "")
-                GLib.idle_add(lambda: (self.label.set_label, f"{emoji} {int(round(temp))}°F") or False)
-                self.has_weather_data = True
-            else:
-                logger.warning(f"met.no error {response.status_code}: {response.text[:120]}")
-                self.has_weather_data = False
-                GLib.idle_add(lambda: (self.label.set_markup, f"{icons.cloud_off} Unavailable") or False)
-        except Exception as e:
+        # A failed refresh keeps showing the last forecast
+        self.lat, self.lon = weather.lat, weather.lon
+        if weather.current_temp is None:
             self.has_weather_data = False
-            logger.warning(f"Error fetching weather: {e}")
-            GLib.idle_add(lambda: (self.label.set_markup, f"{icons.cloud_off} Error") or False)
\ No newline at end of file
+            self.label.set_markup(f"{icons.cloud_off} Unavailable")
+            return
+        temp = self.converter.convert(weather.current_temp, "c", "f")
+        emoji = WeatherUtils.get_weather_emoji(weather.current_code or "")
+        self.label.set_label(f"{emoji} {int(round(temp))}°F")
+        self.has_weather_data = True
@@ -1,7 +1,4 @@
-import logging
-
 import gi
-import requests
 from datetime import datetime, timedelta
 from gi.repository import GLib
 
@@ -12,6 +9,8 @@ from utils.conversion import Conversion
 
 gi.require_version("GLib", "2.0")
 import modules.icons as icons
+from services.weather import WeatherService
+from utils.forecast import build_forecast_model
 from utils.weather import WeatherUtils
 
 converter = Conversion()
@@ -30,25 +29,6 @@ def get_day_name(date):
         return date.strftime("%A")
 
 
-def get_time_period_name(hour, is_today=False, current_hour=0):
-    """Get the closest time period based on hour"""
-    # If it's today and after 18:00, use hourly periods
-    if is_today and current_hour >= 18:
-        return f"{hour:02d}:00"
-
-    # Map to the closest specific time period for regular periods
-    if hour < 3:
-        return "00:00"
-    elif hour < 9:
-        return "06:00"
-    elif hour < 15:
-        return "12:00"
-    elif hour < 21:
-        return "18:00"
-    else:
-        return "00:00"
-
-
 def create_time_period_widget(period_name, temp, emoji):
     """Create a widget for a specific time period"""
     period_box = Box(
@@ -139,7 +119,6 @@ def _get_weather_description(weather_code):
 class WeatherForecast(Box):
     def __init__(self, **kwargs) -> None:
         super().__init__(name="weather-forecast", orientation="v", spacing=16, **kwargs)
-        self.session = requests.Session()
         self.lat = None
         self.lon = None
         self.city_name = "Unknown Location"
@@ -227,15 +206,12 @@ class WeatherForecast(Box):
         self.add(self.error_label)
 
         self.show_all()
-        self.fetch_weather_forecast()
-
-        # Update every 10 minutes
-        GLib.timeout_add_seconds(600, self.fetch_weather_forecast)
 
-    def get_coordinates(self):
-        """Get coordinates using IP-based geolocation"""
-        self.lat, self.lon, self.city_name = WeatherUtils.get_coordinates(self.session)
-        return self.lat is not None and self.lon is not None
+        # Fetching, caching and refresh timing live in the shared service
+        self.service = WeatherService.get_initial()
+        self.service.connect("changed", self._on_weather_changed)
+        if self.service.data or self.service.error:
+            self._on_weather_changed()
 
     def _update_title(self):
         """Update the title with the city name"""
@@ -253,184 +229,22 @@ class WeatherForecast(Box):
 
         return GLib.SOURCE_REMOVE
 
-    def fetch_weather_forecast(self):
-        """Start the weather fetch in a separate thread"""
-        GLib.Thread.new("weather-forecast-fetch", self._fetch_weather_forecast_thread)
-        return True
-
-    def _fetch_weather_forecast_thread(self):
-        """Fetch weather data from Met.no API"""
-        # Get coordinates automatically
-        if not self.get_coordinates():
-            GLib.idle_add(self._show_error)
+    def _on_weather_changed(self, *_):
+        weather = self.service.data
+        if weather is None:
+            self._show_error()
             return
-        url = WeatherUtils.get_met_api_url(self.lat, self.lon)
 
-        try:
-            response = self.session.get(url,
-                headers={'User-Agent': WeatherUtils.get_user_agent()},
-                timeout=8
+        self.lat, self.lon, self.city_name = weather.lat, weather.lon, weather.city
+        if weather.current_temp is not None and weather.current_code:
+            self.current_weather_emoji = WeatherUtils.get_weather_emoji(weather.current_code)
+            self._update_current_weather(
+                weather.current_temp,
+                self.current_weather_emoji,
+                WeatherUtils.get_weather_description(weather.current_code),
             )
-            if response.status_code == 200:
-                data = response.json()
-                timeseries = data["properties"]["timeseries"]
-
-                # Get current weather data
-                current_temp = None
-                current_weather_code = None
-                current_weather_description = ""
-
-                if timeseries:
-                    current_data = timeseries[0]["data"]
-
-                    # Get current temperature
-                    if "instant" in current_data and "details" in current_data["instant"]:
-                        current_temp = current_data["instant"]["details"].get("air_temperature")
-
-                    # Get current weather code and emoji
-                    if "next_1_hours" in current_data and "summary" in current_data["next_1_hours"]:
-                        current_weather_code = current_data["next_1_hours"]["summary"].get("symbol_code")
-                        if current_weather_code:
-                            self.current_weather_emoji = WeatherUtils.get_weather_emoji(current_weather_code)
-                            current_weather_description = WeatherUtils.get_weather_description(current_weather_code)
-                    elif "next_6_hours" in current_data and "summary" in current_data["next_6_hours"]:
-                        current_weather_code = current_data["next_6_hours"]["summary"].get("symbol_code")
-                        if current_weather_code:
-                            self.current_weather_emoji = WeatherUtils.get_weather_emoji(current_weather_code)
-                            current_weather_description = WeatherUtils.get_weather_description(current_weather_code)
-
-                # Update the current weather UI
-                if current_temp is not None and current_weather_code:
-                    GLib.idle_add(self._update_current_weather, current_temp, self.current_weather_emoji,
-                                  current_weather_description)
-
-                # Update title with current weather emoji
-                GLib.idle_add(self._update_title)
-
-                # Group data by date and time periods
-                daily_data = {}
-                now = datetime.now()
-                today = now.date()
-                current_hour = now.hour
-
-                # Determine periods for today based on current time
-                if current_hour >= 18:
-                    # After 18:00, show next 4 hours (excluding 00:00)
-                    today_periods = []
-                    for i in range(4):
-                        next_hour = current_hour + 1 + i
-                        if next_hour <= 23:  # Don't show 00:00 (24:00)
-                            today_periods.append(f"{next_hour:02d}:00")
-                else:
-                    # Before 18:00, use regular periods
-                    today_periods = ['00:00', '06:00', '12:00', '18:00']
-
-                for entry in timeseries:
-                    time_str = entry["time"]
-                    time_obj = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-                    date = time_obj.date()
-                    hour = time_obj.hour
-
-                    # Process today and the next 6 days (7 days total)
-                    days_diff = (date - today).days
-                    if days_diff < 0 or days_diff > 6:
-                        continue
-
-                    is_today = (days_diff == 0)
-
-                    # Initialize daily data structure
-                    if date not in daily_data:
-                        if is_today:
-                            # Use dynamic periods for today
-                            daily_data[date] = {period: {'temps': [], 'codes': []} for period in today_periods}
-                        else:
-                            # Use regular periods for future days
-                            daily_data[date] = {
-                                '00:00': {'temps': [], 'codes': []},
-                                '06:00': {'temps': [], 'codes': []},
-                                '12:00': {'temps': [], 'codes': []},
-                                '18:00': {'temps': [], 'codes': []}
-                            }
-
-                    # Determine time period
-                    period = get_time_period_name(hour, is_today, current_hour)
-
-                    # For today, only process periods we're interested in
-                    if is_today and period not in today_periods:
-                        continue
-
-                    # For today with regular periods, only show future time periods
-                    if is_today and current_hour < 18:
-                        period_hour_map = {'00:00': 0, '06:00': 6, '12:00': 12, '18:00': 18}
-                        if period in period_hour_map and period_hour_map[period] < current_hour:
-                            continue
-
-                    # Skip if this period doesn't exist in our data structure
-                    if period not in daily_data[date]:
-                        continue
-
-                    # Extract temperature
-                    if "instant" in entry["data"] and "details" in entry["data"]["instant"]:
-                        temp = entry["data"]["instant"]["details"].get("air_temperature")
-                        if temp is not None:
-                            daily_data[date][period]['temps'].append(int(temp))
-
-                    # Extract weather code
-                    weather_code = None
-                    if "next_6_hours" in entry["data"] and "summary" in entry["data"]["next_6_hours"]:
-                        weather_code = entry["data"]["next_6_hours"]["summary"].get("symbol_code")
-                    elif "next_1_hours" in entry["data"] and "summary" in entry["data"]["next_1_hours"]:
-                        weather_code = entry["data"]["next_1_hours"]["summary"].get("symbol_code")
-
-                    if weather_code:
-                        daily_data[date][period]['codes'].append(weather_code)
-
-                # Process daily data and create widgets
-                model = []
-                for date in sorted(daily_data.keys()):
-                    day_data = daily_data[date]
-                    periods_data = {}
-
-                    # Determine which periods to process for this date
-                    is_today_date = (date == today)
-                    periods_to_process = today_periods if is_today_date else ['00:00', '06:00', '12:00', '18:00']
-
-                    for period in periods_to_process:
-                        if period in day_data:
-                            period_info = day_data[period]
-
-                            if period_info['temps'] and period_info['codes']:
-                                # Use average temperature for the period
-                                avg_temp = int(sum(period_info['temps']) / len(period_info['temps']))
-
-                                # Use the most common weather code for the period
-                                most_common_code = max(set(period_info['codes']),
-                                                       key=period_info['codes'].count)
-
-                                emoji = WeatherUtils.get_weather_emoji(most_common_code)
-                                periods_data[period] = {
-                                    'temp': avg_temp,
-                                    'emoji': emoji
-                                }
-                            elif period_info['temps']:
-                                # Have temperature but no weather code
-                                avg_temp = int(sum(period_info['temps']) / len(period_info['temps']))
-                                periods_data[period] = {
-                                    'temp': avg_temp,
-                                    'emoji': "🌡️"
-                                }
-
-                    if periods_data:
-                        model.append((date, periods_data))
-
-                # Update UI in the main thread
-                GLib.idle_add(self._render_forecast_from_model, model)
-            else:
-                GLib.idle_add(self._show_error)
-
-        except Exception:
-            logging.error("Unable to fetch weather forecast: {e}")
-            GLib.idle_add(self._show_error)
+        self._update_title()
+        self._render_forecast_from_model(build_forecast_model(weather, datetime.now()))
 
     def _render_forecast_from_model(self, model):
         # clear container
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""
+Send one command to the running shell over its command socket.
+
+    python -S ax_send.py open launcher
+
+Only the standard library is used so it starts fast enough for keybinds
+(`-S` skips site-packages); see services/command_server.py for the verbs.
+"""
+
+import os
+import socket
+import sys
+
+APP_NAME = "ax-shell"
+# Same path as services/command_server.SOCKET_PATH
+SOCKET_PATH = os.environ.get("AX_SHELL_SOCKET") or os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/{APP_NAME}-{os.getuid()}", f"{APP_NAME}.sock"
+)
+TIMEOUT_S = 5
+
+
+def send(command: str) -> int:
+    """Send `command`, print the shell's reply and return an exit status."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(TIMEOUT_S)
+            sock.connect(SOCKET_PATH)
+            sock.sendall(f"{command}\n".encode())
+            sock.shutdown(socket.SHUT_WR)
+            reply = b""
+            while chunk := sock.recv(4096):
+                reply += chunk
+    except OSError as e:
+        print(f"{APP_NAME} is not reachable at {SOCKET_PATH}: {e}", file=sys.stderr)
+        return 1
+
+    reply = reply.decode(errors="replace").strip()
+    if reply.startswith("ok"):
+        text = reply[3:]
+        if text:
+            print(text)
+        return 0
+    print(reply, file=sys.stderr)
+    return 1
+
+
+def main() -> int:
+    command = " ".join(sys.argv[1:]).strip()
+    if not command:
+        print("usage: ax_send.py <command> [argument]", file=sys.stderr)
+        return 2
+    return send(command)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,35 +2,12 @@
 
 """
 Example script for opening the launcher on the focused monitor.
-This script uses the global keybind handler to open the launcher
-on whichever monitor currently has focus.
+The running shell does the work; this only sends it an `open launcher`
+command over the command socket, so no Ax-Shell modules are imported.
 """
 
 import sys
-import os
-from config.loguru_config import logger
 
-logger = logger.bind(name="Launcher", type="Script")
+from ax_send import send
 
-# Add the Ax-Shell directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-try:
-    from utils.global_keybinds import get_global_keybind_handler
-    
-    handler = get_global_keybind_handler()
-    success = handler.open_launcher()
-    
-    if success:
-        logger.debug("Launcher opened on focused monitor")
-        sys.exit(0)
-    else:
-        logger.error("Failed to open launcher")
-        sys.exit(1)
-        
-except ImportError as e:
-    logger.error(f"Unable to import Ax-Shell modules: {e}")
-    sys.exit(1)
-except Exception as e:
-    logger.error(f"Unable to open launcher: {e}")
-    sys.exit(1)
\ No newline at end of file
+sys.exit(send("open launcher"))
@@ -0,0 +1,219 @@
+import hashlib
+import os
+import time
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gi.repository import GdkPixbuf, GLib
+
+import config.data as data
+from config.loguru_config import logger
+
+logger = logger.bind(name="Album Art", type="Service")
+
+ART_CACHE_DIR = os.path.join(data.CACHE_DIR, "album_art")
+# Bytes of downloaded covers kept on disk before least-recently-used ones are evicted
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+# Decoded, pre-scaled covers kept in memory
+DEFAULT_MEMORY_ITEMS = 16
+# Covers larger than this are not downloaded
+MAX_DOWNLOAD_BYTES = 16 * 1024 * 1024
+DOWNLOAD_TIMEOUT_S = 10
+FETCH_WORKERS = 2
+
+ArtCallback = Callable[[str, Optional[GdkPixbuf.Pixbuf]], None]
+
+
+def _square(pixbuf: GdkPixbuf.Pixbuf, size: int) -> GdkPixbuf.Pixbuf:
+    """Centered square crop scaled to `size`, the shape CircleImage draws."""
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    side = min(width, height)
+    if width != height:
+        pixbuf = pixbuf.new_subpixbuf((width - side) // 2, (height - side) // 2, side, side)
+    if side != size:
+        pixbuf = pixbuf.scale_simple(size, size, GdkPixbuf.InterpType.BILINEAR)
+    return pixbuf
+
+
+class AlbumArtCache:
+    """
+    Downloaded MPRIS cover art, shared by all player widgets.
+
+    Covers are keyed by a hash of their URL and kept on disk under a byte
+    budget with LRU eviction, so the same album cover is fetched once. A
+    cover requested again while its download is in flight joins that
+    download. Decoding and scaling happen on the fetch pool, and the
+    pre-scaled pixbufs are kept in a small in-memory LRU per display size.
+    Callbacks always run on the main loop.
+    """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        if AlbumArtCache.instance is None:
+            AlbumArtCache.instance = AlbumArtCache()
+        return AlbumArtCache.instance
+
+    def __init__(
+        self,
+        directory: str = ART_CACHE_DIR,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        memory_items: int = DEFAULT_MEMORY_ITEMS,
+    ):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.memory_items = memory_items
+        # key -> [bytes on disk, last use]
+        self._entries: Dict[str, List[float]] = {}
+        self._total_bytes = 0
+        self._loaded = False
+        self._pixbufs: "OrderedDict[Tuple[str, int], GdkPixbuf.Pixbuf]" = OrderedDict()
+        # key -> waiting (url, size, callback), one fetch per key
+        self._pending: Dict[str, List[Tuple[str, int, ArtCallback]]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="album-art")
+
+    @staticmethod
+    def key_for_url(url: str) -> str:
+        return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+    def path_for_key(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    # ---------- Public API ----------
+
+    def request(self, url: str, size: int, callback: ArtCallback):
+        """
+        Deliver the cover at `url` as a `size`x`size` pixbuf to
+        `callback(url, pixbuf)`, or None if it can't be fetched. Memory hits
+        are delivered immediately.
+        """
+        self._ensure_loaded()
+        key = self.key_for_url(url)
+        pixbuf = self._pixbufs.get((key, size))
+        if pixbuf is not None:
+            self._pixbufs.move_to_end((key, size))
+            self._touch(key)
+            callback(url, pixbuf)
+            return
+
+        waiting = self._pending.get(key)
+        if waiting is not None:
+            waiting.append((url, size, callback))
+            return
+        self._pending[key] = [(url, size, callback)]
+        on_disk = key in self._entries
+        self._executor.submit(self._fetch, key, url, size, on_disk)
+
+    # ---------- Disk index ----------
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        os.makedirs(self.directory, exist_ok=True)
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp") or not entry.is_file():
+                continue
+            stat = entry.stat()
+            self._entries[entry.name] = [stat.st_size, stat.st_mtime]
+        self._total_bytes = sum(size for size, _ in self._entries.values())
+
+    def _touch(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[1] = time.time()
+
+    def _evict_over_budget(self):
+        if self._total_bytes <= self.budget_bytes:
+            return
+        for key, _ in sorted(self._entries.items(), key=lambda kv: kv[1][1]):
+            if self._total_bytes <= self.budget_bytes:
+                break
+            if key in self._pending:
+                continue
+            size, _ = self._entries.pop(key)
+            self._total_bytes -= size
+            try:
+                os.remove(self.path_for_key(key))
+                logger.debug(f"Evicted album art {key}")
+            except OSError:
+                pass
+
+    # ---------- Fetch pool ----------
+
+    def _fetch(self, key: str, url: str, size: int, on_disk: bool):
+        path = self.path_for_key(key)
+        downloaded = 0
+        source = None
+        scaled = {}
+        try:
+            if on_disk:
+                # Bump the mtime so the LRU order survives restarts
+                os.utime(path)
+            else:
+                downloaded = self._download(url, path)
+            source = GdkPixbuf.Pixbuf.new_from_file(path)
+            # Scaled here so the main loop only has to paint it
+            scaled[size] = _square(source, size)
+        except Exception as e:
+            logger.warning(f"Unable to load album art {url}: {e}")
+            # Partial or undecodable files are not worth keeping
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            downloaded = 0
+        GLib.idle_add(self._on_fetched, key, source, scaled, downloaded)
+
+    def _download(self, url: str, path: str) -> int:
+        with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT_S) as response:
+            payload = response.read(MAX_DOWNLOAD_BYTES + 1)
+        if len(payload) > MAX_DOWNLOAD_BYTES:
+            raise ValueError(f"cover larger than {MAX_DOWNLOAD_BYTES} bytes")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return len(payload)
+
+    def _on_fetched(
+        self,
+        key: str,
+        source: Optional[GdkPixbuf.Pixbuf],
+        scaled: Dict[int, GdkPixbuf.Pixbuf],
+        downloaded: int,
+    ):
+        waiting = self._pending.pop(key, [])
+        if source is None:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[0]
+        else:
+            if downloaded:
+                self._entries[key] = [downloaded, time.time()]
+                self._total_bytes += downloaded
+                self._evict_over_budget()
+            else:
+                self._touch(key)
+
+        for size, pixbuf in scaled.items():
+            self._remember((key, size), pixbuf)
+        for url, size, callback in waiting:
+            # Requests for other sizes that joined the fetch are rare
+            if source is not None and size not in scaled:
+                scaled[size] = _square(source, size)
+                self._remember((key, size), scaled[size])
+            try:
+                callback(url, scaled.get(size))
+            except Exception as e:
+                logger.error(f"Album art callback failed: {e}")
+        return False
+
+    def _remember(self, mem_key: Tuple[str, int], pixbuf: GdkPixbuf.Pixbuf):
+        self._pixbufs[mem_key] = pixbuf
+        self._pixbufs.move_to_end(mem_key)
+        while len(self._pixbufs) > self.memory_items:
+            self._pixbufs.popitem(last=False)
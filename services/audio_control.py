@@ -0,0 +1,146 @@
+import time
+from typing import Dict, Optional
+
+from fabric.audio.service import Audio
+from fabric.core.service import Service, Signal
+from gi.repository import GLib
+
+from config.loguru_config import logger
+from utils.debounce import DebouncedSetter
+
+logger = logger.bind(name="Audio Control", type="Service")
+
+DEVICES = ("speaker", "microphone")
+# Volume writes are throttled to one per frame per device
+WRITE_INTERVAL_MS = 16
+# After a write, stream updates that disagree with it are treated as echoes
+# of earlier writes for this long
+ECHO_WINDOW_MS = 250
+
+
+def _now_ms() -> float:
+    return time.monotonic() * 1000
+
+
+class _Device:
+    """Write coalescing and echo suppression for one default device."""
+
+    def __init__(self, control: "AudioControl", kind: str):
+        self.control = control
+        self.kind = kind
+        self.stream = None
+        self._changed_id = 0
+        # Volume the user asked for, shown until the stream catches up
+        self.target: Optional[int] = None
+        self.hold_until_ms = 0.0
+        self.setter = DebouncedSetter(WRITE_INTERVAL_MS, self._write, max_wait_ms=WRITE_INTERVAL_MS)
+
+    def bind(self, stream):
+        if stream is self.stream:
+            return
+        if self.stream is not None and self._changed_id:
+            try:
+                self.stream.disconnect(self._changed_id)
+            except Exception:
+                pass
+        self.stream = stream
+        self._changed_id = stream.connect("changed", self._on_stream_changed) if stream else 0
+        self.target = None
+        self.control._queue_changed(self.kind)
+
+    @property
+    def volume(self) -> float:
+        if self.target is not None:
+            return float(self.target)
+        return float(self.stream.volume) if self.stream else 0.0
+
+    def set_volume(self, value: int):
+        if not self.stream:
+            return
+        self.target = int(max(0, min(100, value)))
+        self.setter.push(self.target)
+        self.control._queue_changed(self.kind)
+
+    def _write(self, value: int):
+        if not self.stream:
+            return
+        self.hold_until_ms = _now_ms() + ECHO_WINDOW_MS
+        if abs(float(self.stream.volume) - value) >= 0.5:
+            self.stream.volume = value
+
+    def _on_stream_changed(self, *_):
+        if self.target is not None and self.setter.pending is None:
+            settled = abs(float(self.stream.volume) - self.target) < 0.5
+            if settled or _now_ms() >= self.hold_until_ms:
+                self.target = None
+        self.control._queue_changed(self.kind)
+
+
+class AudioControl(Service):
+    """
+    Single source of truth for the default speaker and microphone.
+
+    All volume widgets share one Audio connection through this service and
+    write through it: writes are throttled to one per frame per device, and
+    while a write is in flight the widgets keep showing the requested value
+    instead of the stale values echoed back by the server. `changed(kind)`
+    fires at most once per main-loop iteration per device.
+    """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        if AudioControl.instance is None:
+            AudioControl.instance = AudioControl()
+        return AudioControl.instance
+
+    @Signal
+    def changed(self, kind: str) -> None: ...
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.audio = Audio()
+        self._devices: Dict[str, _Device] = {kind: _Device(self, kind) for kind in DEVICES}
+        self._queued: Dict[str, int] = {}
+
+        for kind in DEVICES:
+            self.audio.connect(f"notify::{kind}", self._on_default_changed)
+            self._devices[kind].bind(getattr(self.audio, kind))
+
+    def _on_default_changed(self, _audio, pspec):
+        kind = pspec.name
+        if kind in self._devices:
+            self._devices[kind].bind(getattr(self.audio, kind))
+
+    def _queue_changed(self, kind: str):
+        if kind not in self._queued:
+            self._queued[kind] = GLib.idle_add(self._emit_changed, kind)
+
+    def _emit_changed(self, kind: str):
+        self._queued.pop(kind, None)
+        self.emit("changed", kind)
+        return False
+
+    # ---------- Public API ----------
+
+    def stream(self, kind: str):
+        return self._devices[kind].stream
+
+    def volume(self, kind: str) -> float:
+        return self._devices[kind].volume
+
+    def muted(self, kind: str) -> bool:
+        stream = self._devices[kind].stream
+        return bool(stream and stream.muted)
+
+    def set_volume(self, kind: str, value: int):
+        self._devices[kind].set_volume(value)
+
+    def flush(self, kind: str):
+        self._devices[kind].setter.flush_now()
+
+    def toggle_mute(self, kind: str):
+        stream = self._devices[kind].stream
+        if stream:
+            stream.muted = not stream.muted
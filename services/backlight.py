@@ -0,0 +1,129 @@
+import os
+from typing import Callable, Optional
+
+from gi.repository import Gio, GLib
+
+from config.loguru_config import logger
+
+logger = logger.bind(name="Backlight", type="Service")
+
+BACKLIGHT_DIR = "/sys/class/backlight"
+# Same preference as systemd-backlight: firmware interfaces first, raw last
+_TYPE_PRIORITY = {"firmware": 0, "platform": 1, "raw": 2}
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def find_backlight() -> Optional[str]:
+    """Name of the preferred backlight device, or None on machines without one."""
+    try:
+        names = os.listdir(BACKLIGHT_DIR)
+    except OSError:
+        return None
+
+    def _priority(name: str) -> int:
+        try:
+            with open(os.path.join(BACKLIGHT_DIR, name, "type")) as f:
+                return _TYPE_PRIORITY.get(f.read().strip(), 3)
+        except OSError:
+            return 3
+
+    candidates = [n for n in names if (_read_int(os.path.join(BACKLIGHT_DIR, n, "max_brightness")) or 0) > 0]
+    return min(candidates, key=lambda n: (_priority(n), n)) if candidates else None
+
+
+class Backlight:
+    """
+    Internal panel brightness through /sys/class/backlight.
+
+    The current value is cached and refreshed only when the kernel reports a
+    change on `actual_brightness` (Fn keys, other tools, our own writes), so
+    nothing polls. Writes go straight to sysfs when permitted and through
+    logind's SetBrightness otherwise.
+    """
+
+    def __init__(self, name: str, on_change: Callable[[int], None]):
+        self.name = name
+        self.path = os.path.join(BACKLIGHT_DIR, name)
+        self.max = _read_int(os.path.join(self.path, "max_brightness")) or 0
+        self.current = self._read_actual()
+        self._on_change = on_change
+        self._can_write = os.access(os.path.join(self.path, "brightness"), os.W_OK)
+        self._logind = None
+
+        self._monitor = None
+        try:
+            gfile = Gio.File.new_for_path(os.path.join(self.path, "actual_brightness"))
+            self._monitor = gfile.monitor_file(Gio.FileMonitorFlags.NONE, None)
+            self._monitor.connect("changed", self._on_file_changed)
+        except GLib.Error as e:
+            logger.warning(f"Unable to watch {self.name}: {e}")
+
+        logger.debug(f"Using backlight {self.name} ({self.current}/{self.max})")
+
+    def _read_actual(self) -> int:
+        value = _read_int(os.path.join(self.path, "actual_brightness"))
+        if value is None:
+            value = _read_int(os.path.join(self.path, "brightness"))
+        return value if value is not None else -1
+
+    def _on_file_changed(self, _monitor, _file, _other, event_type):
+        if event_type not in (Gio.FileMonitorEvent.CHANGED, Gio.FileMonitorEvent.CHANGES_DONE_HINT):
+            return
+        value = self._read_actual()
+        if value != self.current:
+            self.current = value
+            self._on_change(value)
+
+    def set(self, value: int):
+        value = max(0, min(self.max, int(value)))
+        if value == self.current:
+            return
+        self.current = value
+        if self._can_write:
+            try:
+                with open(os.path.join(self.path, "brightness"), "w") as f:
+                    f.write(str(value))
+                return
+            except OSError as e:
+                logger.debug(f"Direct write to {self.name} failed, using logind: {e}")
+                self._can_write = False
+        self._set_via_logind(value)
+
+    def _set_via_logind(self, value: int):
+        try:
+            if self._logind is None:
+                self._logind = Gio.DBusProxy.new_for_bus_sync(
+                    Gio.BusType.SYSTEM,
+                    Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES | Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS,
+                    None,
+                    "org.freedesktop.login1",
+                    "/org/freedesktop/login1/session/auto",
+                    "org.freedesktop.login1.Session",
+                    None,
+                )
+            self._logind.call(
+                "SetBrightness",
+                GLib.Variant("(ssu)", ("backlight", self.name, value)),
+                Gio.DBusCallFlags.NONE,
+                -1,
+                None,
+                self._on_logind_done,
+            )
+        except GLib.Error as e:
+            logger.error(f"Unable to set backlight {self.name}: {e}")
+
+    def _on_logind_done(self, proxy, result):
+        try:
+            proxy.call_finish(result)
+        except GLib.Error as e:
+            logger.error(f"logind SetBrightness failed for {self.name}: {e}")
+            # Resync with what the panel actually shows
+            self.current = self._read_actual()
+            self._on_change(self.current)
@@ -1,27 +1,45 @@
 import json
+import os
 import re
 import time
-from typing import Dict, List, Optional, Tuple, Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 from fabric.core.service import Property, Service, Signal
-from fabric.utils import exec_shell_command_async
-from gi.repository import GLib
+from gi.repository import Gio, GLib
 
 import utils.functions as helpers
 from config.loguru_config import logger
+from services import ddcci
+from services.backlight import Backlight, find_backlight
 
 logger = logger.bind(name="Brightness", type="Service")
 
 ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
 _VCP_BRIGHTNESS = 0x10
 
-# Soft ceilings (used even if `timeout` is unavailable), in milliseconds
+# Overridable so a stand-in ddcutil (tests/fake_ddcutil.py) can be used for
+# deterministic runs
+DDCUTIL_BIN = os.environ.get("AX_DDCUTIL", "ddcutil")
+
+# Hard ceilings per ddcutil invocation, in milliseconds; the process is
+# killed when one is hit
 CEIL_MS = {
     "detect": 4000,
     "get":    2000,
     "set":    3200,
 }
 CONFIRM_MS = 1200
+# Delay between a write and the read that confirms it
+SETTLE_MS = 360
+# Writes re-issued for one target before accepting what the monitor reports
+MAX_SET_RETRIES = 2
+# Number of settle latencies averaged for `set_latency_ms`
+LATENCY_SAMPLES = 20
+# Wait after an /dev/i2c-* node appears or goes before re-probing, so udev
+# has applied its permissions
+REPROBE_DELAY_MS = 1000
 
 def _parse_detect_output(out: str) -> List[int]:
     buses: List[int] = []
@@ -43,6 +61,232 @@ def _parse_getvcp_output(out: str) -> Tuple[Optional[int], Optional[int]]:
         return int(m2.group(1)), int(m2.group(2))
     return None, None
 
+def _is_flock_error(out: str) -> bool:
+    return "flock()" in out or "Flock diagnostics" in out or "Max wait time" in out
+
+
+class DdcutilBackend:
+    """
+    Runs ddcutil directly (no shell, no `timeout` wrapper) and reports back
+    on the main loop. Invocations on different buses run in parallel;
+    the caller keeps at most one in flight per bus.
+    """
+
+    name = "ddcutil"
+
+    def __init__(self):
+        self._launcher = Gio.SubprocessLauncher.new(
+            Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_MERGE
+        )
+        self._launcher.setenv("LC_ALL", "C", True)
+
+    @staticmethod
+    def available() -> bool:
+        return helpers.executable_exists(DDCUTIL_BIN)
+
+    def _run(self, args: List[str], ceiling_ms: int, cb: Callable[[str, bool], None]):
+        """Run ddcutil with `args`; `cb(output, timed_out)` is called exactly once."""
+        try:
+            proc = self._launcher.spawnv([DDCUTIL_BIN, *args])
+        except GLib.Error as e:
+            logger.error(f"[.EXEC] Failed to start ddcutil: {e}")
+            GLib.idle_add(lambda: (cb("", False), False)[1])
+            return
+
+        state = {"timed_out": False}
+
+        def _on_ceiling():
+            state["timed_out"] = True
+            logger.warning(f"[.EXEC] ddcutil {' '.join(args)} exceeded {ceiling_ms}ms; killing")
+            proc.force_exit()
+            return False
+
+        ceiling_src = GLib.timeout_add(ceiling_ms, _on_ceiling)
+
+        def _on_done(p, result):
+            if not state["timed_out"]:
+                GLib.source_remove(ceiling_src)
+            try:
+                _, out, _ = p.communicate_utf8_finish(result)
+            except GLib.Error as e:
+                logger.debug(f"[.EXEC] ddcutil communicate failed: {e}")
+                out = ""
+            cb(ANSI_RE.sub("", out or ""), state["timed_out"])
+
+        proc.communicate_utf8_async(None, None, _on_done)
+
+    def detect(self, cb: Callable[[List[int]], None]):
+        self._run(
+            ["--noverify", "--brief", "detect"],
+            CEIL_MS["detect"],
+            lambda out, _timed_out: cb(_parse_detect_output(out)),
+        )
+
+    def get(self, bus: int, cb: Callable[[Optional[int], Optional[int]], None]):
+        def _done(out: str, timed_out: bool):
+            if _is_flock_error(out):
+                logger.warning(f"[.GETVCP] flock: bus={bus}, {out.strip()!r}")
+                cb(None, None)
+                return
+            cur, mx = _parse_getvcp_output(out)
+            if cur is None or not mx:
+                if timed_out or "Timed out" in out or "timeout" in out:
+                    logger.warning(f"[.GETVCP] timeout on bus {bus}: {out.strip()!r}")
+                else:
+                    logger.warning(f"[.GETVCP] Failed to parse getvcp: bus={bus}, {out!r}")
+                cb(None, None)
+                return
+            cb(cur, mx)
+
+        self._run(
+            [
+                "--enable-cross-instance-locks", "--sleep-multiplier=1.0",
+                "getvcp", f"0x{_VCP_BRIGHTNESS:02x}", "--bus", str(bus), "--terse", "--noverify",
+            ],
+            CEIL_MS["get"],
+            _done,
+        )
+
+    def set(self, bus: int, raw: int, cb: Callable[[bool], None]):
+        def _done(out: str, timed_out: bool):
+            if _is_flock_error(out):
+                logger.warning(f"[.SETVCP] flock: bus={bus}, {out.strip()!r}")
+                cb(False)
+            elif timed_out or "Timed out" in out or "timeout" in out:
+                logger.warning(f"[.SETVCP] timeout: bus={bus}, {out.strip()!r}")
+                cb(False)
+            else:
+                cb(True)
+
+        self._run(
+            [
+                "--enable-cross-instance-locks", "--sleep-multiplier=1.0",
+                "setvcp", f"0x{_VCP_BRIGHTNESS:02x}", str(raw), "--bus", str(bus), "--noverify",
+            ],
+            CEIL_MS["set"],
+            _done,
+        )
+
+
+class I2cDevBackend:
+    """
+    Talks DDC/CI to the monitors in-process over /dev/i2c-*, with no
+    subprocess per change. Blocking I2C transfers run on one worker thread
+    per bus; results are delivered on the main loop. Used when the user can
+    open the buses of the connected outputs.
+    """
+
+    name = "i2c-dev"
+
+    # Bus -> its worker, shared by every instance: a re-probe, or a backend
+    # replacing one still finishing its transfers, queues behind them
+    # instead of interleaving with them on the bus
+    _workers: Dict[int, ThreadPoolExecutor] = {}
+
+    def __init__(self, buses: List[int]):
+        self._buses = list(buses)
+        self._devices: Dict[int, ddcci.DdcCiDevice] = {}
+
+    @property
+    def buses(self) -> List[int]:
+        return list(self._buses)
+
+    @staticmethod
+    def probe() -> List[int]:
+        """Buses of connected outputs, if all of them are read/writable."""
+        buses = ddcci.connected_ddc_buses()
+        return buses if ddcci.has_i2c_access(buses) else []
+
+    def _device(self, bus: int) -> ddcci.DdcCiDevice:
+        dev = self._devices.get(bus)
+        if dev is None:
+            dev = self._devices[bus] = ddcci.DdcCiDevice(ddcci.I2cDevTransport(bus))
+        return dev
+
+    def _drop_device(self, bus: int):
+        dev = self._devices.pop(bus, None)
+        if dev is not None:
+            dev.transport.close()
+
+    def close(self):
+        """Release the buses once the transfers already queued are done."""
+        for bus in self._buses:
+            self._worker(bus).submit(self._drop_device, bus)
+
+    @classmethod
+    def _worker(cls, bus: int) -> ThreadPoolExecutor:
+        worker = cls._workers.get(bus)
+        if worker is None:
+            worker = cls._workers[bus] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ddcci-{bus}")
+        return worker
+
+    def _submit(self, bus: int, fn, cb):
+        future = self._worker(bus).submit(fn)
+        future.add_done_callback(lambda f: GLib.idle_add(lambda: (cb(f.result()), False)[1]))
+
+    def _read(self, bus: int) -> Tuple[Optional[int], Optional[int]]:
+        try:
+            return self._device(bus).get_vcp(_VCP_BRIGHTNESS)
+        except (OSError, ddcci.DdcError) as e:
+            logger.warning(f"[.GETVCP] bus={bus}: {e}")
+            self._drop_device(bus)
+            return None, None
+
+    def _write(self, bus: int, raw: int) -> bool:
+        try:
+            self._device(bus).set_vcp(_VCP_BRIGHTNESS, raw)
+            return True
+        except (OSError, ddcci.DdcError) as e:
+            logger.warning(f"[.SETVCP] bus={bus}: {e}")
+            self._drop_device(bus)
+            return False
+
+    def detect(self, cb: Callable[[List[int]], None]):
+        # Only buses whose monitor actually answers a brightness read
+        answered: Dict[int, bool] = {}
+
+        def _on_probed(bus: int, ok: bool):
+            answered[bus] = ok
+            if len(answered) == len(self._buses):
+                cb([b for b in self._buses if answered[b]])
+
+        for bus in self._buses:
+            self._submit(
+                bus,
+                lambda b=bus: self._read(b)[0] is not None,
+                lambda ok, b=bus: _on_probed(b, ok),
+            )
+
+    def get(self, bus: int, cb: Callable[[Optional[int], Optional[int]], None]):
+        self._submit(bus, lambda: self._read(bus), lambda value: cb(*value))
+
+    def set(self, bus: int, raw: int, cb: Callable[[bool], None]):
+        self._submit(bus, lambda: self._write(bus, raw), cb)
+
+
+class _BusState:
+    """Per-bus state machine: at most one DDC operation in flight."""
+
+    __slots__ = (
+        "bus", "current", "max", "target", "target_since_ms", "written",
+        "busy", "read_wanted", "backoff_until_ms", "retries", "confirm", "wake_src",
+    )
+
+    def __init__(self, bus: int):
+        self.bus = bus
+        self.current: Optional[int] = None  # last known percent
+        self.max: Optional[int] = None  # raw VCP maximum
+        self.target: Optional[int] = None  # latest requested percent, if unsettled
+        self.target_since_ms = 0
+        self.written: Optional[int] = None  # percent of the last completed write
+        self.busy = False
+        self.read_wanted = False
+        self.backoff_until_ms = 0
+        self.retries = 0
+        self.confirm: Optional[Tuple[int, int]] = None  # (percent, until_ms)
+        self.wake_src: Optional[int] = None
+
+
 class Brightness(Service):
     instance = None
 
@@ -65,46 +309,102 @@ class Brightness(Service):
     def __init__(self, poll_seconds: int = 10, **kwargs):
         super().__init__(**kwargs)
 
-        self._pending_confirm: Dict[int, Tuple[int, int]] = {}
-
         self._available: List[int] = []
-        self._current: Dict[int, int] = {}
-        self._max_cache: Dict[int, int] = {}
-
-        self._busy = False
-        self._queue: List[Tuple[str, Callable, Tuple[str, int]]] = []  # (cmd, cb, kind)
-        self._current_cmd_started_ms: Optional[int] = None
-        self._current_timeout_src: Optional[int] = None  # GLib source id for our soft timeout
-        self._set_backoff_until_ms: Dict[int, int] = {}
-        self._set_retry_budget: Dict[int, int] = {}
-
-        self._target_pct: Dict[int, Optional[int]] = {}
-        self._inflight_set: Dict[int, bool] = {}
-        self._inflight_since_ms: Dict[int, int] = {}
-        self._suspend_poll_until_ms = 0
-
-        self._have_timeout = helpers.executable_exists("timeout")
-        if not helpers.executable_exists("ddcutil"):
+        self._buses: Dict[int, _BusState] = {}
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._backend = None
+
+        # Internal panel: sysfs backlight, updated from inotify, no polling
+        self._backlight: Optional[Backlight] = None
+        backlight_name = find_backlight()
+        if backlight_name:
+            self._backlight = Backlight(backlight_name, self._on_backlight_changed)
+
+        # I2C adapters come and go with GPU drivers and i2c-dev, and udev
+        # grants access to them late; the backend is re-probed when they do
+        self._reprobe_src: Optional[int] = None
+        self._dev_monitor: Optional[Gio.FileMonitor] = None
+        self._watch_i2c_devices()
+
+        if poll_seconds > 0:
+            GLib.timeout_add_seconds(poll_seconds, self._poll_all)
+
+        i2c_buses = I2cDevBackend.probe()
+        if i2c_buses:
+            self._set_backend(I2cDevBackend(i2c_buses))
+        elif DdcutilBackend.available():
+            self._set_backend(DdcutilBackend())
+        else:
             logger.error("ddcutil not found. Install it and ensure /dev/i2c-* access.")
             return
-        if not self._have_timeout:
-            logger.warning("coreutils 'timeout' not found; using internal queue-unstick timer instead.")
 
         self._detect_displays()
         self._redetect_timer = GLib.timeout_add_seconds(8, self._redetect_if_empty)
 
-        if poll_seconds > 0:
-            GLib.timeout_add_seconds(poll_seconds, self._poll_all)
-        GLib.timeout_add(500, self._watchdog_tick)
+    def _state(self, bus: int) -> _BusState:
+        st = self._buses.get(bus)
+        if st is None:
+            st = self._buses[bus] = _BusState(bus)
+        return st
+
+    def _set_backend(self, backend):
+        if isinstance(self._backend, I2cDevBackend):
+            self._backend.close()
+        self._backend = backend
+        if backend is not None:
+            logger.debug(f"Using {backend.name} DDC backend")
 
     # ---------- Detect / Poll ----------
 
+    def _watch_i2c_devices(self):
+        try:
+            self._dev_monitor = Gio.File.new_for_path("/dev").monitor_directory(Gio.FileMonitorFlags.NONE, None)
+        except GLib.Error as e:
+            logger.debug(f"[.REPROBE] Not watching /dev: {e}")
+            return
+        self._dev_monitor.connect("changed", self._on_dev_changed)
+
+    def _on_dev_changed(self, _monitor, gfile: Gio.File, _other, event: Gio.FileMonitorEvent):
+        if not gfile.get_basename().startswith("i2c-"):
+            return
+        if event not in (
+            Gio.FileMonitorEvent.CREATED,
+            Gio.FileMonitorEvent.DELETED,
+            Gio.FileMonitorEvent.ATTRIBUTE_CHANGED,
+        ):
+            return
+        if self._reprobe_src is None:
+            self._reprobe_src = GLib.timeout_add(REPROBE_DELAY_MS, self._reprobe)
+
+    def _reprobe(self):
+        """Pick the backend again for the buses of the outputs connected now."""
+        self._reprobe_src = None
+        i2c_buses = I2cDevBackend.probe()
+        if i2c_buses:
+            if not isinstance(self._backend, I2cDevBackend) or self._backend.buses != i2c_buses:
+                self._set_backend(I2cDevBackend(i2c_buses))
+            # Buses whose adapter is gone won't answer again
+            kept = [b for b in self._available if b in i2c_buses]
+            if kept != self._available:
+                self._available = kept
+                self.emit("displays_changed")
+        elif self._backend is None or isinstance(self._backend, I2cDevBackend):
+            self._set_backend(DdcutilBackend() if DdcutilBackend.available() else None)
+        if self._backend is not None:
+            logger.debug(f"[.REPROBE] Re-running detect on {self._backend.name}")
+            self._detect_displays()
+        return False
+
     def _detect_displays(self):
-        def _on_detect_done(proc):
-            text = _strip_ansi(_coerce_text_from_proc_result(proc))
-            buses = set(_parse_detect_output(text))
+        def _on_detect_done(found: List[int]):
+            buses = set(found)
             if not buses:
                 logger.debug(f"[.DETECT] DDC buses: None found")
+                if isinstance(self._backend, I2cDevBackend) and DdcutilBackend.available():
+                    # ddcutil knows quirks (and drivers) the direct path doesn't
+                    logger.info("[.DETECT] No monitor answered over /dev/i2c-*, falling back to ddcutil")
+                    self._set_backend(DdcutilBackend())
+                    self._detect_displays()
                 return
             merged = sorted(set(self._available) | buses)
             if merged != self._available:
@@ -112,181 +412,66 @@ class Brightness(Service):
                 self.emit("displays_changed")
                 logger.debug(f"[.DETECT] DDC buses: {self._available}")
             for b in self._available:
-                self._fetch_one(b)
+                self._request_read(b)
+
+        self._backend.detect(_on_detect_done)
 
-        base = "env LC_ALL=C /usr/bin/ddcutil --noverify --brief detect 2>&1"
-        cmd = self._wrap_timeout("detect", base)
-        self._run_cmd(cmd, _on_detect_done, kind=("detect", -1))
+    def _redetect_if_empty(self):
+        # Keep trying until we have at least one bus
+        if not self._available:
+            logger.debug("[.REDETECT] No displays yet, re-running detect")
+            self._detect_displays()
+            return True  # keep timer
+        return False  # stop timer once we have displays
 
     def _poll_all(self):
-        now = _now_ms()
-        if now < getattr(self, "_suspend_poll_until_ms", 0):
-            logger.debug("[.POLL] Suspended to avoid contention")
+        bus = self.primary_bus
+        if bus is None:
             return True
-        if any(v is not None for v in self._target_pct.values()):
+        if self._state(bus).target is not None:
             logger.debug("[.POLL] Skipped; target pending")
             return True
-
-        primaries = [b for b in self._available if b == self.primary_bus]
-        for b in primaries:
-            self._fetch_one(b)
+        self._request_read(bus)
         return True
 
-    # ---------- Watchdog ----------
-
-    def _watchdog_tick(self):
-        now = _now_ms()
-        for bus, inflight in list(self._inflight_set.items()):
-            if not inflight:
-                continue
-            age = now - self._inflight_since_ms.get(bus, now)
-            if age > 2500:
-                logger.warning(f"[.WATCHDOG] Inflight stuck, clearing & backoff (bus={bus} age={age}ms)")
-                self._inflight_set[bus] = False
-                self._inflight_since_ms.pop(bus, None)
-                backoff = max(1400, min(3000, age + 400))
-                self._set_backoff_until_ms[bus] = now + backoff
-                tgt = self._target_pct.get(bus)
-                if tgt is not None:
-                    self._pending_confirm[bus] = (tgt, now + backoff + 1500)
-                GLib.timeout_add(backoff, lambda b=bus: (self._confirm_after_ceiling(b), False)[1])
-
-        if self._busy and self._current_cmd_started_ms:
-            cage = now - self._current_cmd_started_ms
-            if cage > 5000:
-                if self._current_timeout_src is None:
-                    logger.warning("[.WATCHDOG] busy with no ceiling; forcing unstick")
-                    self._force_unstick(("get", -1))
-                else:
-                    logger.warning(f"[.WATCHDOG] Busy for {cage}ms (waiting on current shell). "
-                                   f"{'Timeout wrapper should free it.' if self._have_timeout else 'Internal ceiling will unstick it.'}")
-        return True
-
-    # ---------- Reads ----------
-
-    def _fetch_one(self, bus: int, *, force: bool = False):
-        if not force:
-            # If a writing is inflight, or we’re backing off this bus, don’t contend
-            if self._inflight_set.get(bus, False) or _now_ms() < self._set_backoff_until_ms.get(bus, 0):
-                logger.debug(f"[.GETVCP] skipped; write inflight/backoff (bus={bus})")
-                return
-        def _done(proc):
-            out = _strip_ansi(_coerce_text_from_proc_result(proc))
-            if "flock()" in out or "Flock diagnostics" in out or "Max wait time" in out:
-                logger.warning(f"[.GETVCP] flock: bus={bus}, {out.strip()!r}")
-                return
-
-            cur, mx = _parse_getvcp_output(out)
-            if cur is None or mx is None or mx == 0:
-                if "Timed out" in out or "timeout" in out:
-                    logger.warning(f"[.GETVCP] timeout on bus {bus}: {out.strip()!r}")
-                else:
-                    logger.warning(f"[.GETVCP] Failed to parse getvcp: bus={bus}, {out!r}")
-                return
+    # ---------- Properties ----------
 
-            self._max_cache[bus] = mx
-            pct = int(round((cur / mx) * 100))
-            now = _now_ms()
-            tgt = self._target_pct.get(bus)
+    @Property(int, "readable")
+    def max_screen(self) -> int:
+        return self._backlight.max if self._backlight else -1
 
-            if tgt is not None and pct != tgt:
-                # still schedule a retry / kick below via idle, but don't emit
-                logger.debug(f"[.READ_SUPPRESS] bus={bus} have={pct}% want={tgt}% (suppress UI)")
-                GLib.idle_add(lambda: (self._kick_set_loop(bus), False)[1])
-                return
+    @Property(int, "read-write")
+    def screen_brightness(self) -> int:
+        return self._backlight.current if self._backlight else -1
 
-            # Anti-jitter gate: while a set is being confirmed, ignore stale reads
-            hold = self._pending_confirm.get(bus)
-            if hold is not None:
-                tgt, exp = hold
-                if now < exp and pct != tgt:
-                    return
-                # Clear the confirmation window if it expired, or we matched the target
-                if now >= exp or pct == tgt:
-                    self._pending_confirm.pop(bus, None)
-
-            if tgt is not None and pct == tgt:
-                # We reached the requested value; clear all per-bus state
-                self._target_pct[bus] = None
-                self._set_retry_budget[bus] = 0
-                self._set_backoff_until_ms[bus] = 0
-                # let normal polling resume
-                self._suspend_poll_until_ms = 0
-                logger.debug(f"[.SETTLED] bus={bus} reached {pct}%")
-
-            prev = self._current.get(bus)
-            self._current[bus] = pct
-            if prev != pct:
-                logger.debug(f"[.FETCH] emit external bus={bus}, pct={pct}, raw {cur}/{mx}")
-                self.emit("external", bus, pct)
-
-            if self._target_pct.get(bus) == pct:
-                logger.debug(f"[.SETTLED] bus={bus} reached {pct}%")
-                self._target_pct.pop(bus, None)
-                self._pending_confirm.pop(bus, None)
-
-            if tgt is not None and tgt != pct:
-                logger.debug(f"post-read mismatch bus={bus}: have={pct}% want={tgt}% -> kick set")
-                GLib.idle_add(lambda: (self._kick_set_loop(bus), False)[1])
-
-        base = (
-            "env LC_ALL=C /usr/bin/ddcutil "
-            "--enable-cross-instance-locks --sleep-multiplier=1.0 "
-            f"getvcp 0x10 --bus {bus} --terse --noverify 2>&1"
-        )
-        cmd = self._wrap_timeout("get", base)
-        kind = ("get_force", bus) if force else ("get", bus)
-        self._run_cmd(cmd, _done, kind=kind)
+    @screen_brightness.setter
+    def screen_brightness(self, value: int):
+        if self._backlight:
+            self._backlight.set(value)
 
-    # ---------- Properties ----------
+    def _on_backlight_changed(self, _value: int):
+        self.notify("screen-brightness")
 
     @Property(str, "readable")
     def external_brightness_json(self) -> str:
-        data = [{"display": d, "percent": self._current.get(d, -1)} for d in self._available]
+        data = [
+            {"display": d, "percent": self._buses[d].current if d in self._buses and self._buses[d].current is not None else -1}
+            for d in self._available
+        ]
         return json.dumps(data)
 
     @Property(int, "readable")
     def external_count(self) -> int:
         return len(self._available)
 
-    # ---------- Writes ----------
-
-    def _set_one_raw(self, bus: int, raw: int, mx: Optional[int]):
-        if mx is None or mx <= 0:
-            mx = self._max_cache.get(bus, 100)
-        raw = max(0, min(raw, mx))
-        logger.debug(f"[.SETVCP] enqueue: bus={bus}, raw={raw}/{mx}")
-
-        def _done(proc):
-            out = _strip_ansi(_coerce_text_from_proc_result(proc))
-            try:
-                if "flock()" in out or "Flock diagnostics" in out or "Max wait time" in out:
-                    logger.warning(f"[.SETVCP] flock: bus={bus}, {out.strip()!r}")
-                    return
+    @Property(int, "readable")
+    def set_latency_ms(self) -> int:
+        """Average time from `set_percent` to a confirming read, or -1."""
+        if not self._latencies:
+            return -1
+        return int(sum(self._latencies) / len(self._latencies))
 
-                if "Timed out" in out or "timeout" in out:
-                    logger.warning(f"[.SETVCP] timeout: bus={bus}, {out.strip()!r}")
-                else:
-                    logger.info(f"[.SETVCP] Set bus={bus} brightness to raw={raw}/{mx}")
-
-                tgt = self._target_pct.get(bus)
-                if tgt is not None:
-                    self._pending_confirm[bus] = (tgt, _now_ms() + 1000)
-                    self._set_retry_budget[bus] = 0
-
-                GLib.timeout_add(360, lambda: (self._fetch_one(bus), False)[1])
-            finally:
-                self._inflight_set[bus] = False
-                self._inflight_since_ms.pop(bus, None)
-                GLib.idle_add(lambda: (self._kick_set_loop(bus), False)[1])
-
-        base = (
-            "env LC_ALL=C /usr/bin/ddcutil "
-            "--enable-cross-instance-locks --sleep-multiplier=1.0 "
-            f"setvcp 0x10 {raw} --bus {bus} --noverify 2>&1"
-        )
-        cmd = self._wrap_timeout("set", base)
-        self._run_cmd(cmd, _done, kind=("set", bus))
+    # ---------- Public API ----------
 
     def set_percent(self, bus: int, percent: int):
         if bus not in self._available:
@@ -294,218 +479,150 @@ class Brightness(Service):
             return
 
         p = max(0, min(100, int(percent)))
-        self._target_pct[bus] = p
-        self._pending_confirm[bus] = (p, _now_ms() + CONFIRM_MS)
-
-        prev = self._current.get(bus)
-        self._current[bus] = p
-        if prev != p:
+        st = self._state(bus)
+        # Only the latest target per bus is kept; a slider drag collapses
+        # into whatever write is issued once the bus is free
+        if st.target is None:
+            st.target_since_ms = _now_ms()
+        if st.target != p:
+            st.written = None
+        st.target = p
+        st.retries = 0
+        st.confirm = (p, _now_ms() + CONFIRM_MS)
+
+        if st.current != p:
+            st.current = p
             self.emit("external", bus, p)
-
-        # inflight = self._inflight_set.get(bus, False)
-        # age = _now_ms() - self._inflight_since_ms.get(bus, _now_ms())
-        # logger.debug(f"[.SET_PERCENT] bus={bus}, target={p}%, inflight={inflight}, age={age}ms")
-        #
-        # if inflight and age > 2500:
-        #     logger.warning(f"[.SET_PERCENT] inflight aged out (bus={bus}, age={age}ms) -> clearing & re-kick")
-        #     self._inflight_set[bus] = False
-        #     self._inflight_since_ms.pop(bus, None)
-
-        if bus not in self._max_cache:
-            self._fetch_one(bus)
-        else:
-            self._kick_set_loop(bus)
+        self._pump(bus)
 
     def set_all_percent(self, percent: int, buses: list[int] = None):
         for bus in (buses or self._available):
             self.set_percent(bus, percent)
 
-    def _kick_set_loop(self, bus: int):
-        if self._busy:
-            logger.debug(f"[.KSL] Busy, deferring set (bus={bus})")
-            return
-        # honor backoff
-        if _now_ms() < self._set_backoff_until_ms.get(bus, 0):
-            logger.debug(f"[.KSL] Delaying set (bus={bus})")
-            return
+    # ---------- Engine ----------
 
-        tgt = self._target_pct.get(bus)
-        if tgt is None or self._inflight_set.get(bus, False):
-            return
-        self._pending_confirm[bus] = (tgt, _now_ms() + CONFIRM_MS)
+    def _request_read(self, bus: int):
+        self._state(bus).read_wanted = True
+        self._pump(bus)
 
-        mx = self._max_cache.get(bus)
-        if not mx:
-            logger.debug(f"[.KSL] Skipping set due to no mx, will be kicked after read (bus={bus})")
+    def _pump(self, bus: int):
+        """Start the next operation for `bus` if it is idle."""
+        st = self._state(bus)
+        if st.busy or self._backend is None:
             return
-
-        # if we’ve already retried a couple of times on this target, wait for a confirmation read
-        if self._set_retry_budget.get(bus, 0) > 2:
-            logger.debug(f"[.KSL] Retry budget exceeded, waiting for confirm read (bus={bus})")
-            GLib.timeout_add(120, lambda b=bus: (self._fetch_one(b, force=True), False)[1])
+        now = _now_ms()
+        if now < st.backoff_until_ms:
+            if st.wake_src is None:
+                st.wake_src = GLib.timeout_add(st.backoff_until_ms - now, self._wake, bus)
             return
 
-        raw = int(round((tgt / 100) * mx))
-        self._inflight_set[bus] = True
-        self._inflight_since_ms[bus] = _now_ms()
-        logger.debug(f"[.KSL] bus={bus} tgt={tgt}% -> raw={raw}/{mx}")
-        self._set_one_raw(bus, raw, mx)
+        if st.max is None:
+            # The raw maximum comes with the first read
+            if st.read_wanted or st.target is not None:
+                self._start_read(st)
+        elif st.target is not None and st.written != st.target:
+            self._start_write(st)
+        elif st.read_wanted:
+            self._start_read(st)
+
+    def _wake(self, bus: int):
+        self._state(bus).wake_src = None
+        self._pump(bus)
+        return False
 
-    # ---------- Queue plumbing ----------
+    def _finish(self, st: _BusState):
+        st.busy = False
+        self._pump(st.bus)
+
+    def _start_read(self, st: _BusState):
+        st.busy = True
+        st.read_wanted = False
+        self._backend.get(st.bus, lambda cur, mx: self._on_read(st, cur, mx))
+
+    def _start_write(self, st: _BusState):
+        st.busy = True
+        pct = st.target
+        raw = int(round((pct / 100) * st.max))
+        logger.debug(f"[.SETVCP] bus={st.bus} tgt={pct}% -> raw={raw}/{st.max}")
+        self._backend.set(st.bus, raw, lambda ok: self._on_written(st, pct, raw, ok))
+
+    def _on_written(self, st: _BusState, pct: int, raw: int, ok: bool):
+        if ok:
+            logger.info(f"[.SETVCP] Set bus={st.bus} brightness to raw={raw}/{st.max}")
+            st.written = pct
+            if st.target is not None:
+                st.confirm = (st.target, _now_ms() + CONFIRM_MS)
+            # Confirm once the monitor had time to apply it, unless a newer
+            # target arrives first, in which case that write goes out instead
+            st.read_wanted = True
+            st.backoff_until_ms = _now_ms() + SETTLE_MS
+        else:
+            st.retries += 1
+            st.backoff_until_ms = _now_ms() + min(2200, 700 * st.retries)
+            st.read_wanted = True
+            if st.retries > MAX_SET_RETRIES:
+                logger.warning(f"[.SETVCP] giving up on {pct}% for bus={st.bus} after {st.retries} attempts")
+                st.target = None
+                st.confirm = None
+        self._finish(st)
+
+    def _on_read(self, st: _BusState, cur: Optional[int], mx: Optional[int]):
+        if cur is None or mx is None:
+            st.backoff_until_ms = _now_ms() + 700
+            if st.target is not None:
+                st.retries += 1
+                if st.retries > MAX_SET_RETRIES:
+                    logger.warning(f"[.GETVCP] giving up on {st.target}% for bus={st.bus}; reads keep failing")
+                    st.target = None
+                    st.confirm = None
+                else:
+                    st.read_wanted = True
+            self._finish(st)
+            return
 
-    def _redetect_if_empty(self):
-        # Keep trying until we have at least one bus
-        if not self._available:
-            logger.debug("[.REDETECT] No displays yet, re-running detect")
-            self._detect_displays()
-            return True  # keep timer
-        return False  # stop timer once we have displays
+        st.max = mx
+        pct = int(round((cur / mx) * 100))
+        now = _now_ms()
 
-    def _wrap_timeout(self, kind: str, base_cmd: str) -> str:
-        """Prefix with coreutils timeout when available, otherwise leave as-is."""
-        if self._have_timeout:
-            t = f"{CEIL_MS[kind]//1000}.{(CEIL_MS[kind]%1000)//100}s" if isinstance(CEIL_MS[kind], int) else "2s"
-            # use -k 1s to SIGKILL if SIGTERM ignored
-            return f"/usr/bin/timeout -k 1s {t} {base_cmd}"
-        return base_cmd
-
-    def _run_cmd(self, cmd: str, cb: Callable, kind: Tuple[str, int]):
-        k, bus = kind
-        kept = []
-        dropped = 0
-        write_inflight = any(self._inflight_set.values())
-
-        for s, _cb, kd in self._queue:
-            kk, bb = kd
-            if k == "get_force" or kk == "get_force":
-                kept.append((s, _cb, kd))
-                continue
-
-            # drop only stale same-kind same-bus
-            if kk == k and bb == bus:
-                dropped += 1
-                continue
-            # if adding SET for this bus, drop queued GETs for this bus
-            if k == "set" and kk == "get" and bb == bus:
-                dropped += 1
-                continue
-            # while any write inflight, drop queued GETs (reduce contention)
-            if write_inflight and kk == "get":
-                dropped += 1
-                continue
-            kept.append((s, _cb, kd))
-
-        if dropped:
-            logger.debug(f"[.QUEUE] dropped {dropped} stale/redundant before {k} bus={bus}")
-        self._queue = kept
-        self._queue.append((cmd, cb, kind))
-        if not self._busy:
-            self._dequeue()
-
-    def _dequeue(self):
-        if not self._queue:
-            self._busy = False
-            self._current_cmd_started_ms = None
-            if self._current_timeout_src is not None:
-                GLib.source_remove(self._current_timeout_src)
-                self._current_timeout_src = None
-            return
+        if st.target is not None:
+            if pct == st.target:
+                latency = now - st.target_since_ms
+                self._latencies.append(latency)
+                logger.debug(f"[.SETTLED] bus={st.bus} reached {pct}% in {latency}ms (avg {self.set_latency_ms}ms)")
+                st.target = None
+                st.retries = 0
+                st.confirm = None
+            elif st.written == st.target:
+                # Written but not applied (or a stale read); rewrite a few times
+                st.retries += 1
+                if st.retries > MAX_SET_RETRIES:
+                    logger.warning(f"[.SETVCP] bus={st.bus} stays at {pct}% instead of {st.target}%")
+                    st.target = None
+                    st.confirm = None
+                else:
+                    logger.debug(f"[.READ_SUPPRESS] bus={st.bus} have={pct}% want={st.target}% -> rewrite")
+                    st.written = None
+                    self._finish(st)
+                    return
+            else:
+                # A newer target is queued behind this read; don't flicker the UI
+                self._finish(st)
+                return
 
-        self._busy = True
-        cmd, cb, kind = self._queue.pop(0)
-        k, bus = kind
-        self._current_cmd_started_ms = _now_ms()
-
-        # --- INTERNAL PARACHUTE: shell timeout + 800ms ---
-        ceiling = CEIL_MS.get(k, 2000)
-        if self._current_timeout_src is not None:
-            GLib.source_remove(self._current_timeout_src)
-            self._current_timeout_src = None
-        self._current_timeout_src = GLib.timeout_add(ceiling + 800, lambda: self._force_unstick(kind))
-        # --------------------------------------------------
-
-        #logger.debug(f"[.EXEC] {cmd}")
-
-        def _wrapped(proc):
-            if self._current_timeout_src is not None:
-                GLib.source_remove(self._current_timeout_src)
-                self._current_timeout_src = None
-            GLib.timeout_add(40, lambda: (self._continue(cb, proc), False)[1])
-
-        exec_shell_command_async(["/bin/sh", "-lc", cmd], _wrapped)
-
-    def _force_unstick(self, kind: Tuple[str, int]):
-        k, bus = kind
-        logger.error(f"[.EXEC] Ceiling hit for {k} bus={bus}; advancing queue")
-
-        if k == "set":
-            self._inflight_set[bus] = False
-            self._inflight_since_ms.pop(bus, None)
-            # backoff 1200–3000ms depending on how long we waited
-            waited = (_now_ms() - (self._current_cmd_started_ms or _now_ms()))
-            backoff = max(900, min(2200, waited + 500))
-            self._set_backoff_until_ms[bus] = _now_ms() + backoff
-            # keep a small retry budget so we don't loop forever
-            self._set_retry_budget[bus] = max(1, min(2, self._set_retry_budget.get(bus, 0) + 1))
-            # schedule a single confirm read after backoff; re-try only if needed
-            tgt = self._target_pct.get(bus)
-            if tgt is not None:
-                # extend confirm across the backoff we’re about to schedule
-                self._pending_confirm[bus] = (tgt, _now_ms() + backoff + 1500)
-            GLib.timeout_add(max(500, backoff // 2), lambda b=bus: (self._confirm_after_ceiling(b), False)[1])
-
-        # clear internal ceiling and advance queue (unchanged)
-        if self._current_timeout_src is not None:
-            GLib.source_remove(self._current_timeout_src)
-            self._current_timeout_src = None
-        self._busy = False
-        self._current_cmd_started_ms = None
-        self._dequeue()
-        return False
+        # Anti-jitter gate: shortly after a write, ignore stale reads
+        if st.confirm is not None:
+            tgt, until = st.confirm
+            if now < until and pct != tgt:
+                self._finish(st)
+                return
+            st.confirm = None
 
-    def _confirm_after_ceiling(self, bus: int):
-        # Don’t spam if another write started in the meantime
-        if self._inflight_set.get(bus):
-            return False
-        # Single targeted read; _done() already handles mismatch and kicks set-loop
-        self._fetch_one(bus, force=True)
-        return False
+        if st.current != pct:
+            st.current = pct
+            logger.debug(f"[.FETCH] emit external bus={st.bus}, pct={pct}, raw {cur}/{mx}")
+            self.emit("external", st.bus, pct)
+        self._finish(st)
 
-    def _continue(self, cb: Callable, proc):
-        try:
-            cb(proc)
-        finally:
-            self._busy = False
-            self._current_cmd_started_ms = None
-            self._dequeue()
-
-# ------------------------------
-
-def _coerce_text_from_proc_result(self) -> str:
-    if isinstance(self, str):
-        return self
-    if isinstance(self, (bytes, bytearray)):
-        return self.decode(errors="ignore")
-    if isinstance(self, tuple) and len(self) == 3:
-        _, out, err = self
-        out = out.decode(errors="ignore") if isinstance(out, (bytes, bytearray)) else (out or "")
-        err = err.decode(errors="ignore") if isinstance(err, (bytes, bytearray)) else (err or "")
-        return f"{out}\n{err}"
-    out = ""
-    err = ""
-    try:
-        if hasattr(self, "get_stdout"):
-            tmp = self.get_stdout()
-            out = tmp.decode(errors="ignore") if isinstance(tmp, (bytes, bytearray)) else (tmp or "")
-        if hasattr(self, "get_stderr"):
-            tmp = self.get_stderr()
-            err = tmp.decode(errors="ignore") if isinstance(tmp, (bytes, bytearray)) else (tmp or "")
-    except Exception:
-        pass
-    return f"{out}\n{err}"
-
-def _strip_ansi(self: str) -> str:
-    return ANSI_RE.sub("", self)
 
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    return int(time.monotonic() * 1000)
@@ -0,0 +1,236 @@
+import os
+import stat
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from gi.repository import Gio, GLib
+
+from config.data import APP_NAME
+from config.loguru_config import logger
+
+logger = logger.bind(name="Commands", type="Service")
+
+# Without a runtime dir the socket goes in a directory of ours in /tmp,
+# which anyone else could connect to otherwise
+FALLBACK_DIR = f"/tmp/{APP_NAME}-{os.getuid()}"
+# Kept in sync with scripts/ax_send.py, which must not import the shell
+SOCKET_PATH = os.environ.get("AX_SHELL_SOCKET") or os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or FALLBACK_DIR, f"{APP_NAME}.sock"
+)
+# Longest accepted command line, anything longer is dropped with the connection
+MAX_LINE_BYTES = 1024
+
+# handler(argument) -> optional reply text
+CommandHandler = Callable[[str], Optional[str]]
+
+
+@dataclass
+class CommandStats:
+    """Dispatch latency of one verb, from the line being read to the handler returning."""
+
+    count: int = 0
+    last_ms: float = 0.0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, elapsed_ms: float):
+        self.count += 1
+        self.last_ms = elapsed_ms
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+
+@dataclass
+class _Command:
+    handler: CommandHandler
+    usage: str
+    stats: CommandStats
+
+
+class CommandServer:
+    """
+    Line-based command socket for keybinds and scripts.
+
+    Each line is `<verb> [argument]` and is answered with `ok [text]` or
+    `error: <reason>`, so any client that can write to a Unix socket works:
+
+        echo "open launcher" | socat - UNIX-CONNECT:$XDG_RUNTIME_DIR/ax-shell.sock
+
+    Verbs come from a fixed table filled at startup with `register`; nothing
+    sent over the socket is evaluated. Connections are served on the main
+    loop with Gio's async streams, so a command runs as soon as it arrives,
+    without a client process talking D-Bus or a Python eval. `stats` reports
+    per-verb dispatch latency.
+    """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        if CommandServer.instance is None:
+            CommandServer.instance = CommandServer()
+        return CommandServer.instance
+
+    def __init__(self, path: str = SOCKET_PATH):
+        self.path = path
+        self._commands: Dict[str, _Command] = {}
+        self._service: Optional[Gio.SocketService] = None
+        # Open connections, referenced until their client hangs up
+        self._connections = set()
+
+        self.register("ping", lambda _: "pong", "ping: check that the shell is listening")
+        self.register("help", self._help, "help: list commands")
+        self.register("stats", self._stats, "stats: dispatch latency per command")
+
+    # ---------- Public API ----------
+
+    def register(self, verb: str, handler: CommandHandler, usage: str = ""):
+        """Add `verb` to the command table; `handler` gets the rest of the line."""
+        self._commands[verb] = _Command(handler, usage or verb, CommandStats())
+
+    def stats(self) -> Dict[str, CommandStats]:
+        return {verb: command.stats for verb, command in self._commands.items()}
+
+    def start(self) -> bool:
+        if self._service is not None:
+            return True
+        if not self._prepare_dir() or not self._claim_path():
+            return False
+        service = Gio.SocketService.new()
+        try:
+            service.add_address(
+                Gio.UnixSocketAddress.new(self.path),
+                Gio.SocketType.STREAM,
+                Gio.SocketProtocol.DEFAULT,
+                None,
+            )
+        except GLib.Error as e:
+            logger.error(f"Unable to listen on {self.path}: {e.message}")
+            return False
+        # Commands drive the whole session, only we may connect
+        os.chmod(self.path, 0o600)
+        service.connect("incoming", self._on_incoming)
+        service.start()
+        self._service = service
+        logger.info(f"Listening for commands on {self.path}")
+        return True
+
+    def stop(self):
+        if self._service is None:
+            return
+        self._service.stop()
+        self._service.close()
+        self._service = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    # ---------- Socket ----------
+
+    def _prepare_dir(self) -> bool:
+        """Create FALLBACK_DIR for the socket; refuse one someone else could enter."""
+        directory = os.path.dirname(self.path)
+        if directory != FALLBACK_DIR:
+            return True
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            st = os.lstat(directory)
+        except OSError as e:
+            logger.error(f"Unable to create {directory}: {e}")
+            return False
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+            logger.error(f"Not listening in {directory}, it isn't a private directory of ours")
+            return False
+        return True
+
+    def _claim_path(self) -> bool:
+        """Remove a socket left behind by a previous run, unless someone still listens on it."""
+        if not os.path.exists(self.path):
+            return True
+        client = Gio.SocketClient.new()
+        try:
+            client.connect(Gio.UnixSocketAddress.new(self.path), None).close()
+        except GLib.Error:
+            os.remove(self.path)
+            return True
+        logger.warning(f"Another instance is already listening on {self.path}")
+        return False
+
+    def _on_incoming(self, _service, connection: Gio.SocketConnection, _source):
+        stream = Gio.DataInputStream.new(connection.get_input_stream())
+        self._connections.add(connection)
+        self._read_next(connection, stream)
+        return True
+
+    def _read_next(self, connection: Gio.SocketConnection, stream: Gio.DataInputStream):
+        stream.read_line_async(GLib.PRIORITY_DEFAULT, None, self._on_line, connection)
+
+    def _on_line(self, stream: Gio.DataInputStream, result: Gio.AsyncResult, connection: Gio.SocketConnection):
+        started = time.perf_counter()
+        try:
+            line, length = stream.read_line_finish_utf8(result)
+        except GLib.Error as e:
+            logger.debug(f"Command connection failed: {e.message}")
+            line, length = None, 0
+        if line is None or length > MAX_LINE_BYTES:
+            self._close(connection)
+            return
+
+        line = line.strip()
+        if line:
+            reply = f"{self._dispatch(line, started)}\n".encode()
+            # The next line is read once the client has taken the reply, a
+            # client that doesn't read can't stall the main loop
+            connection.get_output_stream().write_all_async(
+                reply, GLib.PRIORITY_DEFAULT, None, self._on_replied, (connection, stream, reply)
+            )
+            return
+        self._read_next(connection, stream)
+
+    def _on_replied(self, output: Gio.OutputStream, result: Gio.AsyncResult, user_data):
+        # The reply buffer rides along so it lives until the write is done
+        connection, stream, _reply = user_data
+        try:
+            output.write_all_finish(result)
+        except GLib.Error as e:
+            logger.debug(f"Command reply failed: {e.message}")
+            self._close(connection)
+            return
+        self._read_next(connection, stream)
+
+    def _close(self, connection: Gio.SocketConnection):
+        self._connections.discard(connection)
+        try:
+            connection.close(None)
+        except GLib.Error:
+            pass
+
+    # ---------- Commands ----------
+
+    def _dispatch(self, line: str, started: float) -> str:
+        verb, _, argument = line.partition(" ")
+        command = self._commands.get(verb)
+        if command is None:
+            return f"error: unknown command '{verb}', try 'help'"
+        try:
+            text = command.handler(argument.strip())
+        except Exception as e:
+            logger.error(f"Command '{line}' failed: {e}")
+            return f"error: {e}"
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            command.stats.add(elapsed_ms)
+            logger.debug(f"Command '{line}' took {elapsed_ms:.2f} ms")
+        return f"ok {text}" if text else "ok"
+
+    def _help(self, _argument: str) -> str:
+        return "; ".join(command.usage for command in self._commands.values())
+
+    def _stats(self, _argument: str) -> str:
+        return "; ".join(
+            f"{verb}: {s.count}x avg {s.total_ms / s.count:.2f} ms max {s.max_ms:.2f} ms last {s.last_ms:.2f} ms"
+            for verb, s in self.stats().items()
+            if s.count
+        )
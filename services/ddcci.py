@@ -0,0 +1,187 @@
+"""
+Minimal DDC/CI client for VCP get/set over a Linux I2C character device.
+
+Only what the brightness service needs: reading and writing one
+continuous VCP feature (0x10 by default) on a monitor at I2C address 0x37.
+The transport is a tiny read/write interface so the protocol can be driven
+by an emulated device instead of /dev/i2c-*.
+"""
+
+import fcntl
+import os
+import time
+from typing import List, Optional, Protocol, Tuple
+
+from config.loguru_config import logger
+
+logger = logger.bind(name="DDC/CI", type="Service")
+
+DDCCI_ADDR = 0x37
+I2C_SLAVE = 0x0703
+
+# Addresses as they appear on the wire (7-bit address << 1)
+HOST_ADDR = 0x51
+DISPLAY_ADDR_W = 0x6E
+HOST_ADDR_R = 0x50
+
+OP_GET_VCP = 0x01
+OP_GET_VCP_REPLY = 0x02
+OP_SET_VCP = 0x03
+
+# Delays required by the DDC/CI spec, in seconds
+GET_REPLY_DELAY_S = 0.04
+SET_DELAY_S = 0.05
+RETRY_DELAY_S = 0.05
+MAX_ATTEMPTS = 3
+
+GET_REPLY_LEN = 11
+
+
+class DdcError(Exception):
+    pass
+
+
+class Transport(Protocol):
+    def write(self, data: bytes) -> None: ...
+
+    def read(self, length: int) -> bytes: ...
+
+
+def _checksum(first: int, payload: bytes) -> int:
+    value = first
+    for b in payload:
+        value ^= b
+    return value
+
+
+def build_get_request(vcp: int) -> bytes:
+    payload = bytes([HOST_ADDR, 0x80 | 2, OP_GET_VCP, vcp])
+    return payload + bytes([_checksum(DISPLAY_ADDR_W, payload)])
+
+
+def build_set_request(vcp: int, value: int) -> bytes:
+    value = max(0, min(0xFFFF, int(value)))
+    payload = bytes([HOST_ADDR, 0x80 | 4, OP_SET_VCP, vcp, value >> 8, value & 0xFF])
+    return payload + bytes([_checksum(DISPLAY_ADDR_W, payload)])
+
+
+def parse_get_reply(reply: bytes, vcp: int) -> Tuple[int, int]:
+    """Return (current, maximum) from a Get VCP Feature reply."""
+    if len(reply) < GET_REPLY_LEN:
+        raise DdcError(f"short reply ({len(reply)} bytes)")
+    reply = reply[:GET_REPLY_LEN]
+    if reply[1] == 0x80:
+        raise DdcError("display busy (null message)")
+    if reply[0] != DISPLAY_ADDR_W or reply[1] != (0x80 | 8):
+        raise DdcError(f"unexpected header {reply[0]:#04x} {reply[1]:#04x}")
+    if _checksum(HOST_ADDR_R, reply[:-1]) != reply[-1]:
+        raise DdcError("bad checksum")
+    if reply[2] != OP_GET_VCP_REPLY or reply[4] != vcp:
+        raise DdcError(f"reply for opcode {reply[2]:#04x} feature {reply[4]:#04x}")
+    if reply[3] != 0:
+        raise DdcError(f"feature {vcp:#04x} unsupported (result {reply[3]})")
+    maximum = (reply[6] << 8) | reply[7]
+    current = (reply[8] << 8) | reply[9]
+    return current, maximum
+
+
+class I2cDevTransport:
+    """Raw reads/writes to the DDC/CI address on /dev/i2c-<bus>."""
+
+    def __init__(self, bus: int):
+        self.bus = bus
+        self._fd = os.open(f"/dev/i2c-{bus}", os.O_RDWR)
+        try:
+            fcntl.ioctl(self._fd, I2C_SLAVE, DDCCI_ADDR)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def write(self, data: bytes) -> None:
+        os.write(self._fd, data)
+
+    def read(self, length: int) -> bytes:
+        return os.read(self._fd, length)
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class DdcCiDevice:
+    """VCP get/set on one display, with the spec's timing and retries."""
+
+    def __init__(self, transport: Transport, sleep=time.sleep):
+        self.transport = transport
+        self._sleep = sleep
+        self._ready_at = 0.0
+
+    def _wait_ready(self):
+        delay = self._ready_at - time.monotonic()
+        if delay > 0:
+            self._sleep(delay)
+
+    def get_vcp(self, vcp: int) -> Tuple[int, int]:
+        last_error: Optional[Exception] = None
+        for attempt in range(MAX_ATTEMPTS):
+            if attempt:
+                self._sleep(RETRY_DELAY_S)
+            self._wait_ready()
+            try:
+                self.transport.write(build_get_request(vcp))
+                self._sleep(GET_REPLY_DELAY_S)
+                result = parse_get_reply(self.transport.read(GET_REPLY_LEN), vcp)
+                self._ready_at = time.monotonic() + SET_DELAY_S
+                return result
+            except (OSError, DdcError) as e:
+                last_error = e
+        raise DdcError(f"get {vcp:#04x} failed: {last_error}")
+
+    def set_vcp(self, vcp: int, value: int) -> None:
+        self._wait_ready()
+        try:
+            self.transport.write(build_set_request(vcp, value))
+        except OSError as e:
+            raise DdcError(f"set {vcp:#04x} failed: {e}")
+        # The display ignores commands sent before it has processed this one
+        self._ready_at = time.monotonic() + SET_DELAY_S
+
+
+def connected_ddc_buses() -> List[int]:
+    """I2C buses of connected DRM outputs, as exposed by the kernel's `ddc` links."""
+    buses: List[int] = []
+    drm = "/sys/class/drm"
+    try:
+        connectors = sorted(os.listdir(drm))
+    except OSError:
+        return buses
+    for connector in connectors:
+        base = os.path.join(drm, connector)
+        # Internal panels are driven by the backlight class, not DDC/CI
+        if "eDP" in connector or "LVDS" in connector or "DSI" in connector:
+            continue
+        try:
+            with open(os.path.join(base, "status")) as f:
+                if f.read().strip() != "connected":
+                    continue
+        except OSError:
+            continue
+        ddc = os.path.join(base, "ddc")
+        if not os.path.exists(ddc):
+            # Some drivers only list the adapter as a child directory
+            children = [c for c in os.listdir(base) if c.startswith("i2c-")]
+            if not children:
+                continue
+            name = children[0]
+        else:
+            name = os.path.basename(os.path.realpath(ddc))
+        if name.startswith("i2c-") and name[4:].isdigit():
+            bus = int(name[4:])
+            if bus not in buses:
+                buses.append(bus)
+    return buses
+
+
+def has_i2c_access(buses: List[int]) -> bool:
+    return bool(buses) and all(os.access(f"/dev/i2c-{b}", os.R_OK | os.W_OK) for b in buses)
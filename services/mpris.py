@@ -20,6 +20,9 @@ try:
 except ValueError:
     raise PlayerctlImportError
 
+# The interpolated position is re-read from the player at least this often (µs)
+POSITION_RESYNC_US = 10 * 1000000
+
 
 class MprisPlayer(Service):
     """A service to manage a mpris player."""
@@ -41,6 +44,16 @@ class MprisPlayer(Service):
         self._player = player
         super().__init__(**kwargs)
 
+        # Position is tracked locally from the last known value, so readers
+        # (e.g. a progress bar on the frame clock) don't make a D-Bus call
+        # each time. Playerctl doesn't expose the MPRIS Rate, so normal
+        # speed is assumed; the periodic re-sync corrects any drift.
+        self.rate = 1.0
+        self._position_us = 0
+        self._position_time_us = 0
+        self._playing = False
+        self._sync_position()
+
         self._signal_map = {
             "playback-status": "playback_status",
             "loop-status": "loop_status",
@@ -50,7 +63,7 @@ class MprisPlayer(Service):
         }
 
         self._signal_connectors["playback-status"] = self._player.connect(
-            "playback-status", lambda *a: self._emit_changed_async()
+            "playback-status", self._on_playback_status
         )
         self._signal_connectors["loop-status"] = self._player.connect(
             "loop-status", lambda *a: self._emit_changed_async()
@@ -59,12 +72,36 @@ class MprisPlayer(Service):
             "shuffle", lambda *a: self._emit_changed_async()
         )
         self._signal_connectors["seeked"] = self._player.connect(
-            "seeked", lambda *a: self._emit_changed_async()
+            "seeked", self._on_seeked
         )
         self._signal_connectors["metadata"] = self._player.connect(
-            "metadata", lambda *a: self._emit_changed_async()
+            "metadata", self._on_metadata
         )
 
+    def _sync_position(self, position: int | None = None):
+        """Re-anchor the local position clock, reading the player unless `position` is given."""
+        if position is None:
+            try:
+                position = int(self._player.get_property("position"))
+            except Exception:
+                position = self._position_us
+        self._position_us = max(0, position)
+        self._position_time_us = GLib.get_monotonic_time()
+        self._playing = self._player.get_property("playback_status") == Playerctl.PlaybackStatus.PLAYING
+
+    def _on_playback_status(self, player, status):
+        self._sync_position()
+        self._emit_changed_async()
+
+    def _on_seeked(self, player, position: int):
+        self._sync_position(position)
+        self._emit_changed_async()
+
+    def _on_metadata(self, player, metadata):
+        # A new track usually starts over, re-read rather than guess
+        self._sync_position()
+        self._emit_changed_async()
+
     def on_player_exit(self, player):
         for id in list(self._signal_connectors.values()):
             with contextlib.suppress(Exception):
@@ -97,11 +134,20 @@ class MprisPlayer(Service):
 
     @Property(int, "read-write")
     def position(self) -> int:
-        return self._player.get_property("position")
+        """Interpolated playback position in µs; only hits D-Bus on a periodic re-sync."""
+        now = GLib.get_monotonic_time()
+        if now - self._position_time_us >= POSITION_RESYNC_US:
+            self._sync_position()
+            return self._position_us
+        if not self._playing:
+            return self._position_us
+        return self._position_us + int((now - self._position_time_us) * self.rate)
 
     @position.setter
     def position(self, new_pos: int):
         self._player.set_position(new_pos)
+        # Seeked confirms it, but don't snap back until it arrives
+        self._sync_position(new_pos)
         self._emit_changed_async()
 
     @Property(dict, "readable")
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from gi.repository import GdkPixbuf, GLib
+
+from config.loguru_config import logger
+
+logger = logger.bind(name="Notification Images", type="Service")
+
+# Bytes of PNG data kept on disk before least-recently-used images are evicted
+DEFAULT_BUDGET_BYTES = 8 * 1024 * 1024
+# Decoded pixbufs kept in memory, shared by popups and history
+DEFAULT_MEMORY_ITEMS = 64
+INDEX_SAVE_DELAY_S = 5
+IMAGE_PREFIX = "img_"
+
+
+class NotificationImageCache:
+    """
+    Content-addressed store for notification images.
+
+    Images are scaled once, keyed by a hash of their pixel data and written a
+    single time no matter how many notifications carry them. History entries
+    hold references through `acquire`/`release`; unreferenced images stay
+    around for reuse until the byte budget forces LRU eviction. Referenced
+    images are never evicted, the cache goes over budget instead. Decoded
+    pixbufs are served from a small in-memory LRU.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        memory_items: int = DEFAULT_MEMORY_ITEMS,
+    ):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.memory_items = memory_items
+        self._index_path = os.path.join(directory, "index.json")
+        # key -> {"size": bytes on disk, "atime": last use}
+        self._entries: Dict[str, dict] = {}
+        self._refs: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._pixbufs: "OrderedDict[tuple, GdkPixbuf.Pixbuf]" = OrderedDict()
+        self._loaded = False
+        self._save_src: Optional[int] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notif-image-cache")
+
+    # ---------- Paths ----------
+
+    def path_for_key(self, key: str) -> str:
+        return os.path.join(self.directory, f"{IMAGE_PREFIX}{key}.png")
+
+    def key_for_path(self, path: Optional[str]) -> Optional[str]:
+        """The cache key of `path`, or None if it is not one of our files."""
+        if not path or os.path.dirname(path) != self.directory:
+            return None
+        name = os.path.basename(path)
+        if not (name.startswith(IMAGE_PREFIX) and name.endswith(".png")):
+            return None
+        return name[len(IMAGE_PREFIX):-len(".png")]
+
+    # ---------- Index ----------
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(self._index_path, "r") as f:
+                self._entries = json.load(f).get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            # Only without a usable index do we look at the directory itself
+            self._entries = self._rebuild_index()
+        self._total_bytes = sum(e.get("size", 0) for e in self._entries.values())
+
+    def _rebuild_index(self) -> Dict[str, dict]:
+        entries = {}
+        now = time.time()
+        for name in os.listdir(self.directory):
+            key = self.key_for_path(os.path.join(self.directory, name))
+            if key is None:
+                continue
+            try:
+                entries[key] = {"size": os.path.getsize(self.path_for_key(key)), "atime": now}
+            except OSError:
+                pass
+        logger.info(f"Rebuilt notification image index with {len(entries)} entries")
+        return entries
+
+    def _schedule_save(self):
+        if self._save_src is None:
+            self._save_src = GLib.timeout_add_seconds(INDEX_SAVE_DELAY_S, self._save_index)
+
+    def _save_index(self):
+        self._save_src = None
+        tmp_path = f"{self._index_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"entries": self._entries}, f)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            logger.error(f"Error saving notification image index: {e}")
+        return False
+
+    # ---------- Public API ----------
+
+    def put(self, pixbuf: GdkPixbuf.Pixbuf, size: int = 48) -> Optional[str]:
+        """
+        Store `pixbuf` scaled to `size`x`size` and return its path, taking one
+        reference. Identical images share one file and one decoded pixbuf.
+        """
+        self._ensure_loaded()
+        try:
+            scaled = pixbuf.scale_simple(size, size, GdkPixbuf.InterpType.BILINEAR)
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{scaled.get_width()}x{scaled.get_height()}:{scaled.get_rowstride()}:{scaled.get_has_alpha()}".encode())
+            digest.update(scaled.read_pixel_bytes().get_data())
+        except Exception as e:
+            logger.error(f"Error hashing notification image: {e}")
+            return None
+
+        key = digest.hexdigest()
+        path = self.path_for_key(key)
+        self._remember_pixbuf((key, size, size), scaled)
+        self._refs[key] = self._refs.get(key, 0) + 1
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry["atime"] = time.time()
+            self._schedule_save()
+            logger.debug(f"Reusing cached notification image {key}")
+        else:
+            # Reserve the slot now so a burst of the same image writes once
+            self._entries[key] = {"size": 0, "atime": time.time()}
+            self._executor.submit(self._write, key, scaled, path)
+        return path
+
+    def acquire(self, path: Optional[str]):
+        key = self.key_for_path(path)
+        if key is None:
+            return
+        self._ensure_loaded()
+        self._refs[key] = self._refs.get(key, 0) + 1
+
+    def release(self, path: Optional[str]):
+        """Drop one reference to `path`; legacy per-notification files are deleted."""
+        key = self.key_for_path(path)
+        if key is None:
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                    logger.info(f"Deleted cached image: {path}")
+                except Exception as e:
+                    logger.error(f"Error deleting cached image {path}: {e}")
+            return
+        count = self._refs.get(key, 0) - 1
+        if count > 0:
+            self._refs[key] = count
+        else:
+            self._refs.pop(key, None)
+            # It may be what kept the cache over budget
+            self._evict_over_budget()
+
+    def load_pixbuf(self, path: Optional[str], width: int, height: int) -> Optional[GdkPixbuf.Pixbuf]:
+        """Return `path` at `width`x`height`, decoding it at most once while it stays hot."""
+        if not path:
+            return None
+        self._ensure_loaded()
+        key = self.key_for_path(path) or path
+        mem_key = (key, width, height)
+        pixbuf = self._pixbufs.get(mem_key)
+        if pixbuf is not None:
+            self._pixbufs.move_to_end(mem_key)
+            return pixbuf
+
+        # Rescaling a decoded copy is cheaper than decoding the file again
+        source = next((p for (k, _, _), p in reversed(self._pixbufs.items()) if k == key), None)
+        if source is None:
+            if not os.path.exists(path):
+                return None
+            source = GdkPixbuf.Pixbuf.new_from_file(path)
+        if source.get_width() != width or source.get_height() != height:
+            pixbuf = source.scale_simple(width, height, GdkPixbuf.InterpType.BILINEAR)
+        else:
+            pixbuf = source
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry["atime"] = time.time()
+            self._schedule_save()
+        self._remember_pixbuf(mem_key, pixbuf)
+        return pixbuf
+
+    # ---------- Internals ----------
+
+    def _remember_pixbuf(self, mem_key: tuple, pixbuf: GdkPixbuf.Pixbuf):
+        self._pixbufs[mem_key] = pixbuf
+        self._pixbufs.move_to_end(mem_key)
+        while len(self._pixbufs) > self.memory_items:
+            self._pixbufs.popitem(last=False)
+
+    def _write(self, key: str, pixbuf: GdkPixbuf.Pixbuf, path: str):
+        try:
+            pixbuf.savev(path, "png", [], [])
+            size = os.path.getsize(path)
+        except Exception as e:
+            logger.error(f"Error caching notification image {key}: {e}")
+            GLib.idle_add(self._on_write_failed, key)
+            return
+        GLib.idle_add(self._on_written, key, size)
+
+    def _on_written(self, key: str, size: int):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._total_bytes += size - entry.get("size", 0)
+            entry["size"] = size
+            logger.debug(f"Cached notification image {key} ({size} bytes)")
+            self._evict_over_budget()
+            self._schedule_save()
+        return False
+
+    def _on_write_failed(self, key: str):
+        self._entries.pop(key, None)
+        return False
+
+    def _evict_over_budget(self):
+        if self._total_bytes <= self.budget_bytes:
+            return
+        # Images still shown or in history are never deleted from under
+        # them. Entries still being written have no size yet and are left alone
+        candidates = sorted(
+            (k for k, e in self._entries.items() if e.get("size", 0) > 0 and k not in self._refs),
+            key=lambda k: self._entries[k].get("atime", 0),
+        )
+        for key in candidates:
+            if self._total_bytes <= self.budget_bytes:
+                break
+            self._evict(key)
+        if self._total_bytes > self.budget_bytes:
+            logger.debug(
+                f"Notification images in use take {self._total_bytes} bytes, over the {self.budget_bytes} byte budget"
+            )
+
+    def _evict(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.get("size", 0)
+        for mem_key in [k for k in self._pixbufs if k[0] == key]:
+            del self._pixbufs[mem_key]
+        try:
+            os.remove(self.path_for_key(key))
+            logger.debug(f"Evicted notification image {key}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error evicting notification image {key}: {e}")
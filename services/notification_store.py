@@ -0,0 +1,259 @@
+import json
+import os
+from typing import Callable, Dict, List, Optional
+
+from gi.repository import GLib
+
+from config.loguru_config import logger
+
+logger = logger.bind(name="Notification Store", type="Service")
+
+# Rewrite the log once dead records outnumber live ones by this factor...
+COMPACT_GARBAGE_RATIO = 1.0
+# ...and only when there are at least this many dead records
+COMPACT_MIN_GARBAGE = 64
+# Compaction is deferred so a burst of writes only compacts once
+COMPACT_DELAY_S = 30
+
+
+class NotificationStore:
+    """
+    Append-only JSONL log of notification history entries.
+
+    Each line is one operation: `{"op": "add", "note": {...}}`,
+    `{"op": "del", "id": ...}` or `{"op": "clear"}`. Adding or deleting a
+    notification appends a single line instead of rewriting the whole
+    history; replaying the log on load rebuilds an id-indexed map. The log is
+    periodically compacted down to one `add` line per live entry.
+    """
+
+    def __init__(self, path: str, limit: int = 50, legacy_path: Optional[str] = None):
+        self.path = path
+        self.limit = max(1, int(limit))
+        self.legacy_path = legacy_path
+        # id -> note, oldest first (insertion order)
+        self._entries: Dict[str, dict] = {}
+        self._log_lines = 0
+        self._compact_src: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, note_id) -> bool:
+        return str(note_id) in self._entries
+
+    def get(self, note_id) -> Optional[dict]:
+        return self._entries.get(str(note_id))
+
+    def notes(self) -> List[dict]:
+        """All live entries, oldest first."""
+        return list(self._entries.values())
+
+    def ids(self):
+        return self._entries.keys()
+
+    # ---------- Load ----------
+
+    def load(self) -> List[dict]:
+        """
+        Replay the log (migrating a legacy JSON array if one exists) and
+        return the entries dropped by the retention limit.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._entries = {}
+        self._log_lines = 0
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        self._log_lines += 1
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            # A torn final line from a crash mid-append
+                            logger.warning("Skipping corrupt notification history record")
+                            continue
+                        self._apply(record)
+            except OSError as e:
+                logger.error(f"Error reading notification history log: {e}")
+
+        if self.legacy_path and os.path.exists(self.legacy_path):
+            self._migrate_legacy()
+
+        evicted = self._enforce_limit(write=False)
+        if evicted or self._garbage() > 0:
+            self.compact()
+        return evicted
+
+    def _migrate_legacy(self):
+        try:
+            with open(self.legacy_path, "r") as f:
+                legacy = json.load(f)
+            # The legacy file is newest first
+            for note in reversed(legacy):
+                if note.get("id") is not None:
+                    self._entries[str(note["id"])] = note
+            logger.info(f"Migrated {len(legacy)} notifications from {self.legacy_path}")
+            self.compact()
+            os.remove(self.legacy_path)
+        except Exception as e:
+            logger.error(f"Error migrating legacy notification history: {e}")
+
+    def _apply(self, record: dict):
+        op = record.get("op")
+        if op == "add":
+            note = record.get("note") or {}
+            if note.get("id") is not None:
+                note_id = str(note["id"])
+                self._entries.pop(note_id, None)
+                self._entries[note_id] = note
+        elif op == "del":
+            self._entries.pop(str(record.get("id")), None)
+        elif op == "clear":
+            self._entries.clear()
+
+    # ---------- Writes ----------
+
+    def add(self, note: dict) -> List[dict]:
+        """Append `note` and return any entries evicted by the retention limit."""
+        return self.add_many([note])
+
+    def add_many(self, notes: List[dict]) -> List[dict]:
+        """Append a batch of notes in one write; returns evicted entries."""
+        for note in notes:
+            note_id = str(note["id"])
+            self._entries.pop(note_id, None)
+            self._entries[note_id] = note
+        self._append([{"op": "add", "note": note} for note in notes])
+        return self._enforce_limit(write=True)
+
+    def remove(self, note_id) -> Optional[dict]:
+        note = self._entries.pop(str(note_id), None)
+        if note is not None:
+            self._append([{"op": "del", "id": str(note_id)}])
+        return note
+
+    def remove_many(self, note_ids) -> List[dict]:
+        removed = []
+        records = []
+        for note_id in note_ids:
+            note = self._entries.pop(str(note_id), None)
+            if note is not None:
+                removed.append(note)
+                records.append({"op": "del", "id": str(note_id)})
+        self._append(records)
+        return removed
+
+    def clear(self):
+        self._entries.clear()
+        self._cancel_compaction()
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._log_lines = 0
+        except OSError as e:
+            logger.error(f"Error deleting notification history log: {e}")
+            self._append([{"op": "clear"}])
+
+    def _enforce_limit(self, write: bool) -> List[dict]:
+        evicted = []
+        while len(self._entries) > self.limit:
+            oldest_id = next(iter(self._entries))
+            evicted.append(self._entries.pop(oldest_id))
+        if evicted and write:
+            self._append([{"op": "del", "id": str(n["id"])} for n in evicted])
+        return evicted
+
+    def _append(self, records: List[dict]):
+        if not records:
+            return
+        try:
+            with open(self.path, "a") as f:
+                f.write("".join(json.dumps(r) + "\n" for r in records))
+            self._log_lines += len(records)
+        except OSError as e:
+            logger.error(f"Error appending to notification history log: {e}")
+            return
+        if self._garbage() >= max(COMPACT_MIN_GARBAGE, len(self._entries) * COMPACT_GARBAGE_RATIO):
+            self._schedule_compaction()
+
+    # ---------- Compaction ----------
+
+    def _garbage(self) -> int:
+        return max(0, self._log_lines - len(self._entries))
+
+    def _schedule_compaction(self):
+        if self._compact_src is None:
+            self._compact_src = GLib.timeout_add_seconds(COMPACT_DELAY_S, self._on_compact_timeout)
+
+    def _cancel_compaction(self):
+        if self._compact_src is not None:
+            GLib.source_remove(self._compact_src)
+            self._compact_src = None
+
+    def _on_compact_timeout(self):
+        self._compact_src = None
+        self.compact()
+        return False
+
+    def compact(self):
+        """Rewrite the log as one `add` record per live entry."""
+        self._cancel_compaction()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                for note in self._entries.values():
+                    f.write(json.dumps({"op": "add", "note": note}) + "\n")
+            os.replace(tmp_path, self.path)
+            self._log_lines = len(self._entries)
+            logger.debug(f"Compacted notification history log to {self._log_lines} records")
+        except OSError as e:
+            logger.error(f"Error compacting notification history log: {e}")
+
+
+class HistoryPager:
+    """
+    Stored notes that have no history widget yet, handed out a page at a
+    time, newest first.
+
+    `needs_page` decides when the view should build another page: whenever
+    fewer than a page of entries are built or they no longer fill the
+    viewport, so deleting or clearing the visible entries pulls in older
+    ones instead of waiting for a scroll that can no longer happen.
+    """
+
+    def __init__(self, page_size: int):
+        self.page_size = max(1, int(page_size))
+        # oldest first, like NotificationStore.notes()
+        self._notes: List[dict] = []
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def __iter__(self):
+        return iter(self._notes)
+
+    def reset(self, notes: List[dict]):
+        self._notes = list(notes)
+
+    def next_page(self) -> List[dict]:
+        """Take the newest unbuilt notes, newest first."""
+        page = self._notes[-self.page_size:]
+        del self._notes[-self.page_size:]
+        page.reverse()
+        return page
+
+    def discard(self, predicate: Callable[[dict], bool]) -> List[dict]:
+        """Drop and return the unbuilt notes matching `predicate`."""
+        kept, dropped = [], []
+        for note in self._notes:
+            (dropped if predicate(note) else kept).append(note)
+        self._notes = kept
+        return dropped
+
+    def needs_page(self, built: int, viewport_filled: bool = True) -> bool:
+        return bool(self._notes) and (built < self.page_size or not viewport_filled)
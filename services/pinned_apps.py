@@ -0,0 +1,191 @@
+import json
+from typing import List, Optional
+
+from fabric.core.service import Service, Signal
+from fabric.utils import get_relative_path
+from fabric.utils.helpers import get_desktop_applications
+from gi.repository import Gio, GLib
+
+from config.loguru_config import logger
+
+logger = logger.bind(name="Pinned Apps", type="Service")
+
+DOCK_CONFIG_PATH = get_relative_path("../config/dock.json")
+
+# Coalesce the burst of CHANGED/CHANGES_DONE events a single write produces
+RELOAD_DELAY_MS = 150
+
+
+def app_data_from_desktop_app(app) -> dict:
+    """Build the dict stored in dock.json for a DesktopApp."""
+    return {
+        "name": app.name,
+        "display_name": app.display_name,
+        "window_class": app.window_class,
+        "executable": app.executable,
+        "command_line": app.command_line,
+    }
+
+
+def read_config() -> dict:
+    """Read and return the full configuration from the JSON file, handling missing file."""
+    try:
+        with open(DOCK_CONFIG_PATH, "r") as file:
+            config_data = json.load(file)
+
+        if "pinned_apps" in config_data and config_data["pinned_apps"] and isinstance(config_data["pinned_apps"][0], str):
+            all_apps = get_desktop_applications()
+            app_map = {app.name: app for app in all_apps if app.name}
+
+            old_pinned = config_data["pinned_apps"]
+            config_data["pinned_apps"] = []
+
+            for app_id in old_pinned:
+                app = app_map.get(app_id)
+                if app:
+                    config_data["pinned_apps"].append(app_data_from_desktop_app(app))
+                else:
+                    config_data["pinned_apps"].append({"name": app_id})
+
+    except (FileNotFoundError, json.JSONDecodeError):
+        config_data = {"pinned_apps": []}
+    return config_data
+
+
+def _same_app(a, b) -> bool:
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.get("name") == b.get("name")
+    return a == b
+
+
+class PinnedApps(Service):
+    """
+    Single in-process owner of the dock's pinned apps.
+
+    Every dock and the launcher share this store. In-process edits emit
+    `changed` right away; a Gio.FileMonitor on dock.json picks up edits made
+    outside the shell. Nothing runs while the pins are unchanged.
+    """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        if PinnedApps.instance is None:
+            PinnedApps.instance = PinnedApps()
+        return PinnedApps.instance
+
+    @Signal
+    def changed(self) -> None: ...
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._config = read_config()
+        self._reload_src: Optional[int] = None
+        # Serialized form of our last write, so the monitor echo is ignored
+        self._last_written: Optional[str] = None
+
+        self._monitor = None
+        try:
+            gfile = Gio.File.new_for_path(DOCK_CONFIG_PATH)
+            self._monitor = gfile.monitor_file(Gio.FileMonitorFlags.NONE, None)
+            self._monitor.connect("changed", self._on_file_changed)
+        except GLib.Error as e:
+            logger.warning(f"Unable to monitor {DOCK_CONFIG_PATH}: {e}")
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    @property
+    def pinned(self) -> List:
+        return self._config.get("pinned_apps", [])
+
+    def is_pinned(self, app_identifier) -> bool:
+        return self.index_of(app_identifier) >= 0
+
+    def index_of(self, app_identifier) -> int:
+        for i, pinned_app in enumerate(self.pinned):
+            if _same_app(app_identifier, pinned_app):
+                return i
+        return -1
+
+    def set_pinned(self, pinned: List) -> bool:
+        """Replace the pinned list, persist it and notify subscribers."""
+        pinned = list(pinned)
+        if pinned == self.pinned:
+            return True
+        self._config["pinned_apps"] = pinned
+        saved = self._save()
+        self.emit("changed")
+        return saved
+
+    def pin(self, app_data) -> bool:
+        """Pin `app_data`, refreshing the stored metadata if it is already pinned."""
+        pinned = list(self.pinned)
+        idx = self.index_of(app_data)
+        if idx < 0 and isinstance(app_data, dict):
+            # Legacy string entries are upgraded in place of the old one
+            idx = next((i for i, p in enumerate(pinned) if p == app_data.get("name")), -1)
+            if idx >= 0:
+                pinned.pop(idx)
+                idx = -1
+
+        if idx >= 0:
+            if isinstance(pinned[idx], dict) and isinstance(app_data, dict):
+                pinned[idx] = {**pinned[idx], **app_data}
+        else:
+            pinned.append(app_data)
+        return self.set_pinned(pinned)
+
+    def unpin(self, app_identifier) -> bool:
+        idx = self.index_of(app_identifier)
+        if idx < 0:
+            return False
+        pinned = list(self.pinned)
+        pinned.pop(idx)
+        return self.set_pinned(pinned)
+
+    def reload(self):
+        """Re-read dock.json and emit `changed` if the pins differ."""
+        if self._reload_src is not None:
+            GLib.source_remove(self._reload_src)
+            self._reload_src = None
+        new_config = read_config()
+        if new_config.get("pinned_apps", []) != self.pinned:
+            self._config = new_config
+            self.emit("changed")
+        return False
+
+    def _save(self) -> bool:
+        try:
+            serialized = json.dumps(self._config, indent=4)
+            with open(DOCK_CONFIG_PATH, "w") as file:
+                file.write(serialized)
+            self._last_written = serialized
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write dock config: {e}")
+            return False
+
+    def _on_file_changed(self, monitor, file, other_file, event_type):
+        if event_type not in (
+            Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+            Gio.FileMonitorEvent.CREATED,
+            Gio.FileMonitorEvent.DELETED,
+        ):
+            return
+        if self._reload_src is not None:
+            GLib.source_remove(self._reload_src)
+        self._reload_src = GLib.timeout_add(RELOAD_DELAY_MS, self._reload_if_external)
+
+    def _reload_if_external(self):
+        self._reload_src = None
+        if self._last_written is not None:
+            try:
+                with open(DOCK_CONFIG_PATH, "r") as file:
+                    if file.read() == self._last_written:
+                        return False
+            except OSError:
+                pass
+        return self.reload()
@@ -0,0 +1,177 @@
+import os
+import re
+import signal
+from typing import Dict, List, Optional, Set, Tuple
+
+from fabric.core.service import Service, Signal
+from gi.repository import GLib
+
+from config.loguru_config import logger
+
+logger = logger.bind(name="Process Watch", type="Service")
+
+SCAN_INTERVAL_S = 1
+
+
+def _read_proc(pid: str, name: str) -> Optional[str]:
+    try:
+        with open(f"/proc/{pid}/{name}", "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    return raw.replace(b"\0", b" ").decode(errors="replace").strip()
+
+
+def _scan_proc(patterns: Dict[str, Tuple["re.Pattern", bool]]) -> Dict[str, Set[int]]:
+    """
+    Match every running process against all patterns in one pass over /proc.
+    Like pgrep, a pattern matches the process name, or the full command line
+    when `full` is set.
+    """
+    found: Dict[str, Set[int]] = {name: set() for name in patterns}
+    need_cmdline = any(full for _, full in patterns.values())
+    own_pid = os.getpid()
+
+    try:
+        entries = os.listdir("/proc")
+    except OSError as e:
+        logger.error(f"Unable to list /proc: {e}")
+        return found
+
+    for entry in entries:
+        if not entry.isdigit() or int(entry) == own_pid:
+            continue
+        comm = _read_proc(entry, "comm")
+        if comm is None:
+            continue
+        cmdline = _read_proc(entry, "cmdline") if need_cmdline else None
+        for name, (regex, full) in patterns.items():
+            target = cmdline if full else comm
+            if target and regex.search(target):
+                found[name].add(int(entry))
+    return found
+
+
+class ProcessWatch(Service):
+    """
+    Tracks whether named processes are running, for every widget at once.
+
+    Processes started through `spawn` are followed by PID and reported the
+    moment they exit. Everything else (processes started by scripts or
+    outside the shell) is found by a single /proc scan per interval covering
+    all registered patterns, run off the main loop. No subprocesses are
+    forked to check state.
+    """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        if ProcessWatch.instance is None:
+            ProcessWatch.instance = ProcessWatch()
+        return ProcessWatch.instance
+
+    @Signal
+    def started(self, name: str) -> None: ...
+
+    @Signal
+    def stopped(self, name: str) -> None: ...
+
+    def __init__(self, interval: int = SCAN_INTERVAL_S, **kwargs):
+        super().__init__(**kwargs)
+        self.interval = interval
+        self._patterns: Dict[str, Tuple["re.Pattern", bool]] = {}
+        # name -> PIDs seen by the last scan
+        self._scanned: Dict[str, Set[int]] = {}
+        # name -> PIDs we spawned and are still waiting on
+        self._spawned: Dict[str, Set[int]] = {}
+        self._running: Set[str] = set()
+        self._scan_in_flight = False
+        self._timer_id: Optional[int] = None
+
+    # ---------- Public API ----------
+
+    def watch(self, name: str, pattern: str, full: bool = False):
+        """Start tracking processes matching `pattern` under `name`. Idempotent."""
+        if name in self._patterns:
+            return
+        self._patterns[name] = (re.compile(pattern), full)
+        self._scanned.setdefault(name, set())
+        if self._timer_id is None:
+            self._timer_id = GLib.timeout_add_seconds(self.interval, self._on_tick)
+        self.refresh()
+
+    def is_running(self, name: str) -> bool:
+        return name in self._running
+
+    def spawn(self, name: str, argv: List[str]) -> bool:
+        """Launch `argv` and track it as `name` until it exits."""
+        try:
+            pid, *_ = GLib.spawn_async(
+                argv,
+                flags=GLib.SpawnFlags.SEARCH_PATH | GLib.SpawnFlags.DO_NOT_REAP_CHILD,
+            )
+        except GLib.Error as e:
+            logger.error(f"Failed to start {name}: {e}")
+            return False
+        pid = int(pid)
+        self._spawned.setdefault(name, set()).add(pid)
+        GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid, self._on_child_exit, name)
+        self._update_state(name)
+        return True
+
+    def terminate(self, name: str, sig: int = signal.SIGTERM):
+        """Send `sig` to every known process under `name`, like pkill."""
+        pids = self._scanned.get(name, set()) | self._spawned.get(name, set())
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+            except OSError as e:
+                logger.error(f"Failed to signal {name} ({pid}): {e}")
+
+    def refresh(self):
+        """Scan now instead of waiting for the next interval."""
+        GLib.idle_add(self._scan)
+
+    # ---------- Internals ----------
+
+    def _on_tick(self):
+        self._scan()
+        return True
+
+    def _scan(self):
+        if self._scan_in_flight or not self._patterns:
+            return False
+        self._scan_in_flight = True
+        GLib.Thread.new("process-watch-scan", self._scan_thread, dict(self._patterns))
+        return False
+
+    def _scan_thread(self, patterns):
+        found = _scan_proc(patterns)
+        GLib.idle_add(self._apply_scan, found)
+
+    def _apply_scan(self, found: Dict[str, Set[int]]):
+        self._scan_in_flight = False
+        for name, pids in found.items():
+            self._scanned[name] = pids
+            self._update_state(name)
+        return False
+
+    def _on_child_exit(self, pid: int, _status: int, name: str):
+        GLib.spawn_close_pid(pid)
+        self._spawned.get(name, set()).discard(int(pid))
+        self._scanned.get(name, set()).discard(int(pid))
+        self._update_state(name)
+
+    def _update_state(self, name: str):
+        running = bool(self._scanned.get(name) or self._spawned.get(name))
+        if running == (name in self._running):
+            return
+        if running:
+            self._running.add(name)
+            self.emit("started", name)
+        else:
+            self._running.discard(name)
+            self.emit("stopped", name)
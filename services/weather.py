@@ -0,0 +1,210 @@
+import json
+import os
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+import requests
+from fabric.core.service import Service, Signal
+from gi.repository import GLib
+
+import config.data as data
+from config.loguru_config import logger
+from utils.weather import FALLBACK_COORDINATES, WeatherData, WeatherUtils, parse_timeseries
+
+logger = logger.bind(name="Weather", type="Service")
+
+LOCATION_CACHE_FILE = data.CACHE_DIR + "/weather_location.json"
+FORECAST_CACHE_FILE = data.CACHE_DIR + "/weather_forecast.json"
+
+# IP geolocation is only repeated after this long
+LOCATION_TTL_S = 6 * 3600
+# Used when met.no sends no usable Expires header
+DEFAULT_REFRESH_S = 1800
+# Never poll faster than this, even if Expires is in the past
+MIN_REFRESH_S = 300
+# Delay before retrying after a failed refresh
+RETRY_S = 120
+
+
+def _expires_at(headers, now: float) -> float:
+    try:
+        return parsedate_to_datetime(headers["Expires"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return now + DEFAULT_REFRESH_S
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        return cached if isinstance(cached, dict) else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_json(path: str, value: dict):
+    tmp = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Unable to write {path}: {e}")
+
+
+class WeatherService(Service):
+    """
+    Single met.no client shared by every weather widget.
+
+    The location is looked up once and kept on disk for a few hours. The
+    forecast is fetched following met.no's terms of service: nothing is
+    requested before the previous response's `Expires`, and refreshes are
+    conditional on `Last-Modified`. The parsed forecast is cached on disk
+    too, so a restart within the expiry window makes no request at all.
+    `changed` fires on the main loop after every refresh attempt.
+    """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        if WeatherService.instance is None:
+            WeatherService.instance = WeatherService()
+        return WeatherService.instance
+
+    @Signal
+    def changed(self) -> None: ...
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = WeatherUtils.get_user_agent()
+
+        self.data: Optional[WeatherData] = None
+        # "location" or "forecast" when the last refresh failed
+        self.error: Optional[str] = None
+
+        self._location: Optional[Tuple[float, float, str]] = None
+        self._location_expires = 0.0
+        self._busy = False
+        self._timer_id = 0
+
+        self.refresh()
+
+    # ---------- Public API ----------
+
+    def refresh(self) -> bool:
+        """Start a refresh now unless one is already running."""
+        if self._timer_id:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = 0
+        if not self._busy:
+            self._busy = True
+            GLib.Thread.new("weather-fetch", self._refresh_thread)
+        return False
+
+    # ---------- Worker thread ----------
+
+    def _refresh_thread(self):
+        now = time.time()
+        try:
+            lat, lon, city = self._locate(now)
+        except Exception as e:
+            logger.warning(f"Location lookup failed: {e}")
+            GLib.idle_add(self._publish, None, "location", RETRY_S)
+            return
+
+        try:
+            columns, expires = self._fetch_forecast(lat, lon, now)
+            weather = WeatherData(city=city, lat=lat, lon=lon, **columns)
+        except Exception as e:
+            logger.warning(f"Error fetching weather: {e}")
+            GLib.idle_add(self._publish, None, "forecast", RETRY_S)
+            return
+
+        delay = max(MIN_REFRESH_S, int(expires - time.time()))
+        GLib.idle_add(self._publish, weather, None, delay)
+
+    def _locate(self, now: float) -> Tuple[float, float, str]:
+        found = WeatherUtils.get_env_coordinates()
+        if found:
+            return found
+
+        if self._location and now < self._location_expires:
+            return self._location
+
+        cached = _read_json(LOCATION_CACHE_FILE)
+        if cached and now - cached.get("time", 0) < LOCATION_TTL_S:
+            try:
+                self._location = (float(cached["lat"]), float(cached["lon"]), cached.get("city") or "Unknown Location")
+                self._location_expires = cached["time"] + LOCATION_TTL_S
+                return self._location
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        found = WeatherUtils.lookup_ip_coordinates(self.session)
+        if not found:
+            # Not cached, so the next refresh tries the provider again
+            logger.debug("Using fallback coordinates")
+            return FALLBACK_COORDINATES
+
+        lat, lon, city = found
+        self._location = found
+        self._location_expires = now + LOCATION_TTL_S
+        _write_json(LOCATION_CACHE_FILE, {"lat": lat, "lon": lon, "city": city, "time": now})
+        return found
+
+    def _fetch_forecast(self, lat: float, lon: float, now: float) -> Tuple[dict, float]:
+        url = WeatherUtils.get_met_api_url(lat, lon)
+        cached = _read_json(FORECAST_CACHE_FILE)
+        if cached and cached.get("url") != url:
+            cached = None
+
+        if cached and now < cached.get("expires", 0):
+            return cached["columns"], cached["expires"]
+
+        headers = {}
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self.session.get(url, headers=headers, timeout=8)
+        expires = _expires_at(response.headers, now)
+
+        if response.status_code == 304 and cached:
+            logger.debug("Forecast not modified")
+            cached["expires"] = expires
+            _write_json(FORECAST_CACHE_FILE, cached)
+            return cached["columns"], expires
+
+        # 203 is met.no's "this product is deprecated" but still valid data
+        if response.status_code not in (200, 203):
+            raise RuntimeError(f"met.no error {response.status_code}: {response.text[:120]}")
+
+        columns = parse_timeseries(response.json())
+        _write_json(
+            FORECAST_CACHE_FILE,
+            {
+                "url": url,
+                "last_modified": response.headers.get("Last-Modified"),
+                "expires": expires,
+                "columns": columns,
+            },
+        )
+        return columns, expires
+
+    # ---------- Main loop ----------
+
+    def _publish(self, weather: Optional[WeatherData], error: Optional[str], delay: int):
+        self._busy = False
+        if weather is not None:
+            self.data = weather
+        self.error = error
+        self._timer_id = GLib.timeout_add_seconds(delay, self._on_timer)
+        self.emit("changed")
+        return False
+
+    def _on_timer(self):
+        self._timer_id = 0
+        return self.refresh()
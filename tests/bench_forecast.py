@@ -0,0 +1,43 @@
+"""
+Times build_forecast_model against the loop it replaced, on the recorded
+met.no forecast in tests/data:
+
+    python tests/bench_forecast.py
+
+tests/test_forecast.py checks that both produce the same model.
+"""
+
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forecast_reference import RECORDING, legacy_forecast_model, load_recording  # noqa: E402
+from utils.forecast import build_forecast_model  # noqa: E402
+from utils.weather import parse_timeseries  # noqa: E402
+
+NUMBER = 500
+REPEAT = 7
+
+
+def best_us(fn) -> float:
+    return min(timeit.repeat(fn, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+def main():
+    weather = load_recording()
+    with open(RECORDING) as f:
+        payload = json.load(f)
+    print(f"{len(weather.times)} entries from {os.path.basename(RECORDING)}, best of {REPEAT} x {NUMBER}")
+    print(f"  parse_timeseries (once per refresh, in the service): {best_us(lambda: parse_timeseries(payload)):8.1f} us")
+    for label, now in (("before 18:00", datetime(2026, 10, 19, 9)), ("after 18:00", datetime(2026, 10, 19, 20))):
+        before = best_us(lambda: legacy_forecast_model(weather, now))
+        after = best_us(lambda: build_forecast_model(weather, now))
+        print(f"  {label}: loop {before:8.1f} us, numpy {after:8.1f} us ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+# Every module logs through config.loguru_config, and importing the config
+# package loads config.data, which needs fabric, GTK and a display.
+try:
+    import config.data  # noqa: F401
+except Exception as e:  # pragma: no cover - depends on the environment
+    import warnings
+
+    warnings.warn(f"Skipping Ax-Shell tests, config.data is unavailable: {e}")
+    collect_ignore_glob = ["test_*.py"]
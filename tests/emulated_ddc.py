@@ -0,0 +1,90 @@
+"""An emulated DDC/CI monitor, for driving services/ddcci without /dev/i2c-*."""
+
+import threading
+import time
+from typing import Dict, List
+
+from services.ddcci import DISPLAY_ADDR_W, HOST_ADDR, HOST_ADDR_R, OP_GET_VCP, OP_GET_VCP_REPLY, OP_SET_VCP
+
+
+def xor(first: int, data: bytes) -> int:
+    for b in data:
+        first ^= b
+    return first
+
+
+class EmulatedDisplay:
+    """
+    Answers Get/Set VCP Feature the way a monitor at 0x37 does, on the bytes
+    a DdcCiDevice transport writes and reads. `busy` and `corrupt` make the
+    next replies null messages or carry a bad checksum, one each. Replies take
+    `latency_s` to read, and a write from another thread while a Get is
+    waiting for its reply is recorded in `overlaps`.
+    """
+
+    def __init__(
+        self, features: Dict[int, List[int]] = None, busy: int = 0, corrupt: int = 0, latency_s: float = 0.0
+    ):
+        # VCP code -> [current, maximum]
+        self.features = features if features is not None else {0x10: [50, 100]}
+        self.busy = busy
+        self.corrupt = corrupt
+        self.latency_s = latency_s
+        self.requests: List[bytes] = []
+        self.bad_requests: List[bytes] = []
+        self.overlaps: List[bytes] = []
+        self._reply = b""
+        # Thread whose Get request is still waiting for its reply
+        self._awaiting = None
+
+    # ---------- Transport ----------
+
+    def write(self, data: bytes) -> None:
+        data = bytes(data)
+        self.requests.append(data)
+        if self._awaiting not in (None, threading.get_ident()):
+            self.overlaps.append(data)
+        self._awaiting = None
+        # The destination address is not sent, but is part of the checksum
+        if data[0] != HOST_ADDR or len(data) != (data[1] & 0x7F) + 3 or xor(DISPLAY_ADDR_W, data[:-1]) != data[-1]:
+            self.bad_requests.append(data)
+            self._reply = b""
+            return
+        op = data[2]
+        if op == OP_GET_VCP:
+            self._reply = self._get_reply(data[3])
+            self._awaiting = threading.get_ident()
+        elif op == OP_SET_VCP and data[3] in self.features:
+            feature = self.features[data[3]]
+            feature[0] = min(feature[1], (data[4] << 8) | data[5])
+            self._reply = b""
+
+    def read(self, length: int) -> bytes:
+        time.sleep(self.latency_s)
+        self._awaiting = None
+        if self.busy:
+            self.busy -= 1
+            reply = bytes([DISPLAY_ADDR_W, 0x80, xor(HOST_ADDR_R, bytes([DISPLAY_ADDR_W, 0x80]))])
+        else:
+            reply = self._reply
+            if reply and self.corrupt:
+                self.corrupt -= 1
+                reply = reply[:-1] + bytes([reply[-1] ^ 0xFF])
+        return reply.ljust(length, b"\x00")[:length]
+
+    def close(self):
+        pass
+
+    # ---------- Replies ----------
+
+    def _get_reply(self, vcp: int) -> bytes:
+        if vcp in self.features:
+            current, maximum = self.features[vcp]
+            result = 0
+        else:
+            current, maximum, result = 0, 0, 1
+        body = bytes([
+            DISPLAY_ADDR_W, 0x80 | 8, OP_GET_VCP_REPLY, result, vcp, 0x00,
+            maximum >> 8, maximum & 0xFF, current >> 8, current & 0xFF,
+        ])
+        return body + bytes([xor(HOST_ADDR_R, body)])
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""
+Stand-in for ddcutil, for running the brightness service without monitors.
+
+    AX_DDCUTIL=tests/fake_ddcutil.py FAKE_DDCUTIL_STATE=/tmp/ddc.json python main.py
+
+Understands the invocations made by services/brightness.DdcutilBackend
+(`detect`, `getvcp <code> --terse`, `setvcp <code> <value>`) and prints
+what ddcutil prints for them. The monitors live in the JSON file named by
+FAKE_DDCUTIL_STATE, which is created with one bus on first use:
+
+    {"buses": {"3": {"vcp": {"10": [50, 100]}, "delay_ms": 0,
+                     "flock": 0, "fail": 0, "stuck": 0}},
+     "calls": []}
+
+Per bus, `delay_ms` slows every invocation down (a slow bus), and the
+counters make the next N invocations on it fail, one each: `flock` with
+ddcutil's lock diagnostics, `fail` with a DDC timeout, and `stuck` accepts
+a setvcp without applying it. Every invocation is appended to `calls` with
+its start and end times. Only the standard library is used.
+"""
+
+import fcntl
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+STATE_PATH = os.environ.get("FAKE_DDCUTIL_STATE", "/tmp/fake-ddcutil.json")
+DEFAULT_STATE = {
+    "buses": {"3": {"vcp": {"10": [50, 100]}, "delay_ms": 0, "flock": 0, "fail": 0, "stuck": 0}},
+    "calls": [],
+}
+
+
+@contextmanager
+def locked_state():
+    """The state file, locked against the other (parallel) invocations."""
+    with open(STATE_PATH, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        text = f.read()
+        state = json.loads(text) if text.strip() else json.loads(json.dumps(DEFAULT_STATE))
+        yield state
+        f.seek(0)
+        f.truncate()
+        json.dump(state, f)
+
+
+def take(monitor: dict, counter: str) -> bool:
+    """Consume one pending failure of kind `counter`."""
+    if monitor.get(counter, 0) > 0:
+        monitor[counter] -= 1
+        return True
+    return False
+
+
+def option(args: list, name: str):
+    if name in args:
+        return args[args.index(name) + 1]
+    return None
+
+
+def vcp_code(text: str) -> str:
+    return f"{int(text, 16):02X}"
+
+
+def detect(state: dict) -> int:
+    for bus in sorted(state["buses"], key=int):
+        print(f"Display {int(bus) - 2}")
+        print(f"   I2C bus:             /dev/i2c-{bus}")
+        print("   Monitor:             FAK:Fake Monitor:0001")
+        print()
+    return 0
+
+
+def getvcp(monitor: dict, bus: str, codes: list) -> int:
+    for code in codes:
+        value = monitor["vcp"].get(code)
+        if value is None:
+            print(f"VCP {code} ERR")
+        else:
+            print(f"VCP {code} C {value[0]} {value[1]}")
+    return 0
+
+
+def setvcp(monitor: dict, bus: str, code: str, raw: int, stuck: bool) -> int:
+    value = monitor["vcp"].get(code)
+    if value is None:
+        print(f"Feature {code} not supported on bus /dev/i2c-{bus}")
+        return 1
+    if not stuck:
+        value[0] = max(0, min(value[1], raw))
+    return 0
+
+
+def main(argv: list) -> int:
+    # Flags other than --bus don't change what the fake answers
+    args = [a for a in argv if not a.startswith("--") or a == "--bus"]
+    command = next((a for a in args if a in ("detect", "getvcp", "setvcp")), None)
+    if command is None:
+        print(f"fake ddcutil: unsupported invocation {' '.join(argv)}", file=sys.stderr)
+        return 2
+    started = time.time()
+
+    if command == "detect":
+        with locked_state() as state:
+            state["calls"].append({"cmd": command, "bus": None, "start": started, "end": time.time()})
+            return detect(state)
+
+    bus = option(args, "--bus")
+    operands = args[args.index(command) + 1:]
+    if "--bus" in operands:
+        operands = operands[:operands.index("--bus")]
+
+    with locked_state() as state:
+        monitor = state["buses"].get(bus)
+        if monitor is None:
+            print(f"No display found on bus /dev/i2c-{bus}")
+            return 1
+        delay_ms = monitor.get("delay_ms", 0)
+        flock = take(monitor, "flock")
+        fail = not flock and take(monitor, "fail")
+        stuck = command == "setvcp" and not (flock or fail) and take(monitor, "stuck")
+
+    # Sleep outside the lock, so buses answer in parallel
+    time.sleep(delay_ms / 1000)
+
+    with locked_state() as state:
+        monitor = state["buses"][bus]
+        if flock:
+            print(f"flock() on /dev/i2c-{bus} failed. Max wait time 1000 msec exceeded.")
+            print("Flock diagnostics: lock held by another process")
+            status = 1
+        elif fail:
+            print(f"DDC communication failed for /dev/i2c-{bus}: Timed out waiting for reply")
+            status = 1
+        elif command == "getvcp":
+            status = getvcp(monitor, bus, [vcp_code(c) for c in operands])
+        else:
+            status = setvcp(monitor, bus, vcp_code(operands[0]), int(operands[1]), stuck)
+        state["calls"].append({
+            "cmd": command, "bus": int(bus), "args": operands,
+            "start": started, "end": time.time(), "status": status,
+        })
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
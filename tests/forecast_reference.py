@@ -0,0 +1,138 @@
+"""
+Reference data for tests/test_forecast.py and tests/bench_forecast.py: a
+10-day met.no locationforecast response, and build_forecast_model as it
+was before the NumPy rewrite. The old loop is only split in two, so the
+tests can see how it grouped symbol codes.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+from utils.forecast import get_time_period_name
+from utils.weather import WeatherData, WeatherUtils, parse_timeseries
+
+# met.no compact format, 87 entries: hourly for 56 hours, then 6-hourly
+RECORDING = os.path.join(os.path.dirname(__file__), "data", "metno_compact_10day.json")
+
+
+def load_recording() -> WeatherData:
+    with open(RECORDING) as f:
+        columns = parse_timeseries(json.load(f))
+    return WeatherData(city="Oslo", lat=59.9, lon=10.75, **columns)
+
+
+def group_periods(weather, now: datetime):
+    """The loop's (date -> period -> temps/codes) grouping, and today's periods."""
+    # Group data by date and time periods
+    daily_data = {}
+    today = now.date()
+    current_hour = now.hour
+
+    # Determine periods for today based on current time
+    if current_hour >= 18:
+        # After 18:00, show next 4 hours (excluding 00:00)
+        today_periods = []
+        for i in range(4):
+            next_hour = current_hour + 1 + i
+            if next_hour <= 23:  # Don't show 00:00 (24:00)
+                today_periods.append(f"{next_hour:02d}:00")
+    else:
+        # Before 18:00, use regular periods
+        today_periods = ['00:00', '06:00', '12:00', '18:00']
+
+    for timestamp, temp, weather_code in zip(weather.times, weather.temps, weather.codes):
+        # Times are bucketed by their UTC date and hour, as met.no sends them
+        time_obj = datetime.fromtimestamp(timestamp, timezone.utc)
+        date = time_obj.date()
+        hour = time_obj.hour
+
+        # Process today and the next 6 days (7 days total)
+        days_diff = (date - today).days
+        if days_diff < 0 or days_diff > 6:
+            continue
+
+        is_today = (days_diff == 0)
+
+        # Initialize daily data structure
+        if date not in daily_data:
+            if is_today:
+                # Use dynamic periods for today
+                daily_data[date] = {period: {'temps': [], 'codes': []} for period in today_periods}
+            else:
+                # Use regular periods for future days
+                daily_data[date] = {
+                    '00:00': {'temps': [], 'codes': []},
+                    '06:00': {'temps': [], 'codes': []},
+                    '12:00': {'temps': [], 'codes': []},
+                    '18:00': {'temps': [], 'codes': []}
+                }
+
+        # Determine time period
+        period = get_time_period_name(hour, is_today, current_hour)
+
+        # For today, only process periods we're interested in
+        if is_today and period not in today_periods:
+            continue
+
+        # For today with regular periods, only show future time periods
+        if is_today and current_hour < 18:
+            period_hour_map = {'00:00': 0, '06:00': 6, '12:00': 12, '18:00': 18}
+            if period in period_hour_map and period_hour_map[period] < current_hour:
+                continue
+
+        # Skip if this period doesn't exist in our data structure
+        if period not in daily_data[date]:
+            continue
+
+        if temp is not None:
+            daily_data[date][period]['temps'].append(int(temp))
+        if weather_code:
+            daily_data[date][period]['codes'].append(weather_code)
+
+    return daily_data, today_periods
+
+
+def legacy_forecast_model(weather, now: datetime):
+    """Group the forecast into [(date, {period: {'temp', 'emoji'}})] for the next 7 days."""
+    today = now.date()
+    daily_data, today_periods = group_periods(weather, now)
+
+    # Process daily data into the render model
+    model = []
+    for date in sorted(daily_data.keys()):
+        day_data = daily_data[date]
+        periods_data = {}
+
+        # Determine which periods to process for this date
+        is_today_date = (date == today)
+        periods_to_process = today_periods if is_today_date else ['00:00', '06:00', '12:00', '18:00']
+
+        for period in periods_to_process:
+            if period in day_data:
+                period_info = day_data[period]
+
+                if period_info['temps'] and period_info['codes']:
+                    # Use average temperature for the period
+                    avg_temp = int(sum(period_info['temps']) / len(period_info['temps']))
+
+                    # Use the most common weather code for the period
+                    most_common_code = max(set(period_info['codes']),
+                                           key=period_info['codes'].count)
+
+                    emoji = WeatherUtils.get_weather_emoji(most_common_code)
+                    periods_data[period] = {
+                        'temp': avg_temp,
+                        'emoji': emoji
+                    }
+                elif period_info['temps']:
+                    # Have temperature but no weather code
+                    avg_temp = int(sum(period_info['temps']) / len(period_info['temps']))
+                    periods_data[period] = {
+                        'temp': avg_temp,
+                        'emoji': "🌡️"
+                    }
+
+        if periods_data:
+            model.append((date, periods_data))
+    return model
@@ -0,0 +1,207 @@
+import fcntl
+import json
+import os
+import time
+
+import pytest
+from gi.repository import Gio, GLib
+
+from emulated_ddc import EmulatedDisplay
+from services import brightness
+from services.brightness import (
+    MAX_SET_RETRIES,
+    Brightness,
+    DdcutilBackend,
+    _parse_detect_output,
+    _parse_getvcp_output,
+)
+
+FAKE_DDCUTIL = os.path.join(os.path.dirname(__file__), "fake_ddcutil.py")
+
+
+class FakeDdcutil:
+    """Monitors behind tests/fake_ddcutil.py, configured through its state file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def configure(self, buses: dict):
+        self._write({
+            "buses": {
+                str(bus): {"vcp": {"10": [50, 100]}, "delay_ms": 0, "flock": 0, "fail": 0, "stuck": 0, **opts}
+                for bus, opts in buses.items()
+            },
+            "calls": [],
+        })
+
+    def update(self, bus: int, **opts):
+        state = self.state()
+        state["buses"][str(bus)].update(opts)
+        self._write(state)
+
+    def state(self) -> dict:
+        with open(self.path) as f:
+            # The fake rewrites the file under this lock
+            fcntl.flock(f, fcntl.LOCK_SH)
+            return json.load(f)
+
+    def value(self, bus: int) -> int:
+        return self.state()["buses"][str(bus)]["vcp"]["10"][0]
+
+    def calls(self, cmd: str, bus: int = None) -> list:
+        return [c for c in self.state()["calls"] if c["cmd"] == cmd and (bus is None or c["bus"] == bus)]
+
+    def _write(self, state: dict):
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            f.truncate()
+            json.dump(state, f)
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    path = tmp_path / "ddcutil.json"
+    monkeypatch.setenv("FAKE_DDCUTIL_STATE", str(path))
+    monkeypatch.setattr(brightness, "DDCUTIL_BIN", FAKE_DDCUTIL)
+    # Keep the real hardware out of it
+    monkeypatch.setattr(brightness.I2cDevBackend, "probe", staticmethod(lambda: []))
+    monkeypatch.setattr(brightness, "find_backlight", lambda: None)
+    return FakeDdcutil(path)
+
+
+def run_until(predicate, timeout_s: float = 10.0):
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout_s
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for the DDC engine"
+        while context.iteration(False):
+            pass
+        time.sleep(0.005)
+
+
+def percents(service: Brightness) -> dict:
+    return {d["display"]: d["percent"] for d in json.loads(service.external_brightness_json)}
+
+
+def start(fake: FakeDdcutil, buses: dict) -> Brightness:
+    fake.configure(buses)
+    service = Brightness(poll_seconds=0)
+    run_until(lambda: all(p >= 0 for p in percents(service).values()) and len(percents(service)) == len(buses))
+    return service
+
+
+def test_parsers():
+    assert _parse_detect_output("Display 1\n   I2C bus:  /dev/i2c-3\nDisplay 2\n   I2C bus:  /dev/i2c-5\n") == [3, 5]
+    assert _parse_getvcp_output("VCP 10 C 40 100") == (40, 100)
+    assert _parse_getvcp_output("VCP code 0x10 (Brightness): current value =    35, max value =   100") == (35, 100)
+
+
+def test_slider_drag_collapses_to_latest_target(fake):
+    service = start(fake, {3: {"delay_ms": 150}})
+
+    for percent in range(10, 81, 10):
+        service.set_percent(3, percent)
+    run_until(lambda: service.set_latency_ms >= 0)
+
+    assert fake.value(3) == 80
+    assert percents(service) == {3: 80}
+    # The first write goes out at once, everything after it collapses
+    assert [c["args"][1] for c in fake.calls("setvcp", 3)] == ["10", "80"]
+
+
+def test_failed_writes_back_off_and_retry(fake):
+    service = start(fake, {3: {}})
+    fake.update(3, flock=1, fail=1)
+
+    service.set_percent(3, 30)
+    run_until(lambda: service.set_latency_ms >= 0)
+
+    assert fake.value(3) == 30
+    writes = fake.calls("setvcp", 3)
+    assert [c["status"] for c in writes] == [1, 1, 0]
+    # 700 ms after the first failure, 1400 ms after the second
+    assert writes[1]["start"] - writes[0]["end"] >= 0.65
+    assert writes[2]["start"] - writes[1]["end"] >= 1.35
+
+
+def test_gives_up_on_a_monitor_that_ignores_writes(fake):
+    service = start(fake, {3: {"stuck": 10}})
+
+    service.set_percent(3, 90)
+    run_until(lambda: len(fake.calls("setvcp", 3)) > MAX_SET_RETRIES and percents(service) == {3: 50})
+
+    assert fake.value(3) == 50
+    assert len(fake.calls("setvcp", 3)) == MAX_SET_RETRIES + 1
+
+
+def test_slow_bus_does_not_hold_up_others(fake):
+    service = start(fake, {3: {}, 5: {"delay_ms": 1000}})
+
+    service.set_all_percent(20)
+    run_until(lambda: fake.value(3) == 20 and fake.value(5) == 20)
+
+    fast, = fake.calls("setvcp", 3)
+    slow, = fake.calls("setvcp", 5)
+    # Both writes went out together and the fast bus didn't wait for the slow one
+    assert abs(slow["start"] - fast["start"]) < 0.5
+    assert fast["end"] < slow["end"] - 0.5
+
+
+def test_hung_invocation_is_killed_at_the_ceiling(fake, monkeypatch):
+    monkeypatch.setitem(brightness.CEIL_MS, "get", 300)
+    fake.configure({3: {"delay_ms": 5000}})
+    results = []
+    started = time.monotonic()
+    DdcutilBackend().get(3, lambda cur, mx: results.append((cur, mx)))
+    run_until(lambda: results)
+
+    assert results == [(None, None)]
+    assert time.monotonic() - started < 2
+
+
+def test_reprobes_when_an_i2c_device_appears(fake, monkeypatch):
+    service = start(fake, {3: {}})
+    assert service._backend.name == "ddcutil"
+
+    # i2c-dev gets loaded and a monitor on bus 7 becomes reachable directly
+    display = EmulatedDisplay({0x10: [25, 100]})
+    monkeypatch.setattr(brightness.I2cDevBackend, "probe", staticmethod(lambda: [7]))
+    monkeypatch.setattr(brightness.ddcci, "I2cDevTransport", lambda bus: display)
+    monkeypatch.setattr(brightness, "REPROBE_DELAY_MS", 10)
+    service._on_dev_changed(None, Gio.File.new_for_path("/dev/i2c-7"), None, Gio.FileMonitorEvent.CREATED)
+    run_until(lambda: percents(service).get(7) == 25)
+
+    assert service._backend.name == "i2c-dev"
+    # Bus 3 was only reachable through ddcutil and its adapter is gone
+    assert list(percents(service)) == [7]
+
+    service.set_percent(7, 60)
+    run_until(lambda: service.set_latency_ms >= 0)
+    assert display.features[0x10][0] == 60
+
+
+def test_reprobe_queues_behind_a_busy_bus(fake, monkeypatch):
+    displays = {7: EmulatedDisplay({0x10: [25, 100]}), 8: EmulatedDisplay({0x10: [40, 100]})}
+    monkeypatch.setattr(brightness.I2cDevBackend, "probe", staticmethod(lambda: [7, 8]))
+    monkeypatch.setattr(brightness.ddcci, "I2cDevTransport", lambda bus: displays[bus])
+    service = Brightness(poll_seconds=0)
+    run_until(lambda: percents(service) == {7: 25, 8: 40})
+    assert service._backend.name == "i2c-dev"
+
+    # The monitor on bus 7 is slow and answers busy once, so the read is
+    # still retrying when a hotplug re-probe comes in
+    displays[7].latency_s = 0.2
+    displays[7].busy = 1
+    sent = len(displays[7].requests)
+    service._request_read(7)
+    service._reprobe()
+    # The read and its retry, then the probe's read
+    run_until(lambda: len(displays[7].requests) == sent + 3 and not service._state(7).busy)
+
+    service.set_percent(7, 60)
+    run_until(lambda: service.set_latency_ms >= 0)
+    assert displays[7].features[0x10][0] == 60
+    for display in displays.values():
+        assert display.overlaps == []
+        assert display.bad_requests == []
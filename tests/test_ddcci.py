@@ -0,0 +1,106 @@
+import pytest
+
+from emulated_ddc import EmulatedDisplay
+from services import ddcci
+from services.ddcci import DdcCiDevice, DdcError, build_get_request, build_set_request, parse_get_reply
+
+
+def device(display: ddcci.Transport, sleeps: list = None) -> DdcCiDevice:
+    return DdcCiDevice(display, sleep=(sleeps.append if sleeps is not None else lambda _s: None))
+
+
+def test_requests_carry_the_0x6e_checksum():
+    # Get VCP 0x10, as given in the DDC/CI spec
+    assert build_get_request(0x10) == bytes.fromhex("51 82 01 10 ac")
+    assert build_set_request(0x10, 50) == bytes.fromhex("51 84 03 10 00 32 9a")
+    assert build_set_request(0x10, 0x1_0000) == bytes.fromhex("51 84 03 10 ff ff a8")
+
+
+def test_reply_is_checked_against_0x50():
+    reply = bytes.fromhex("6e 88 02 00 10 00 00 64 00 32")
+    reply += bytes([0x50 ^ 0x6E ^ 0x88 ^ 0x02 ^ 0x10 ^ 0x64 ^ 0x32])
+    assert parse_get_reply(reply, 0x10) == (50, 100)
+
+    with pytest.raises(DdcError, match="checksum"):
+        parse_get_reply(reply[:-1] + bytes([reply[-1] ^ 1]), 0x10)
+    with pytest.raises(DdcError, match="feature"):
+        parse_get_reply(reply, 0x12)
+    with pytest.raises(DdcError, match="short"):
+        parse_get_reply(reply[:5], 0x10)
+
+
+def test_null_and_unsupported_replies():
+    display = EmulatedDisplay(busy=1)
+    with pytest.raises(DdcError, match="busy"):
+        parse_get_reply(display.read(ddcci.GET_REPLY_LEN), 0x10)
+
+    display.write(build_get_request(0x12))
+    with pytest.raises(DdcError, match="unsupported"):
+        parse_get_reply(display.read(ddcci.GET_REPLY_LEN), 0x12)
+
+
+def test_get_and_set_round_trip():
+    display = EmulatedDisplay({0x10: [30, 100], 0x12: [200, 300]})
+    dev = device(display)
+
+    assert dev.get_vcp(0x10) == (30, 100)
+    assert dev.get_vcp(0x12) == (200, 300)
+    dev.set_vcp(0x10, 75)
+    assert dev.get_vcp(0x10) == (75, 100)
+    assert display.bad_requests == []
+
+
+def test_get_retries_null_and_corrupt_replies():
+    display = EmulatedDisplay(busy=1, corrupt=1)
+    sleeps = []
+    assert device(display, sleeps).get_vcp(0x10) == (50, 100)
+    assert len(display.requests) == 3
+    assert sleeps.count(ddcci.RETRY_DELAY_S) == 2
+
+
+def test_get_gives_up_after_max_attempts():
+    display = EmulatedDisplay(busy=ddcci.MAX_ATTEMPTS)
+    with pytest.raises(DdcError, match="busy"):
+        device(display).get_vcp(0x10)
+    assert len(display.requests) == ddcci.MAX_ATTEMPTS
+
+
+def test_commands_after_a_set_wait_for_the_display():
+    sleeps = []
+    dev = device(EmulatedDisplay(), sleeps)
+    dev.set_vcp(0x10, 10)
+    dev.get_vcp(0x10)
+    # The get waited out the rest of the post-set delay before writing
+    assert sleeps[0] > 0 and sleeps[0] <= ddcci.SET_DELAY_S
+    assert sleeps[1] == ddcci.GET_REPLY_DELAY_S
+
+
+def test_i2c_dev_transport(monkeypatch):
+    display = EmulatedDisplay()
+    calls = []
+    monkeypatch.setattr(ddcci.os, "open", lambda path, flags: calls.append(("open", path)) or 42)
+    monkeypatch.setattr(ddcci.os, "close", lambda fd: calls.append(("close", fd)))
+    monkeypatch.setattr(ddcci.os, "write", lambda fd, data: display.write(data))
+    monkeypatch.setattr(ddcci.os, "read", lambda fd, n: display.read(n))
+    monkeypatch.setattr(ddcci.fcntl, "ioctl", lambda fd, req, arg: calls.append(("ioctl", fd, req, arg)))
+
+    transport = ddcci.I2cDevTransport(4)
+    assert device(transport).get_vcp(0x10) == (50, 100)
+    transport.close()
+    transport.close()
+
+    assert calls == [("open", "/dev/i2c-4"), ("ioctl", 42, ddcci.I2C_SLAVE, ddcci.DDCCI_ADDR), ("close", 42)]
+
+
+def test_i2c_dev_transport_closes_fd_when_address_is_refused(monkeypatch):
+    closed = []
+    monkeypatch.setattr(ddcci.os, "open", lambda path, flags: 42)
+    monkeypatch.setattr(ddcci.os, "close", closed.append)
+
+    def refuse(fd, req, arg):
+        raise OSError(16, "Device or resource busy")
+
+    monkeypatch.setattr(ddcci.fcntl, "ioctl", refuse)
+    with pytest.raises(OSError):
+        ddcci.I2cDevTransport(4)
+    assert closed == [42]
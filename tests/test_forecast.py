@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from forecast_reference import group_periods, legacy_forecast_model, load_recording
+from utils.forecast import build_forecast_model
+from utils.weather import WeatherUtils
+
+
+def every_hour(start: datetime, days: int):
+    return [start + timedelta(hours=h) for h in range(days * 24)]
+
+
+def assert_matches_loop(weather, now: datetime):
+    model = build_forecast_model(weather, now)
+    legacy = legacy_forecast_model(weather, now)
+
+    def temps(m):
+        return [(date, {period: value["temp"] for period, value in periods.items()}) for date, periods in m]
+
+    assert temps(model) == temps(legacy), now
+    grouped, _ = group_periods(weather, now)
+    for (date, periods), (_, legacy_periods) in zip(model, legacy):
+        for period, value in periods.items():
+            codes = grouped[date][period]["codes"]
+            if not codes:
+                assert value["emoji"] == legacy_periods[period]["emoji"] == "🌡️"
+                continue
+            # The loop broke ties in set order, which isn't stable, so any
+            # of the tied codes is what it could have shown
+            top = max(codes.count(code) for code in codes)
+            tied = {WeatherUtils.get_weather_emoji(code) for code in codes if codes.count(code) == top}
+            assert value["emoji"] in tied, (now, date, period)
+            if len(tied) == 1:
+                assert value["emoji"] == legacy_periods[period]["emoji"]
+
+
+def test_matches_the_loop_on_a_recorded_forecast():
+    weather = load_recording()
+    # From the day before the forecast starts to past its end, every hour
+    for now in every_hour(datetime(2026, 10, 18), 13):
+        assert_matches_loop(weather, now)
+
+
+def test_matches_the_loop_with_missing_values():
+    weather = load_recording()
+    weather.temps = [None if i % 7 == 3 else t for i, t in enumerate(weather.temps)]
+    weather.codes = [None if i % 5 == 1 else c for i, c in enumerate(weather.codes)]
+    # Whole periods without a symbol code or without any temperature
+    weather.codes[:6] = [None] * 6
+    weather.temps[60:62] = [None, None]
+    for now in every_hour(datetime(2026, 10, 19), 4):
+        assert_matches_loop(weather, now)
+
+
+def test_layout_of_the_model():
+    weather = load_recording()
+    morning = build_forecast_model(weather, datetime(2026, 10, 19, 9))
+    assert len(morning) == 7
+    assert list(morning[0][1]) == ["12:00", "18:00"]
+    assert list(morning[1][1]) == ["00:00", "06:00", "12:00", "18:00"]
+
+    evening = build_forecast_model(weather, datetime(2026, 10, 19, 20))
+    assert list(evening[0][1]) == ["21:00", "22:00", "23:00"]
+
+    weather.times, weather.temps, weather.codes = [], [], []
+    assert build_forecast_model(weather, datetime(2026, 10, 19, 9)) == []
@@ -0,0 +1,37 @@
+import os
+
+from services.notification_image_cache import NotificationImageCache
+
+
+def stored(cache: NotificationImageCache, key: str, size: int, atime: float, held: bool = True) -> str:
+    """Account for an image the way put() and its writer thread do."""
+    path = cache.path_for_key(key)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    cache._entries[key] = {"size": 0, "atime": atime}
+    if held:
+        cache.acquire(path)
+    cache._on_written(key, size)
+    return path
+
+
+def test_referenced_images_are_never_evicted(tmp_path):
+    cache = NotificationImageCache(str(tmp_path), budget_bytes=100)
+    cache._ensure_loaded()
+    old = stored(cache, "old", 60, atime=1)
+    unused = stored(cache, "unused", 30, atime=2, held=False)
+
+    # Over budget: the unreferenced image goes, even though it's newer
+    stored(cache, "shown", 30, atime=3)
+    assert not os.path.exists(unused)
+    assert set(cache._entries) == {"old", "shown"}
+
+    # With nothing unreferenced left, the cache goes over budget instead
+    stored(cache, "big", 50, atime=4)
+    assert set(cache._entries) == {"old", "shown", "big"}
+    assert cache._total_bytes == 140
+
+    # Released images are fair game again
+    cache.release(old)
+    assert not os.path.exists(old)
+    assert set(cache._entries) == {"shown", "big"}
@@ -0,0 +1,234 @@
+import time
+
+import pytest
+from gi.repository import GLib, GObject
+
+from modules import notifications
+from modules.notifications import (
+    APP_POPUP_RATE_LIMIT,
+    MAX_VISIBLE_NOTIFICATIONS,
+    NOTIFICATION_BATCH_MS,
+    NotificationContainer,
+    NotificationHistory,
+)
+from services.notification_store import NotificationStore
+
+FLOOD_SIZE = 1000
+FLOOD_APPS = ["chat", "build", "mail", "Spotify", "calendar"]
+# One frame at 60 Hz is 16 ms; a batch may take a few, never a visible hang
+MAX_STALL_MS = 200
+
+
+class FakeNotification(GObject.Object):
+    """The parts of fabric's Notification that the popups and history read."""
+
+    __gsignals__ = {"closed": (GObject.SignalFlags.RUN_FIRST, None, (object,))}
+
+    def __init__(self, _id: int, app_name: str, summary: str, body: str = ""):
+        super().__init__()
+        self.id = _id
+        self.app_name = app_name
+        self.app_icon = ""
+        self.summary = summary
+        self.body = body
+        self.image_pixbuf = None
+        self.actions = []
+        self.timeout = -1
+
+    def close(self, reason: str = "closed-by-application"):
+        self.emit("closed", f"NotificationCloseReason.{reason.replace('-', '_').upper()}")
+
+
+class FakeNotifications(GObject.Object):
+    """Stands in for the org.freedesktop.Notifications server on the bus."""
+
+    __gsignals__ = {"notification-added": (GObject.SignalFlags.RUN_FIRST, None, (int,))}
+
+    def __init__(self, **_):
+        super().__init__()
+        self._notifications = {}
+        self._last_id = 0
+
+    def notify(self, app_name: str, summary: str, replaces_id: int = 0) -> int:
+        """Handle a Notify call, as the D-Bus method would."""
+        if replaces_id in self._notifications:
+            _id = replaces_id
+        else:
+            self._last_id += 1
+            _id = self._last_id
+        self._notifications[_id] = FakeNotification(_id, app_name, summary, f"body of {summary}")
+        self.emit("notification-added", _id)
+        return _id
+
+    def get_notification_from_id(self, _id: int):
+        return self._notifications.get(_id)
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    monkeypatch.setattr(notifications, "PERSISTENT_HISTORY_LOG", str(tmp_path / "history.jsonl"))
+    monkeypatch.setattr(notifications, "PERSISTENT_HISTORY_FILE", str(tmp_path / "history.json"))
+    monkeypatch.setattr(notifications, "get_history_limit", lambda: 50)
+    monkeypatch.setattr(notifications, "get_history_ignored_apps", lambda: [])
+    monkeypatch.setattr(notifications, "get_limited_apps_history", lambda: ["Spotify"])
+
+    writes = []
+    add_many = NotificationStore.add_many
+
+    def counting_add_many(store, notes):
+        writes.append(len(notes))
+        return add_many(store, notes)
+
+    monkeypatch.setattr(NotificationStore, "add_many", counting_add_many)
+    history = NotificationHistory()
+    history.writes = writes
+    return history
+
+
+@pytest.fixture
+def container(history, monkeypatch):
+    monkeypatch.setattr(notifications, "Notifications", FakeNotifications)
+    container = NotificationContainer(notification_history_instance=history)
+    flushes = []
+    flush_pending = container._flush_pending
+
+    def counting_flush():
+        flushes.append(len(container._pending))
+        return flush_pending()
+
+    container._flush_pending = counting_flush
+    container.flushes = flushes
+    yield container
+    for box in container.notifications:
+        box.stop_timeout()
+
+
+def settle(timeout_s: float = 5.0):
+    """Run the main loop until the batch window has passed and gone quiet."""
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout_s
+    quiet_until = time.monotonic() + NOTIFICATION_BATCH_MS * 2 / 1000
+    while time.monotonic() < quiet_until:
+        assert time.monotonic() < deadline, "the main loop never went quiet"
+        if context.iteration(False):
+            quiet_until = time.monotonic() + NOTIFICATION_BATCH_MS * 2 / 1000
+        else:
+            time.sleep(0.002)
+
+
+def shown(container) -> list:
+    return [box.notification.summary for box in container.notifications]
+
+
+def test_a_burst_is_ingested_as_one_batch(container, history):
+    server = container._server
+    first = server.notify("chat", "typing")
+    server.notify("mail", "inbox")
+    # Replaces-id updates inside the window only keep the newest content
+    server.notify("chat", "typing.", replaces_id=first)
+    server.notify("chat", "hello", replaces_id=first)
+    assert container.notifications == []
+
+    settle()
+    assert container.flushes == [2]
+    assert shown(container) == ["inbox", "hello"]
+    assert history.writes == []
+
+
+def test_update_of_an_onscreen_popup_replaces_it(container):
+    server = container._server
+    _id = server.notify("build", "compiling 1/3")
+    settle()
+    for step in (2, 3):
+        server.notify("build", f"compiling {step}/3", replaces_id=_id)
+        settle()
+
+    # In-place updates are neither new popups nor rate limited
+    assert shown(container) == ["compiling 3/3"]
+    assert len(container.stack.get_children()) == 1
+
+
+def test_rate_limited_app_goes_to_history(container, history):
+    server = container._server
+    for i in range(10):
+        server.notify("chat", f"message {i}")
+    settle()
+
+    assert shown(container) == [f"message {i}" for i in range(APP_POPUP_RATE_LIMIT)]
+    assert sorted(n["summary"] for n in history._store.notes()) == sorted(
+        f"message {i}" for i in range(APP_POPUP_RATE_LIMIT, 10)
+    )
+
+    # Other apps still get their popups
+    server.notify("mail", "inbox")
+    settle()
+    assert shown(container)[-1] == "inbox"
+
+
+def test_popups_are_capped(container, history):
+    server = container._server
+    for i in range(MAX_VISIBLE_NOTIFICATIONS + 3):
+        server.notify(f"app{i}", f"from app{i}")
+    settle()
+
+    # Only the newest fit; the rest never become popups
+    assert shown(container) == [f"from app{i}" for i in range(3, MAX_VISIBLE_NOTIFICATIONS + 3)]
+    assert sorted(n["summary"] for n in history._store.notes()) == ["from app0", "from app1", "from app2"]
+
+    # A later batch pushes the oldest popups out to history
+    server.notify("late1", "late 1")
+    server.notify("late2", "late 2")
+    settle()
+    assert len(container.notifications) == MAX_VISIBLE_NOTIFICATIONS
+    assert shown(container)[-2:] == ["late 1", "late 2"]
+    assert {"from app3", "from app4"} <= {n["summary"] for n in history._store.notes()}
+
+
+def test_one_history_write_per_batch(container, history):
+    server = container._server
+    for i in range(30):
+        server.notify(FLOOD_APPS[i % 3], f"burst {i}")
+    settle()
+
+    assert container.flushes == [30]
+    assert history.writes == [30 - MAX_VISIBLE_NOTIFICATIONS]
+
+
+def test_flood_does_not_stall_the_main_loop(container, history):
+    server = container._server
+    replaceable = {}
+    sent = [0]
+
+    def deliver():
+        # One Notify call per dispatch, as messages come off the bus
+        i = sent[0]
+        app = FLOOD_APPS[i % len(FLOOD_APPS)]
+        if i % 4 == 3 and app in replaceable:
+            server.notify(app, f"{app} {i}", replaces_id=replaceable[app])
+        else:
+            replaceable[app] = server.notify(app, f"{app} {i}")
+        sent[0] += 1
+        return sent[0] < FLOOD_SIZE
+
+    GLib.timeout_add(1, deliver)
+    context = GLib.MainContext.default()
+    stalls = []
+    deadline = time.monotonic() + 30
+    while sent[0] < FLOOD_SIZE or container._batch_src is not None:
+        assert time.monotonic() < deadline, "the flood was never ingested"
+        started = time.perf_counter()
+        dispatched = context.iteration(False)
+        stalls.append((time.perf_counter() - started) * 1000)
+        if not dispatched:
+            time.sleep(0.0005)
+    settle()
+
+    assert max(stalls) < MAX_STALL_MS, f"worst main-loop iteration took {max(stalls):.0f} ms"
+    # Arrivals were coalesced, not ingested one by one
+    assert len(container.flushes) < FLOOD_SIZE / 10
+    assert sum(container.flushes) <= FLOOD_SIZE
+    assert len(history.writes) <= len(container.flushes)
+    assert len(container.notifications) <= MAX_VISIBLE_NOTIFICATIONS
+    assert len({box.notification.id for box in container.notifications}) == len(container.notifications)
+    # Spotify is limited to its newest notification, in popups and history
+    assert sum(n["app_name"] == "Spotify" for n in history._store.notes()) <= 1
@@ -0,0 +1,106 @@
+import json
+
+from services.notification_store import HistoryPager, NotificationStore
+
+PAGE = 20
+
+
+def make_note(i: int) -> dict:
+    return {"id": f"n{i}", "app_name": "app", "summary": f"note {i}", "timestamp": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}"}
+
+
+def make_store(tmp_path, count: int, limit: int = 500) -> NotificationStore:
+    store = NotificationStore(str(tmp_path / "history.jsonl"), limit=limit)
+    store.load()
+    store.add_many([make_note(i) for i in range(count)])
+    return store
+
+
+def test_log_replays_adds_and_deletes(tmp_path):
+    store = make_store(tmp_path, 5)
+    store.remove("n1")
+    store.remove_many(["n3", "missing"])
+
+    replayed = NotificationStore(store.path, limit=500)
+    assert replayed.load() == []
+    assert [note["id"] for note in replayed.notes()] == ["n0", "n2", "n4"]
+
+
+def test_limit_evicts_oldest_on_add_and_load(tmp_path):
+    store = make_store(tmp_path, 3, limit=3)
+    evicted = store.add(make_note(3))
+    assert [note["id"] for note in evicted] == ["n0"]
+
+    smaller = NotificationStore(store.path, limit=2)
+    assert [note["id"] for note in smaller.load()] == ["n1"]
+    assert [note["id"] for note in smaller.notes()] == ["n2", "n3"]
+
+
+def test_torn_final_line_is_skipped(tmp_path):
+    store = make_store(tmp_path, 2)
+    with open(store.path, "a") as f:
+        f.write(json.dumps({"op": "add", "note": make_note(9)})[:10])
+
+    replayed = NotificationStore(store.path, limit=500)
+    replayed.load()
+    assert [note["id"] for note in replayed.notes()] == ["n0", "n1"]
+
+
+def test_pager_hands_out_newest_first():
+    pager = HistoryPager(PAGE)
+    pager.reset([make_note(i) for i in range(45)])
+
+    assert [note["id"] for note in pager.next_page()] == [f"n{i}" for i in range(44, 24, -1)]
+    assert len(pager) == 25
+    assert len(pager.next_page()) == PAGE
+    assert [note["id"] for note in pager.next_page()] == [f"n{i}" for i in range(4, -1, -1)]
+    assert pager.next_page() == []
+    assert not pager.needs_page(built=0)
+
+
+def test_deleting_the_visible_page_loads_older_history(tmp_path):
+    """A history larger than one page stays reachable after the shown entries are deleted."""
+    store = make_store(tmp_path, 2 * PAGE + 5)
+    pager = HistoryPager(PAGE)
+    pager.reset(store.notes())
+    built = pager.next_page()
+    assert not pager.needs_page(len(built))
+
+    # Delete every visible entry, as the close buttons would
+    for note in built:
+        store.remove(note["id"])
+    built = []
+
+    shown = []
+    while pager.needs_page(len(built)):
+        page = pager.next_page()
+        built.extend(page)
+        shown.extend(note["id"] for note in page)
+        # Clear each page again, leaving nothing to scroll
+        for note in page:
+            store.remove(note["id"])
+        built = []
+
+    assert shown == [f"n{i}" for i in range(PAGE + 4, -1, -1)]
+    assert len(store) == 0
+
+
+def test_underfilled_viewport_requests_another_page():
+    pager = HistoryPager(PAGE)
+    pager.reset([make_note(i) for i in range(3 * PAGE)])
+    built = pager.next_page()
+
+    assert not pager.needs_page(len(built), viewport_filled=True)
+    # Short entries on a tall panel: a full page still doesn't scroll
+    assert pager.needs_page(len(built), viewport_filled=False)
+
+
+def test_pager_discard_returns_dropped_notes():
+    pager = HistoryPager(PAGE)
+    notes = [make_note(i) for i in range(4)]
+    notes[1]["app_name"] = notes[3]["app_name"] = "Spotify"
+    pager.reset(notes)
+
+    dropped = pager.discard(lambda note: note["app_name"] == "Spotify")
+    assert [note["id"] for note in dropped] == ["n1", "n3"]
+    assert [note["id"] for note in pager] == ["n0", "n2"]
@@ -0,0 +1,198 @@
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from gi.repository import GLib
+
+import utils.weather
+from services import weather
+from services.weather import DEFAULT_REFRESH_S, LOCATION_TTL_S, WeatherService
+
+LAST_MODIFIED = "Mon, 19 Oct 2026 09:00:00 GMT"
+
+
+def forecast_payload(temp: float) -> dict:
+    return {
+        "properties": {
+            "timeseries": [
+                {
+                    "time": "2026-10-19T10:00:00Z",
+                    "data": {
+                        "instant": {"details": {"air_temperature": temp}},
+                        "next_1_hours": {"summary": {"symbol_code": "cloudy"}},
+                        "next_6_hours": {"summary": {"symbol_code": "rain"}},
+                    },
+                },
+                {
+                    "time": "2026-10-19T11:00:00Z",
+                    "data": {"instant": {"details": {"air_temperature": temp + 1}}},
+                },
+            ]
+        }
+    }
+
+
+class MetNo:
+    """What the local met.no stand-in answers, and the requests it got."""
+
+    def __init__(self):
+        self.status = 200
+        self.expires = None
+        self.payload = forecast_payload(12.5)
+        self.requests = []
+
+
+@pytest.fixture
+def met(tmp_path, monkeypatch):
+    state = MetNo()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state.requests.append((self.path, dict(self.headers)))
+            self.send_response(state.status)
+            if state.expires is not None:
+                self.send_header("Expires", formatdate(state.expires, usegmt=True))
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            body = json.dumps(state.payload).encode() if state.status == 200 else b""
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    # The module-level value AX_SHELL_MET_URL is read into
+    monkeypatch.setattr(utils.weather, "_MET_NO_URL", f"http://127.0.0.1:{server.server_port}/compact")
+    monkeypatch.setattr(weather, "LOCATION_CACHE_FILE", str(tmp_path / "location.json"))
+    monkeypatch.setattr(weather, "FORECAST_CACHE_FILE", str(tmp_path / "forecast.json"))
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Refreshes are driven by hand
+    monkeypatch.setattr(WeatherService, "refresh", lambda self: False)
+    return WeatherService()
+
+
+def test_no_request_before_expires(met, service):
+    now = time.time()
+    met.expires = now + 3600
+
+    columns, expires = service._fetch_forecast(59.9, 10.75, now)
+    assert columns["current_temp"] == 12.5
+    assert columns["current_code"] == "cloudy"
+    assert columns["codes"] == ["rain", None]
+    assert expires == pytest.approx(met.expires, abs=1)
+    path, headers = met.requests[0]
+    assert path == "/compact?lat=59.9000&lon=10.7500"
+    assert headers["User-Agent"].startswith("Ax-Shell/")
+
+    # A restart within the expiry window reads the disk cache only
+    columns, _ = WeatherService()._fetch_forecast(59.9, 10.75, now + 600)
+    assert columns["current_temp"] == 12.5
+    assert len(met.requests) == 1
+
+
+def test_expired_forecast_is_revalidated(met, service):
+    now = time.time()
+    met.expires = now + 60
+    service._fetch_forecast(59.9, 10.75, now)
+
+    met.status = 304
+    met.expires = now + 7200
+    columns, expires = service._fetch_forecast(59.9, 10.75, now + 120)
+    assert met.requests[1][1]["If-Modified-Since"] == LAST_MODIFIED
+    assert columns["current_temp"] == 12.5
+    assert expires == pytest.approx(now + 7200, abs=1)
+
+    # The new expiry was stored with the cached forecast
+    service._fetch_forecast(59.9, 10.75, now + 3600)
+    assert len(met.requests) == 2
+
+
+def test_modified_forecast_replaces_the_cache(met, service):
+    now = time.time()
+    met.expires = now + 60
+    service._fetch_forecast(59.9, 10.75, now)
+
+    met.payload = forecast_payload(3.0)
+    columns, _ = service._fetch_forecast(59.9, 10.75, now + 120)
+    assert columns["temps"] == [3.0, 4.0]
+
+
+def test_missing_expires_and_errors(met, service):
+    now = time.time()
+    _, expires = service._fetch_forecast(59.9, 10.75, now)
+    assert expires == pytest.approx(now + DEFAULT_REFRESH_S)
+
+    # Another location doesn't reuse this forecast, and errors raise
+    met.status = 500
+    with pytest.raises(RuntimeError, match="500"):
+        service._fetch_forecast(40.0, -3.7, now)
+
+
+def test_location_is_cached_for_its_ttl(met, service, monkeypatch):
+    monkeypatch.delenv("AX_SHELL_LAT", raising=False)
+    monkeypatch.delenv("AX_SHELL_LON", raising=False)
+    lookups = []
+
+    def lookup(_session):
+        lookups.append(1)
+        return 59.9, 10.75, "Oslo"
+
+    monkeypatch.setattr(utils.weather.WeatherUtils, "lookup_ip_coordinates", staticmethod(lookup))
+    now = time.time()
+
+    assert service._locate(now) == (59.9, 10.75, "Oslo")
+    assert service._locate(now + 60) == (59.9, 10.75, "Oslo")
+    # After a restart the location comes from disk
+    assert WeatherService()._locate(now + 120) == (59.9, 10.75, "Oslo")
+    assert len(lookups) == 1
+
+    assert service._locate(now + LOCATION_TTL_S + 1) == (59.9, 10.75, "Oslo")
+    assert len(lookups) == 2
+
+
+def test_fallback_location_is_not_cached(met, service, monkeypatch):
+    monkeypatch.delenv("AX_SHELL_LAT", raising=False)
+    monkeypatch.delenv("AX_SHELL_LON", raising=False)
+    lookups = []
+    monkeypatch.setattr(
+        utils.weather.WeatherUtils, "lookup_ip_coordinates", staticmethod(lambda _s: lookups.append(1))
+    )
+    now = time.time()
+
+    assert service._locate(now) == utils.weather.FALLBACK_COORDINATES
+    service._locate(now + 60)
+    assert len(lookups) == 2
+
+
+def test_refresh_publishes_and_schedules_the_next_one(met, monkeypatch):
+    monkeypatch.setenv("AX_SHELL_LAT", "59.9")
+    monkeypatch.setenv("AX_SHELL_LON", "10.75")
+    monkeypatch.setenv("AX_SHELL_CITY", "Oslo")
+    met.expires = time.time() + 3600
+    service = WeatherService()
+
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + 10
+    while service.data is None:
+        assert time.monotonic() < deadline, "no forecast published"
+        context.iteration(False)
+        time.sleep(0.01)
+
+    assert service.error is None
+    assert (service.data.city, service.data.current_temp) == ("Oslo", 12.5)
+    assert service._timer_id
+    GLib.source_remove(service._timer_id)
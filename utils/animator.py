@@ -1,7 +1,102 @@
+from functools import lru_cache
 from typing import cast
 
 from fabric import Property, Service, Signal
-from gi.repository import GLib, Gtk
+from gi.repository import Gdk, GLib, Gtk
+
+# Samples per easing table; linear interpolation between them is off by < 1e-4
+EASING_TABLE_SIZE = 256
+# Tick interval for animators without a realized tick widget
+FALLBACK_INTERVAL_MS = 16
+
+
+@lru_cache(maxsize=32)
+def easing_table(y1: float, y2: float) -> tuple[float, ...]:
+    """
+    y(t) of a cubic Bézier from (0, 0) to (1, 1) sampled over [0, 1]. Only
+    the control points' y coordinates are used, so every curve sharing them
+    shares one table.
+    """
+    table = []
+    for i in range(EASING_TABLE_SIZE + 1):
+        t = i / EASING_TABLE_SIZE
+        u = 1 - t
+        table.append(3 * u * u * t * y1 + 3 * u * t * t * y2 + t * t * t)
+    return tuple(table)
+
+
+class AnimationDriver:
+    """
+    Ticks every playing Animator, batched into one callback per frame clock.
+
+    Animators whose tick widget is realized follow its window's frame
+    clock, the rest share a single fallback timer. A clock is only
+    followed while it has playing animators, so nothing runs when no
+    animation is active.
+    """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        if AnimationDriver.instance is None:
+            AnimationDriver.instance = AnimationDriver()
+        return AnimationDriver.instance
+
+    def __init__(self):
+        # frame clock (None for the fallback timer) -> animators, in start order
+        self._groups: dict[Gdk.FrameClock | None, list["Animator"]] = {}
+        self._handlers: dict[Gdk.FrameClock | None, int] = {}
+
+    def add(self, animator: "Animator"):
+        widget = animator._tick_widget
+        clock = widget.get_frame_clock() if widget else None
+        group = self._groups.get(clock)
+        if group is None:
+            group = self._groups[clock] = []
+            self._start(clock)
+        if animator not in group:
+            group.append(animator)
+        animator._driver_clock = clock
+
+    def remove(self, animator: "Animator"):
+        clock = animator._driver_clock
+        group = self._groups.get(clock)
+        if group is None or animator not in group:
+            return
+        group.remove(animator)
+        if not group:
+            del self._groups[clock]
+            self._stop(clock)
+
+    def _start(self, clock: Gdk.FrameClock | None):
+        if clock is None:
+            self._handlers[None] = GLib.timeout_add(FALLBACK_INTERVAL_MS, self._on_timeout)
+        else:
+            self._handlers[clock] = clock.connect("update", self._on_update)
+            clock.begin_updating()
+
+    def _stop(self, clock: Gdk.FrameClock | None):
+        handler = self._handlers.pop(clock)
+        if clock is None:
+            GLib.source_remove(handler)
+        else:
+            clock.disconnect(handler)
+            clock.end_updating()
+
+    def _tick(self, clock: Gdk.FrameClock | None, now: float):
+        # Copied, as finishing animators leave the group mid-iteration
+        for animator in tuple(self._groups.get(clock, ())):
+            animator.do_update_value(now)
+
+    def _on_update(self, clock: Gdk.FrameClock):
+        # Frame time is on the same monotonic clock as do_get_time_now
+        self._tick(clock, clock.get_frame_time() / 1_000_000)
+
+    def _on_timeout(self):
+        self._tick(None, GLib.get_monotonic_time() / 1_000_000)
+        # Returning True after _stop removed this source is harmless
+        return True
 
 
 class Animator(Service):
@@ -15,6 +110,7 @@ class Animator(Service):
     @bezier_curve.setter
     def bezier_curve(self, value: tuple[float, float, float, float]):
         self._bezier_curve = value
+        self._easing = easing_table(value[1], value[3])
         return
 
     @Property(float, "read-write")
@@ -74,6 +170,7 @@ class Animator(Service):
     ):
         super().__init__(**kwargs)
         self._bezier_curve = (1, 0, 1, 1)
+        self._easing = easing_table(0, 1)
         self._duration = 5
         self._value = 0.0
         self._min_value = 0.0
@@ -89,9 +186,9 @@ class Animator(Service):
 
         self.playing = False
         self._start_time = None
-        self._tick_handler = None
         self._timeline_pos = 0
         self._tick_widget = tick_widget
+        self._driver_clock = None
 
     def do_get_time_now(self):
         return GLib.get_monotonic_time() / 1_000_000
@@ -100,13 +197,12 @@ class Animator(Service):
         return start + (end - start) * time
 
     def do_interpolate_cubic_bezier(self, time: float) -> float:
-        y_points = (0, self.bezier_curve[1], self.bezier_curve[3], 1)
-        return (
-            (1 - time) ** 3 * y_points[0]
-            + 3 * (1 - time) ** 2 * time * y_points[1]
-            + 3 * (1 - time) * time**2 * y_points[2]
-            + time**3 * y_points[3]
-        )
+        position = time * EASING_TABLE_SIZE
+        index = int(position)
+        if index >= EASING_TABLE_SIZE:
+            return self._easing[-1]
+        start = self._easing[index]
+        return start + (self._easing[index + 1] - start) * (position - index)
 
     def do_ease(self, time: float) -> float:
         return self.do_lerp(
@@ -117,7 +213,8 @@ class Animator(Service):
         if not self.playing:
             return
 
-        elapsed_time = delta_time - cast(float, self._start_time)
+        # The frame being drawn can predate play() by a few milliseconds
+        elapsed_time = max(0.0, delta_time - cast(float, self._start_time))
 
         self._timeline_pos = min(1, elapsed_time / self.duration)
 
@@ -142,12 +239,7 @@ class Animator(Service):
         return True
 
     def do_remove_tick_handlers(self):
-        if self._tick_handler:
-            if self._tick_widget:
-                self._tick_widget.remove_tick_callback(self._tick_handler)
-            else:
-                GLib.source_remove(self._tick_handler)
-        self._tick_handler = None
+        AnimationDriver.get_initial().remove(self)
         return
 
     def play(self):
@@ -155,14 +247,7 @@ class Animator(Service):
             return
 
         self._start_time = self.do_get_time_now()
-
-        if not self._tick_handler:
-            if self._tick_widget:
-                self._tick_handler = self._tick_widget.add_tick_callback(
-                    self.do_handle_tick
-                )
-            else:
-                self._tick_handler = GLib.timeout_add(16, self.do_handle_tick)
+        AnimationDriver.get_initial().add(self)
 
         self.playing = True
         return
@@ -172,8 +257,6 @@ class Animator(Service):
         return self.do_remove_tick_handlers()
 
     def stop(self):
-        if not self._tick_handler:
-            self._timeline_pos = 0
-            self.playing = False
-            return
+        self._timeline_pos = 0
+        self.playing = False
         return self.do_remove_tick_handlers()
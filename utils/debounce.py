@@ -1,16 +1,27 @@
+import time
+
 from gi.repository import GLib
 
 class DebouncedSetter:
-    def __init__(self, delay_ms: int, do_set):
+    def __init__(self, delay_ms: int, do_set, max_wait_ms: int = None):
         """
-        delay_ms: idle time before we actually write
-        do_set:   function(percent:int) that performs the write action (e.g., brightness.set_percent)
+        delay_ms:    idle time before we actually write
+        do_set:      function(percent:int) that performs the write action (e.g., brightness.set_percent)
+        max_wait_ms: if set, a write happens at least this often while values keep coming,
+                     turning the debounce into a throttle (e.g. one write per frame during a drag)
         """
         self.delay_ms = delay_ms
+        self.max_wait_ms = max_wait_ms
         self._src = None
         self._pending = None
+        self._first_push_ms = None
         self._do_set = do_set
 
+    @property
+    def pending(self):
+        """The value waiting to be written, or None."""
+        return self._pending
+
     def _cancel(self):
         if self._src is not None:
             GLib.source_remove(self._src)
@@ -19,8 +30,14 @@ class DebouncedSetter:
     def push(self, value: int):
         """Schedule a write action for the latest value, restarting the timer."""
         self._pending = int(max(0, min(100, value)))
+        now_ms = time.monotonic() * 1000
+        if self._first_push_ms is None:
+            self._first_push_ms = now_ms
+        delay = self.delay_ms
+        if self.max_wait_ms is not None:
+            delay = max(0, min(delay, int(self._first_push_ms + self.max_wait_ms - now_ms)))
         self._cancel()
-        self._src = GLib.timeout_add(self.delay_ms, self._fire)
+        self._src = GLib.timeout_add(delay, self._fire)
 
     def flush_now(self):
         """Immediately perform the latest pending write action (if any)."""
@@ -28,9 +45,10 @@ class DebouncedSetter:
         return self._fire()
 
     def _fire(self):
+        self._src = None
+        self._first_push_ms = None
         if self._pending is not None:
             v = self._pending
             self._pending = None
-            self._src = None
             self._do_set(v)
         return False
@@ -0,0 +1,61 @@
+import cairo
+import gi
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+
+class _DragSurfaces:
+    """Rendered drag icons of one widget, one per (state flags, scale factor)."""
+
+    def __init__(self, widget: Gtk.Widget):
+        self.surfaces = {}
+        self.state = widget.get_state_flags()
+        # A new allocation also follows content changes (label text, children)
+        widget.connect("size-allocate", lambda *_: self.surfaces.clear())
+        widget.connect("style-updated", self._on_style_updated)
+
+    def _on_style_updated(self, widget: Gtk.Widget):
+        # Hover/press restyles are covered by the state in the key; anything
+        # else (theme or CSS reload, style class change) invalidates
+        state = widget.get_state_flags()
+        if state == self.state:
+            self.surfaces.clear()
+        self.state = state
+
+
+# Credit to Aylur for the original createSurfaceFromWidget code
+def create_surface_from_widget(widget: Gtk.Widget) -> cairo.ImageSurface:
+    """
+    Render `widget` into a transparent surface for use as a drag icon.
+
+    The surface is drawn at the widget's scale factor so it stays sharp on
+    HiDPI outputs, and is reused by later drags until the widget is
+    reallocated or restyled.
+    """
+    cache = getattr(widget, "_drag_surfaces", None)
+    if cache is None:
+        cache = widget._drag_surfaces = _DragSurfaces(widget)
+
+    scale = widget.get_scale_factor()
+    key = (widget.get_state_flags(), scale)
+    surface = cache.surfaces.get(key)
+    if surface is not None:
+        return surface
+
+    alloc = widget.get_allocation()
+    surface = cairo.ImageSurface(
+        cairo.Format.ARGB32,
+        max(1, alloc.width * scale),
+        max(1, alloc.height * scale),
+    )
+    surface.set_device_scale(scale, scale)
+    # New image surfaces start fully transparent, no need to clear them
+    cr = cairo.Context(surface)
+    widget.draw(cr)
+    cache.surfaces[key] = surface
+    return surface
+
+
+def set_drag_icon(context, widget: Gtk.Widget):
+    Gtk.drag_set_icon_surface(context, create_surface_from_widget(widget))
@@ -0,0 +1,110 @@
+"""
+Forecast widget model: met.no columns grouped into days and time periods.
+
+Kept free of fabric and GTK so it can be tested and benchmarked on its own
+(tests/test_forecast.py, tests/bench_forecast.py).
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.weather import WeatherData, WeatherUtils
+
+
+def get_time_period_name(hour, is_today=False, current_hour=0):
+    """Get the closest time period based on hour"""
+    # If it's today and after 18:00, use hourly periods
+    if is_today and current_hour >= 18:
+        return f"{hour:02d}:00"
+
+    # Map to the closest specific time period for regular periods
+    if hour < 3:
+        return "00:00"
+    elif hour < 9:
+        return "06:00"
+    elif hour < 15:
+        return "12:00"
+    elif hour < 21:
+        return "18:00"
+    else:
+        return "00:00"
+
+
+# Regular period label hour for every hour of the day (21:00 and later fold into 00:00)
+PERIOD_OF_HOUR = np.array([int(get_time_period_name(hour)[:2]) for hour in range(24)])
+REGULAR_PERIODS = (0, 6, 12, 18)
+FORECAST_DAYS = 7
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def build_forecast_model(weather: WeatherData, now: datetime):
+    """Group the forecast into [(date, {period: {'temp', 'emoji'}})] for the next 7 days."""
+    today = now.date()
+    current_hour = now.hour
+    if not weather.times:
+        return []
+
+    # Columns: times are bucketed by their UTC date and hour, as met.no sends them
+    times = np.asarray(weather.times, dtype=np.int64)
+    temps = np.trunc(np.asarray(weather.temps, dtype=float))  # None -> nan
+    # Code index 0 stands for "no symbol"
+    code_ids = {None: 0}
+    code_index = np.fromiter(
+        (code_ids.setdefault(code or None, len(code_ids)) for code in weather.codes),
+        dtype=np.int64,
+        count=len(weather.codes),
+    )
+    code_names = list(code_ids)
+    days = times // 86400 - (today.toordinal() - EPOCH_ORDINAL)
+    hours = (times % 86400) // 3600
+    is_today = days == 0
+
+    keep = (days >= 0) & (days < FORECAST_DAYS)
+    if current_hour >= 18:
+        # After 18:00, today shows the next 4 hours (excluding 00:00)
+        today_hours = tuple(range(current_hour + 1, min(current_hour + 4, 23) + 1))
+        periods = np.where(is_today, hours, PERIOD_OF_HOUR[hours])
+        keep &= ~is_today | ((hours > current_hour) & (hours <= current_hour + 4))
+    else:
+        # Before 18:00, today only shows the regular periods still ahead
+        today_hours = REGULAR_PERIODS
+        periods = PERIOD_OF_HOUR[hours]
+        keep &= ~is_today | (periods >= current_hour)
+
+    # One bin per (day, period hour)
+    bins = (days * 24 + periods)[keep]
+    temps = temps[keep]
+    code_index = code_index[keep]
+    n_bins = FORECAST_DAYS * 24
+
+    has_temp = ~np.isnan(temps)
+    temp_count = np.bincount(bins[has_temp], minlength=n_bins)
+    temp_sum = np.bincount(bins[has_temp], weights=temps[has_temp], minlength=n_bins)
+
+    n_codes = len(code_names)
+    code_counts = np.bincount(bins * n_codes + code_index, minlength=n_bins * n_codes)
+    code_counts = code_counts.reshape(n_bins, n_codes)[:, 1:]
+    if n_codes > 1:
+        # Most common code per bin, ties going to the one seen first
+        best_code = code_counts.argmax(axis=1) + 1
+        any_code = code_counts.any(axis=1)
+    else:
+        best_code = np.zeros(n_bins, dtype=np.int64)
+        any_code = np.zeros(n_bins, dtype=bool)
+
+    model = []
+    for day in range(FORECAST_DAYS):
+        periods_data = {}
+        for hour in today_hours if day == 0 else REGULAR_PERIODS:
+            b = day * 24 + hour
+            if not temp_count[b]:
+                continue
+            # Average of the whole-degree temperatures, as before
+            periods_data[f"{hour:02d}:00"] = {
+                'temp': int(temp_sum[b] / temp_count[b]),
+                'emoji': WeatherUtils.get_weather_emoji(code_names[best_code[b]]) if any_code[b] else "🌡️",
+            }
+        if periods_data:
+            model.append((today + timedelta(days=day), periods_data))
+    return model
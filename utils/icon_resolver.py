@@ -1,11 +1,13 @@
 import json
 import os
 import re
+import time
+from collections import OrderedDict
 
 import gi
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import GLib, Gtk
+from gi.repository import Gdk, GdkPixbuf, GLib, Gtk
 from config.loguru_config import logger
 
 logger = logger.bind(name="Icon Resolver", type="Utils")
@@ -16,75 +18,294 @@ ICON_CACHE_FILE = data.CACHE_DIR + "/icons.json"
 if not os.path.exists(data.CACHE_DIR):
     os.makedirs(data.CACHE_DIR)
 
+# Resolved names are written to disk in batches after this idle period
+CACHE_SAVE_DELAY_S = 2
+# How often a miss may re-stat the applications dirs to see if anything was installed
+INDEX_CHECK_INTERVAL_S = 10
+PIXBUF_CACHE_SIZE = 256
+# Ready-to-show app icons, already scaled to the size a widget asked for
+APP_PIXBUF_CACHE_SIZE = 128
+
+
+def _applications_dirs():
+    dirs = [GLib.get_user_data_dir(), *GLib.get_system_data_dirs()]
+    return [os.path.join(d, "applications") for d in dirs]
+
+
+def _dirs_signature(dirs) -> list:
+    signature = []
+    for d in dirs:
+        try:
+            signature.append([d, os.stat(d).st_mtime_ns])
+        except OSError:
+            signature.append([d, None])
+    return signature
+
+
+def _parse_desktop_file(path: str):
+    """Return (Icon, StartupWMClass) from the [Desktop Entry] section."""
+    icon = None
+    wm_class = None
+    in_entry = False
+    try:
+        with open(path, errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    if in_entry:
+                        break
+                    in_entry = line == "[Desktop Entry]"
+                    continue
+                if not in_entry:
+                    continue
+                if line.startswith("Icon=") and icon is None:
+                    icon = "".join(line[5:].split())
+                elif line.startswith("StartupWMClass=") and wm_class is None:
+                    wm_class = line[len("StartupWMClass="):].strip()
+    except OSError:
+        pass
+    return icon, wm_class
+
+
+class _DesktopIndex:
+    """Lookup table of .desktop files keyed by StartupWMClass and basename."""
+
+    def __init__(self):
+        self.built_signature = None
+        self.files = []  # (basename without .desktop, path, icon), in XDG precedence
+        self.by_key = {}
+        self._signature = None
+        self._last_check = 0.0
+
+    def current_signature(self) -> list:
+        """mtimes of the applications dirs, re-stat'ed at most every few seconds."""
+        now = time.monotonic()
+        if self._signature is None or now - self._last_check >= INDEX_CHECK_INTERVAL_S:
+            self._last_check = now
+            self._signature = _dirs_signature(_applications_dirs())
+        return self._signature
+
+    def ensure_built(self):
+        signature = self.current_signature()
+        if signature != self.built_signature:
+            self._build(_applications_dirs())
+            self.built_signature = signature
+
+    def _build(self, dirs):
+        files = []
+        by_key = {}
+        seen = set()
+        for data_dir in dirs:
+            if not os.path.isdir(data_dir):
+                continue
+            for name in sorted(os.listdir(data_dir)):
+                if not name.endswith(".desktop") or name in seen:
+                    continue
+                seen.add(name)
+                path = os.path.join(data_dir, name)
+                icon, wm_class = _parse_desktop_file(path)
+                base = name[: -len(".desktop")].lower()
+                files.append((base, path, icon))
+                keys = [base, base.rsplit(".", 1)[-1]]
+                if wm_class:
+                    keys.insert(0, wm_class.lower())
+                for key in keys:
+                    by_key.setdefault(key, (path, icon))
+        self.files = files
+        self.by_key = by_key
+        logger.debug(f"Indexed {len(files)} desktop files")
+
+    def find(self, app_id: str):
+        """Return (path, icon) for `app_id`, or None."""
+        self.ensure_built()
+        normalized = "".join(app_id.lower().split())
+        hit = self.by_key.get(normalized)
+        if hit:
+            return hit
+        # Same fuzzy fallback as before, but over the in-memory index
+        for base, path, icon in self.files:
+            if normalized in base:
+                return path, icon
+        for word in filter(None, re.split(r"-|\.|_|\s", app_id)):
+            word = word.lower()
+            for base, path, icon in self.files:
+                if word in base:
+                    return path, icon
+        return None
+
 
 class IconResolver:
+    """
+    Resolves app ids to themed icons. All instances share one name cache,
+    one .desktop index, one pixbuf cache and one LRU of app icons scaled
+    for display, so the dock, notch and overview load each icon once.
+    """
+
+    _icon_dict = None
+    # app_id -> index signature at the time the lookup failed
+    _misses = {}
+    _index = _DesktopIndex()
+    _pixbufs = {}
+    # (app_id, size, scale) -> scaled pixbuf or None, least recently used first
+    _app_pixbufs = OrderedDict()
+    _save_src = None
+    _theme_handler = None
+
     def __init__(self, default_applicaiton_icon: str = "application-x-executable-symbolic"):
-        if os.path.exists(ICON_CACHE_FILE):
-            with open(ICON_CACHE_FILE) as f:
-                try:
-                    self._icon_dict = json.load(f)
-                except json.JSONDecodeError:
-                    logger.warning("Cache file does not exist or is corrupted")
-                    self._icon_dict = {}
-        else:
-            self._icon_dict = {}
+        if IconResolver._icon_dict is None:
+            IconResolver._load_cache()
+        if IconResolver._theme_handler is None:
+            IconResolver._theme_handler = Gtk.IconTheme.get_default().connect(
+                "changed", IconResolver._on_theme_changed
+            )
 
         self.default_applicaiton_icon = default_applicaiton_icon
 
+    @staticmethod
+    def _on_theme_changed(*_):
+        IconResolver._pixbufs.clear()
+        IconResolver._app_pixbufs.clear()
+
+    @staticmethod
+    def _load_cache():
+        IconResolver._icon_dict = {}
+        if not os.path.exists(ICON_CACHE_FILE):
+            return
+        with open(ICON_CACHE_FILE) as f:
+            try:
+                cache = json.load(f)
+            except json.JSONDecodeError:
+                logger.warning("Cache file does not exist or is corrupted")
+                return
+        if isinstance(cache, dict) and "icons" in cache:
+            IconResolver._icon_dict = cache.get("icons", {})
+            IconResolver._misses = cache.get("misses", {})
+        elif isinstance(cache, dict):
+            # Older flat {app_id: icon} format
+            IconResolver._icon_dict = cache
+
     def get_icon_name(self, app_id: str):
         if app_id in self._icon_dict:
             return self._icon_dict[app_id]
+
+        # A known miss is only retried once an applications dir has changed
+        signature = IconResolver._index.current_signature()
+        if self._misses.get(app_id) == signature:
+            return self.default_applicaiton_icon
+
         new_icon = self._compositor_find_icon(app_id)
+        if new_icon is None:
+            logger.debug(f"No icon found for app id: '{app_id}', remembering miss")
+            self._misses[app_id] = signature
+            self._schedule_save()
+            return self.default_applicaiton_icon
+
         logger.debug(f"Found new icon: '{new_icon}' for app id: '{app_id}', storing...")
         self._store_new_icon(app_id, new_icon)
         return new_icon
 
-    def get_icon_pixbuf(self, app_id: str, size: int = 16):
-        icon_theme = Gtk.IconTheme.get_default()
+    def get_icon_pixbuf(self, app_id: str, size: int = 16, scale: int = 1):
         icon_name = self.get_icon_name(app_id)
-        try:
-            # Try to load the resolved icon.
-            return icon_theme.load_icon(icon_name, size, Gtk.IconLookupFlags.FORCE_SIZE)
-        except GLib.Error as primary_error:
-            logger.warning(f"Icon '{icon_name}' not found in theme: {primary_error}")
+        key = (icon_name, size, scale)
+        if key in self._pixbufs:
+            return self._pixbufs[key]
+
+        pixbuf = self._load_icon(icon_name, size, scale)
+        if pixbuf is None and icon_name != self.default_applicaiton_icon:
+            # Fallback to the default application icon.
+            pixbuf = self._load_icon(self.default_applicaiton_icon, size, scale)
+        if pixbuf is not None:
+            if len(self._pixbufs) >= PIXBUF_CACHE_SIZE:
+                self._pixbufs.pop(next(iter(self._pixbufs)))
+            self._pixbufs[key] = pixbuf
+        return pixbuf
+
+    def get_app_pixbuf(self, app_id: str, size: int, scale: int = 1, desktop_app=None):
+        """
+        Icon for a window or app, exactly `size * scale` pixels square.
+
+        Tries the DesktopApp's own icon first, then the resolved theme icon,
+        then "image-missing". Results (including failures) are kept in a
+        shared LRU keyed by (app_id, size, scale).
+        """
+        key = (app_id, size, scale)
+        cache = IconResolver._app_pixbufs
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        pixels = size * scale
+        pixbuf = None
+        if desktop_app:
             try:
-                # Fallback to the default application icon.
-                return icon_theme.load_icon(
-                    self.default_applicaiton_icon, size, Gtk.IconLookupFlags.FORCE_SIZE
-                )
-            except GLib.Error as fallback_error:
-                logger.error(
-                    f"Fallback icon '{self.default_applicaiton_icon}' also not found: {fallback_error}"
+                pixbuf = desktop_app.get_icon_pixbuf(size=pixels)
+            except Exception as e:
+                logger.warning(f"Unable to load desktop icon for '{app_id}': {e}")
+        if not pixbuf:
+            pixbuf = self.get_icon_pixbuf(app_id, size, scale)
+        if not pixbuf:
+            pixbuf = self._load_icon("image-missing", size, scale)
+        if pixbuf and (pixbuf.get_width() != pixels or pixbuf.get_height() != pixels):
+            pixbuf = pixbuf.scale_simple(pixels, pixels, GdkPixbuf.InterpType.BILINEAR)
+
+        cache[key] = pixbuf
+        if len(cache) > APP_PIXBUF_CACHE_SIZE:
+            cache.popitem(last=False)
+        return pixbuf
+
+    def get_app_surface(self, app_id: str, size: int, scale: int = 1, desktop_app=None):
+        """
+        `get_app_pixbuf` as a cairo surface with a device scale of `scale`,
+        so an image showing it is `size` logical pixels on a HiDPI output
+        rather than `size * scale`. Pass the widget's `get_scale_factor()`.
+        """
+        pixbuf = self.get_app_pixbuf(app_id, size, scale, desktop_app)
+        if pixbuf is None:
+            return None
+        return Gdk.cairo_surface_create_from_pixbuf(pixbuf, scale, None)
+
+    def _load_icon(self, icon_name: str, size: int, scale: int):
+        icon_theme = Gtk.IconTheme.get_default()
+        try:
+            if scale > 1:
+                return icon_theme.load_icon_for_scale(
+                    icon_name, size, scale, Gtk.IconLookupFlags.FORCE_SIZE
                 )
-                return None
+            return icon_theme.load_icon(icon_name, size, Gtk.IconLookupFlags.FORCE_SIZE)
+        except GLib.Error as e:
+            log = logger.error if icon_name == self.default_applicaiton_icon else logger.warning
+            log(f"Icon '{icon_name}' not found in theme: {e}")
+            return None
 
     def _store_new_icon(self, app_id: str, icon: str):
         self._icon_dict[app_id] = icon
-        with open(ICON_CACHE_FILE, "w") as f:
-            json.dump(self._icon_dict, f)
-
-    def _get_icon_from_desktop_file(self, desktop_file_path: str):
-        # Retrieve the icon specified in the [Desktop Entry] section.
-        with open(desktop_file_path) as f:
-            for line in f.readlines():
-                if "Icon=" in line:
-                    return "".join(line[5:].split())
-            return self.default_applicaiton_icon
+        self._misses.pop(app_id, None)
+        self._schedule_save()
+
+    @staticmethod
+    def _schedule_save():
+        if IconResolver._save_src is None:
+            IconResolver._save_src = GLib.timeout_add_seconds(CACHE_SAVE_DELAY_S, IconResolver._save_cache)
+
+    @staticmethod
+    def _save_cache():
+        IconResolver._save_src = None
+        try:
+            with open(ICON_CACHE_FILE, "w") as f:
+                json.dump(
+                    {
+                        "icons": IconResolver._icon_dict,
+                        "misses": IconResolver._misses,
+                    },
+                    f,
+                )
+        except OSError as e:
+            logger.error(f"Unable to write icon cache: {e}")
+        return False
 
     def _get_desktop_file(self, app_id: str) -> str | None:
-        data_dirs = GLib.get_system_data_dirs()
-        for data_dir in data_dirs:
-            data_dir = os.path.join(data_dir, "applications")
-            if os.path.exists(data_dir):
-                files = os.listdir(data_dir)
-                matching = [s for s in files if "".join(app_id.lower().split()) in s.lower()]
-                if matching:
-                    return os.path.join(data_dir, matching[0])
-                for word in list(filter(None, re.split(r"-|\.|_|\s", app_id))):
-                    matching = [s for s in files if word.lower() in s.lower()]
-                    if matching:
-                        return os.path.join(data_dir, matching[0])
-        return None
+        hit = IconResolver._index.find(app_id)
+        return hit[0] if hit else None
 
     def _compositor_find_icon(self, app_id: str):
         icon_theme = Gtk.IconTheme.get_default()
@@ -92,9 +313,7 @@ class IconResolver:
             return app_id
         if icon_theme.has_icon(app_id + "-desktop"):
             return app_id + "-desktop"
-        desktop_file = self._get_desktop_file(app_id)
-        return (
-            self._get_icon_from_desktop_file(desktop_file)
-            if desktop_file
-            else self.default_applicaiton_icon
-        )
+        hit = IconResolver._index.find(app_id)
+        if hit is None:
+            return None
+        return hit[1] or self.default_applicaiton_icon
@@ -1,6 +1,8 @@
 import os
 import requests
-from typing import Tuple, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Tuple, Optional
 from config.loguru_config import logger
 
 logger = logger.bind(name="Weather", type="Utils")
@@ -8,6 +10,62 @@ logger = logger.bind(name="Weather", type="Utils")
 _MET_NO_CONTACT = os.getenv("AX_SHELL_CONTACT", "github.com/dxnnv/Ax-Shell")
 _APP_UA = os.getenv("AX_SHELL_UA", f"Ax-Shell/0.1 (+{_MET_NO_CONTACT})")
 
+# Overridable so the client can be pointed at a mirror or a local stand-in
+_MET_NO_URL = os.getenv("AX_SHELL_MET_URL", "https://api.met.no/weatherapi/locationforecast/2.0/compact")
+
+# New York, used when nothing better is known
+FALLBACK_COORDINATES = (40.7128, -74.0060, "Unknown Location")
+
+
+@dataclass
+class WeatherData:
+    """
+    One met.no forecast, reduced to what the widgets show.
+
+    The timeseries is kept as parallel columns: `times` are UTC epoch
+    seconds, `temps` air temperatures in °C and `codes` symbol codes
+    (next 6 hours, else next hour).
+    """
+
+    city: str
+    lat: float
+    lon: float
+    current_temp: Optional[float]
+    # next hour's symbol, else the next 6 hours'
+    current_code: Optional[str]
+    times: List[int]
+    temps: List[Optional[float]]
+    codes: List[Optional[str]]
+
+
+def _symbol(entry_data: dict, *periods: str) -> Optional[str]:
+    for period in periods:
+        summary = (entry_data.get(period) or {}).get("summary")
+        if summary:
+            return summary.get("symbol_code")
+    return None
+
+
+def parse_timeseries(payload: dict) -> dict:
+    """Columns of a locationforecast response, as stored in the disk cache."""
+    timeseries = payload["properties"]["timeseries"]
+    times, temps, codes = [], [], []
+    for entry in timeseries:
+        entry_data = entry["data"]
+        times.append(int(datetime.fromisoformat(entry["time"].replace("Z", "+00:00")).timestamp()))
+        temps.append(((entry_data.get("instant") or {}).get("details") or {}).get("air_temperature"))
+        codes.append(_symbol(entry_data, "next_6_hours", "next_1_hours"))
+
+    current_code = _symbol(timeseries[0]["data"], "next_1_hours", "next_6_hours") if timeseries else None
+    return {
+        "current_temp": temps[0] if temps else None,
+        "current_code": current_code,
+        "times": times,
+        "temps": temps,
+        "codes": codes,
+    }
+
+
 class WeatherUtils:
     """Shared weather helpers: geolocation, UA, emoji/description mapping."""
 
@@ -74,7 +132,7 @@ class WeatherUtils:
         return mapping.get(code, "Unknown conditions")
 
     @staticmethod
-    def _try_ip_provider(session: requests.Session) -> Optional[Tuple[float, float, str]]:
+    def lookup_ip_coordinates(session: requests.Session) -> Optional[Tuple[float, float, str]]:
         """Try providers in order; return (lat, lon, city) or None."""
         headers = {"User-Agent": _APP_UA}
         try:
@@ -90,37 +148,40 @@ class WeatherUtils:
         return None
 
     @staticmethod
-    def get_coordinates(session: Optional[requests.Session] = None) -> Tuple[float, float, str]:
-        """Get coordinates using env/config first, then IP-based geolookup, then fallback."""
-        sess = session or requests.Session()
-
-        # Manual override via env
+    def get_env_coordinates() -> Optional[Tuple[float, float, str]]:
+        """Manual override via AX_SHELL_LAT / AX_SHELL_LON (/ AX_SHELL_CITY)."""
         env_lat = os.getenv("AX_SHELL_LAT")
         env_lon = os.getenv("AX_SHELL_LON")
         env_city = os.getenv("AX_SHELL_CITY")
         if env_lat and env_lon:
             try:
                 lat, lon = float(env_lat), float(env_lon)
-                city = env_city or "Custom Location"
-                logger.debug(f"Using env coordinates: {lat}, {lon} ({city})")
-                return lat, lon, city
-            except Exception:
+                return lat, lon, env_city or "Custom Location"
+            except ValueError:
                 pass
+        return None
+
+    @staticmethod
+    def get_coordinates(session: Optional[requests.Session] = None) -> Tuple[float, float, str]:
+        """Get coordinates using env/config first, then IP-based geolookup, then fallback."""
+        found = WeatherUtils.get_env_coordinates()
+        if found:
+            logger.debug(f"Using env coordinates: {found[0]}, {found[1]} ({found[2]})")
+            return found
 
         # IP provider
-        found = WeatherUtils._try_ip_provider(sess)
+        found = WeatherUtils.lookup_ip_coordinates(session or requests.Session())
         if found:
             return found
 
-        # Fallback coordinates (New York)
-        lat, lon = 40.7128, -74.0060
-        city = "Unknown Location"
+        lat, lon, city = FALLBACK_COORDINATES
         logger.debug(f"Using fallback coordinates: {lat}, {lon}")
         return lat, lon, city
 
     @staticmethod
     def get_met_api_url(lat: float, lon: float) -> str:
-        return f"https://api.met.no/weatherapi/locationforecast/2.0/compact?lat={lat}&lon={lon}"
+        # met.no asks for at most 4 decimals so responses can be shared by caches
+        return f"{_MET_NO_URL}?lat={lat:.4f}&lon={lon:.4f}"
 
     @staticmethod
     def get_user_agent(_app_name: str = "Ax-Shell") -> str:
@@ -7,11 +7,33 @@ from fabric.core.service import Property
 from fabric.widgets.widget import Widget
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gdk, GdkPixbuf, Gtk  # noqa: E402
+from gi.repository import Gdk, GdkPixbuf, GLib, Gtk  # noqa: E402
+
+
+def load_pixbuf_for_size(image_file: str, size: int) -> GdkPixbuf.Pixbuf:
+    """
+    Load `image_file` decoded just large enough for its shorter side to
+    cover `size` pixels, instead of at full resolution.
+    """
+    fmt, width, height = GdkPixbuf.Pixbuf.get_file_info(image_file)
+    if fmt is None or min(width, height) <= size:
+        return GdkPixbuf.Pixbuf.new_from_file(image_file)
+    ratio = size / min(width, height)
+    return GdkPixbuf.Pixbuf.new_from_file_at_scale(
+        image_file,
+        max(size, math.ceil(width * ratio)),
+        max(size, math.ceil(height * ratio)),
+        True,
+    )
 
 
 class CircleImage(Gtk.DrawingArea, Widget):
-    """A widget that displays an image in a circular shape with a 1:1 aspect ratio."""
+    """
+    A widget that displays an image in a circular shape with a 1:1 aspect ratio.
+
+    The circle-masked image is rendered once per (size, scale factor) into a
+    cached surface; draws, including rotated ones, only paint that surface.
+    """
 
     @Property(int, "read-write")
     def angle(self) -> int:
@@ -58,18 +80,33 @@ class CircleImage(Gtk.DrawingArea, Widget):
         self.size = size if size is not None else 100  # Default size if not provided
         self._angle = 0
         self._orig_image: GdkPixbuf.Pixbuf | None = None  # Original image for reprocessing
-        self._image: GdkPixbuf.Pixbuf | None = None
+        # Set when the image came from a file, so it can be reloaded for a new scale factor
+        self._image_file: str | None = None
+        # (size, scale factor) -> circle-masked surface pattern
+        self._patterns: dict[tuple[int, int], cairo.SurfacePattern] = {}
         if image_file:
-            pix = GdkPixbuf.Pixbuf.new_from_file(image_file)
-            self._orig_image = pix
-            self._image = self._process_image(pix)
+            self._load_file(image_file)
         elif pixbuf:
             self._orig_image = pixbuf
-            self._image = self._process_image(pixbuf)
         self.connect("draw", self.on_draw)
+        self.connect("notify::scale-factor", self._on_scale_factor_changed)
+
+    def _load_file(self, image_file: str):
+        self._image_file = image_file
+        self._orig_image = load_pixbuf_for_size(image_file, self.size * self.get_scale_factor())
+        self._patterns.clear()
+
+    def _on_scale_factor_changed(self, *_):
+        # A file decoded for the old scale may be too small for the new one
+        if self._image_file:
+            try:
+                self._load_file(self._image_file)
+            except GLib.Error:
+                pass
+        self.queue_draw()
 
-    def _process_image(self, pixbuf: GdkPixbuf.Pixbuf) -> GdkPixbuf.Pixbuf:
-        """Crop the image to a centered square and scale it to the widget’s size."""
+    def _process_image(self, pixbuf: GdkPixbuf.Pixbuf, size: int) -> GdkPixbuf.Pixbuf:
+        """Crop the image to a centered square and scale it to `size` pixels."""
         width, height = pixbuf.get_width(), pixbuf.get_height()
         if width != height:
             square_size = min(width, height)
@@ -78,41 +115,71 @@ class CircleImage(Gtk.DrawingArea, Widget):
             pixbuf = pixbuf.new_subpixbuf(x_offset, y_offset, square_size, square_size)
         else:
             square_size = width
-        if square_size != self.size:
-            pixbuf = pixbuf.scale_simple(self.size, self.size, GdkPixbuf.InterpType.BILINEAR)
+        if square_size != size:
+            pixbuf = pixbuf.scale_simple(size, size, GdkPixbuf.InterpType.BILINEAR)
         return pixbuf
 
+    def _get_pattern(self, scale: int) -> cairo.SurfacePattern:
+        """The image masked to a circle, rendered at device resolution."""
+        key = (self.size, scale)
+        pattern = self._patterns.get(key)
+        if pattern is not None:
+            return pattern
+
+        pixels = self.size * scale
+        surface = cairo.ImageSurface(cairo.Format.ARGB32, pixels, pixels)
+        surface.set_device_scale(scale, scale)
+        cr = cairo.Context(surface)
+        cr.arc(self.size / 2, self.size / 2, self.size / 2, 0, 2 * math.pi)
+        cr.clip()
+        # Paint the pixbuf 1:1 with device pixels
+        cr.scale(1 / scale, 1 / scale)
+        Gdk.cairo_set_source_pixbuf(cr, self._process_image(self._orig_image, pixels), 0, 0)
+        cr.paint()
+
+        pattern = cairo.SurfacePattern(surface)
+        pattern.set_filter(cairo.Filter.GOOD)
+        self._patterns[key] = pattern
+        return pattern
+
     def on_draw(self, widget: "CircleImage", ctx: cairo.Context):
-        if self._image:
-            ctx.save()
-            # Create a circular clipping path
-            ctx.arc(self.size / 2, self.size / 2, self.size / 2, 0, 2 * math.pi)
-            ctx.clip()
-            # Rotate around the center of the square image
-            ctx.translate(self.size / 2, self.size / 2)
-            ctx.rotate(self._angle * math.pi / 180.0)
-            ctx.translate(-self.size / 2, -self.size / 2)
-            Gdk.cairo_set_source_pixbuf(ctx, self._image, 0, 0)
-            ctx.paint()
-            ctx.restore()
+        if not self._orig_image:
+            return
+        pattern = self._get_pattern(self.get_scale_factor())
+        # Outside the circle the surface is transparent, so a rotated paint
+        # needs no clip: only the pattern's matrix changes with the angle
+        center = self.size / 2
+        theta = self._angle * math.pi / 180.0
+        cos, sin = math.cos(theta), math.sin(theta)
+        # Maps user space to pattern space: a rotation by -angle around the center
+        pattern.set_matrix(cairo.Matrix(
+            cos, -sin, sin, cos,
+            center - (cos + sin) * center,
+            center - (cos - sin) * center,
+        ))
+        ctx.save()
+        ctx.set_source(pattern)
+        ctx.rectangle(0, 0, self.size, self.size)
+        ctx.fill()
+        ctx.restore()
 
     def set_image_from_file(self, new_image_file: str):
         if not new_image_file:
             return
-        pixbuf = GdkPixbuf.Pixbuf.new_from_file(new_image_file)
-        self._orig_image = pixbuf
-        self._image = self._process_image(pixbuf)
+        self._load_file(new_image_file)
         self.queue_draw()
 
     def set_image_from_pixbuf(self, pixbuf: GdkPixbuf.Pixbuf):
         if not pixbuf:
             return
+        self._image_file = None
         self._orig_image = pixbuf
-        self._image = self._process_image(pixbuf)
+        self._patterns.clear()
         self.queue_draw()
 
     def set_image_size(self, size: int):
         self.size = size
-        if self._orig_image:
-            self._image = self._process_image(self._orig_image)
+        if self._image_file:
+            self._load_file(self._image_file)
+        self._patterns.clear()
         self.queue_draw()
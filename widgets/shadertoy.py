@@ -1,3 +1,5 @@
+import hashlib
+import time
 from collections.abc import Iterable
 from enum import Enum
 from typing import Literal, cast, overload
@@ -11,6 +13,10 @@ from fabric.widgets.widget import Widget
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gdk, GdkPixbuf, GLib, Gtk
 
+from config.loguru_config import logger
+
+logger = logger.bind(name="Shadertoy", type="Widget")
+
 
 class ShadertoyUniformType(Enum):
     # TODO: add more types
@@ -23,6 +29,88 @@ class ShadertoyUniformType(Enum):
 class ShadertoyCompileError(Exception): ...
 
 
+# uniforms fed by the widget itself on every frame
+BUILTIN_UNIFORMS = ("iTime", "iFrame", "iTimeDelta", "iFrameRate", "iResolution", "iMouse")
+
+# weight of the newest sample in the frame-time moving average
+FRAME_TIME_SMOOTHING = 0.1
+
+
+# the vertex shader binds its input here so one VAO layout fits every program
+POSITION_LOCATION = 0
+
+QUAD_VERTICES = (-1.0, -1.0, 1.0, -1.0, -1.0, 1.0, 1.0, 1.0)
+
+
+def program_digest(vertex_source: str, fragment_source: str) -> str:
+    return hashlib.sha1(
+        f"{vertex_source}\0{fragment_source}".encode()
+    ).hexdigest()
+
+
+class _CachedProgram:
+    def __init__(self, digest: str, program: int):
+        self.digest = digest
+        self.program = program
+        self.users = 0
+        # last widget that uploaded its uniforms into the program
+        self.owner: "Shadertoy | None" = None
+
+
+class _ShareGroup:
+    """
+    GL objects shared by all contexts created for one window.
+
+    GTK creates every GLArea context of a window as shared with that
+    window's paint context, so compiled programs and the quad buffer can be
+    reused by every shader widget on it. Keyed by the paint context and
+    dropped when its last widget unrealizes.
+    """
+
+    groups: dict[Gdk.GLContext, "_ShareGroup"] = {}
+
+    def __init__(self, key: Gdk.GLContext):
+        self.key = key
+        self.users = 0
+        self.programs: dict[str, _CachedProgram] = {}
+
+        # this is not so good, unless the introduction of numpy, we must do
+        # a hack to generate an array GL would accept, I've tried using
+        # the "array" python library, but it doesn't seem to be working
+
+        # cast python type into GL type (list[float] -> arraybuf[GLfloat])
+        array_type = GL.GLfloat * len(QUAD_VERTICES)
+        self.quad_vbo = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.quad_vbo)
+        GL.glBufferData(
+            GL.GL_ARRAY_BUFFER,
+            len(QUAD_VERTICES) * 4,
+            array_type(*QUAD_VERTICES),
+            GL.GL_STATIC_DRAW,
+        )
+
+    @classmethod
+    def acquire(cls, ctx: Gdk.GLContext) -> "_ShareGroup":
+        # expects `ctx` to be current
+        key = ctx.get_shared_context() or ctx
+        group = cls.groups.get(key)
+        if group is None:
+            group = cls.groups[key] = cls(key)
+        group.users += 1
+        return group
+
+    def release(self):
+        # expects a context of the group to be current
+        self.users -= 1
+        if self.users > 0:
+            return
+        for cached in self.programs.values():
+            GL.glDeleteProgram(cached.program)
+        self.programs.clear()
+        GL.glDeleteBuffers(1, [self.quad_vbo])
+        self.groups.pop(self.key, None)
+
+
 class Shadertoy(Gtk.GLArea, Widget):
     @Signal  # pygobject signal
     def ready(self) -> None: ...
@@ -34,18 +122,48 @@ class Shadertoy(Gtk.GLArea, Widget):
     @shader_buffer.setter
     def shader_buffer(self, shader_buffer: str) -> None:
         self._shader_buffer = shader_buffer
-        if not self._ready:
+        if self._share_group is None:
             return
         self._shader_uniforms.clear()
-        self.do_realize()
-        self.queue_draw()
+        self.do_schedule_bake()
         return
 
+    @Property(int, "read-write")
+    def max_fps(self) -> int:
+        return self._max_fps
+
+    @max_fps.setter
+    def max_fps(self, value: int) -> None:
+        # 0 renders on every frame the compositor gives us
+        self._max_fps = max(0, int(value))
+
+    @Property(bool, "read-write", default_value=False)
+    def paused(self) -> bool:
+        return self._paused
+
+    @paused.setter
+    def paused(self, value: bool) -> None:
+        self._paused = bool(value)
+        if self._paused:
+            self.do_stop_ticking()
+        else:
+            self.do_start_ticking()
+            self.queue_draw()
+
+    @Property(float, "readable")
+    def frame_time_ms(self) -> float:
+        # moving average of the CPU time spent in do_render
+        return self._frame_time_ms
+
+    @Property(int, "readable")
+    def frame_count(self) -> int:
+        return self._frame_count
+
     # signatures for building a replica of shadertoy
     DEFAULT_VERTEX_SHADER = """
     #version 330
 
-    in vec2 position;
+    layout(location = 0) in vec2 position;
 
     void main() {
         gl_Position = vec4(position, 0.0, 1.0);
@@ -89,6 +207,8 @@ class Shadertoy(Gtk.GLArea, Widget):
             ]
         ]
         | None = None,
+        max_fps: int = 0,
+        pause_when_hidden: bool = True,
         name: str | None = None,
         visible: bool = True,
         all_visible: bool = False,
@@ -136,18 +256,47 @@ class Shadertoy(Gtk.GLArea, Widget):
 
         self._ready = False
         self._program = None
+        self._cached_program: _CachedProgram | None = None
+        self._share_group: _ShareGroup | None = None
+        self._bake_id = 0
         self._vao = None
-        self._quad_vbo = None
         self._texture_units = {}
 
+        # uniform state: values are only sent to GL when they change,
+        # locations are looked up once per baked program
+        self._uniform_values: dict[str, tuple[ShadertoyUniformType, object]] = {}
+        self._uniform_locations: dict[str, int] = {}
+        self._dirty_uniforms: set[str] = set()
+        self._uploaded_textures: dict[str, GdkPixbuf.Pixbuf] = {}
+
+        # the pointer is tracked through events instead of polled every frame
+        self._pointer = (0.0, 0.0)
+        self.add_events(Gdk.EventMask.POINTER_MOTION_MASK)
+        self.connect("motion-notify-event", self.on_motion)
+
+        # pacing
+        self._max_fps = max(0, int(max_fps))
+        self._paused = False
+        self._pause_when_hidden = pause_when_hidden
+        self._paused_at: float | None = None
+        self._last_queued = 0.0
+
         # timer
         self._start_time = GLib.get_monotonic_time() / 1e6
         self._frame_time = self._start_time
         self._frame_count = 0
+        self._frame_time_ms = 0.0
 
         # To avoid a constant framerate, we tell
-        # gtk to render a frame whenever possible
-        self._tick_id = self.add_tick_callback(lambda *_: (self.queue_draw(), True)[1])
+        # gtk to render a frame whenever possible, but only while there is
+        # something to render for; these bring the callback back
+        self._tick_id = 0
+        self._state_handler: tuple[Gtk.Window, int] | None = None
+        self.connect("map", self.on_visibility_changed)
+        self.connect("size-allocate", self.on_visibility_changed)
+        if pause_when_hidden:
+            self.connect("unmap", lambda *_: self.do_stop_ticking())
+        self.do_start_ticking()
 
     def do_bake_program(self):
         try:
@@ -167,59 +316,211 @@ class Shadertoy(Gtk.GLArea, Widget):
 
         return compileProgram(vertex_shader, fragment_shader)
 
+    def do_schedule_bake(self):
+        # a program some other widget already compiled is picked up right
+        # away, anything else is compiled once the main loop is idle so
+        # realizing the widget never waits on the driver
+        if self._share_group is None:
+            return
+        if self.program_digest() in self._share_group.programs:
+            self.make_current()
+            self.do_acquire_program()
+            return
+        if not self._bake_id:
+            self._bake_id = GLib.idle_add(
+                self.on_idle_bake, priority=GLib.PRIORITY_LOW
+            )
+
+    def on_idle_bake(self) -> bool:
+        self._bake_id = 0
+        if self._share_group is None:
+            return False
+        self.make_current()
+        try:
+            self.do_acquire_program()
+        except ShadertoyCompileError as e:
+            logger.error(str(e))
+            self.queue_draw()
+        return False
+
+    def program_digest(self) -> str:
+        return program_digest(
+            self.DEFAULT_VERTEX_SHADER,
+            self.DEFAULT_FRAGMENT_UNIFORMS
+            + self._shader_buffer
+            + self.FRAGMENT_MAIN_FUNCTION,
+        )
+
+    def do_acquire_program(self):
+        # expects the GL context to be current
+        group = cast(_ShareGroup, self._share_group)
+        digest = self.program_digest()
+        cached = group.programs.get(digest)
+        if cached is None:
+            cached = group.programs[digest] = _CachedProgram(
+                digest, self.do_bake_program()
+            )
+        cached.users += 1
+        self.do_release_program()
+        self._cached_program = cached
+        self._program = cached.program
+
+        # locations belong to the program, resolve them once here
+        self._uniform_locations = {
+            uname: GL.glGetUniformLocation(self._program, uname)
+            for uname in {*BUILTIN_UNIFORMS, *self._uniform_values}
+        }
+        self._dirty_uniforms = set(self._uniform_values)
+
+        self._ready = True
+        self.ready()
+        self.queue_draw()
+        return
+
+    def do_release_program(self):
+        # expects the GL context to be current
+        cached = self._cached_program
+        self._cached_program = None
+        self._program = None
+        if cached is None:
+            return
+        cached.users -= 1
+        if cached.owner is self:
+            cached.owner = None
+        if cached.users <= 0 and self._share_group is not None:
+            self._share_group.programs.pop(cached.digest, None)
+            GL.glDeleteProgram(cached.program)
+        return
+
     def do_realize(self, *_):
         Gtk.GLArea.do_realize(self)
-        if not self._ready:
-            ctx = self.get_context()
-            if (err := self.get_error()) or not ctx:
-                raise RuntimeError(
-                    f"couldn't initialize the drawing context, error: {err or 'context is None'}"
-                )
-
-            ctx.make_current()
+        ctx = self.get_context()
+        if (err := self.get_error()) or not ctx:
+            raise RuntimeError(
+                f"couldn't initialize the drawing context, error: {err or 'context is None'}"
+            )
 
-        if self._program:
-            GL.glDeleteProgram(self._program)
-            self._program = None
-        self._program = self.do_bake_program()
+        ctx.make_current()
 
         # NOTE: for this to work (alpha pixels) `self.set_has_alpha(True)` must be done
         # this breaks some fragment shaders, for some reason, so I'm leaving it for anyone willing to use
         GL.glEnable(GL.GL_BLEND)
         GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
 
-        self._quad_vbo = GL.glGenBuffers(1)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._quad_vbo)
-
-        # this is not so good, unless the introduction of numpy, we must do
-        # a hack to generate an array GL would accept, I've tried using
-        # the "array" python library, but it doesn't seem to be working
-
-        # cast python type into GL type (list[float] -> arraybuf[GLfloat])
-        quad_verts = (-1.0, -1.0, 1.0, -1.0, -1.0, 1.0, 1.0, 1.0)
-        array_type = GL.GLfloat * len(quad_verts)
-
-        GL.glBufferData(
-            GL.GL_ARRAY_BUFFER,
-            len(quad_verts) * 4,
-            array_type(*quad_verts),
-            GL.GL_STATIC_DRAW,
-        )
-
+        # the quad buffer lives in the share group, but vertex arrays
+        # can't be shared so every context points its own at it
+        self._share_group = _ShareGroup.acquire(ctx)
         self._vao = GL.glGenVertexArrays(1)
         GL.glBindVertexArray(self._vao)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._share_group.quad_vbo)
+        GL.glEnableVertexAttribArray(POSITION_LOCATION)
+        GL.glVertexAttribPointer(
+            POSITION_LOCATION, 2, GL.GL_FLOAT, GL.GL_FALSE, 0, None
+        )
 
-        position = GL.glGetAttribLocation(self._program, "position")
-        GL.glEnableVertexAttribArray(position)
-        GL.glVertexAttribPointer(position, 2, GL.GL_FLOAT, GL.GL_FALSE, 0, None)
+        # textures of a previous context are gone
+        self._texture_units.clear()
+        self._uploaded_textures.clear()
 
         for uname, utype, uvalue in self._shader_uniforms:
             self.set_uniform(uname, utype, uvalue)  # type: ignore
 
-        self._ready = True
-        self.ready()
+        # iconifying the toplevel hides us without an unmap
+        toplevel = self.get_toplevel()
+        if isinstance(toplevel, Gtk.Window):
+            self._state_handler = (
+                toplevel,
+                toplevel.connect("window-state-event", self.on_visibility_changed),
+            )
+
+        self.do_schedule_bake()
         return
 
+    def do_unrealize(self):
+        if self._bake_id:
+            GLib.source_remove(self._bake_id)
+            self._bake_id = 0
+        if self._state_handler is not None:
+            toplevel, handler_id = self._state_handler
+            toplevel.disconnect(handler_id)
+            self._state_handler = None
+
+        self.make_current()
+        if self.get_error() is None and self._share_group is not None:
+            self.do_release_program()
+            if self._vao is not None:
+                GL.glDeleteVertexArrays(1, [self._vao])
+            textures = [texture for _, texture in self._texture_units.values()]
+            if textures:
+                GL.glDeleteTextures(len(textures), textures)
+            self._share_group.release()
+
+        self._share_group = None
+        self._cached_program = None
+        self._program = None
+        self._vao = None
+        self._texture_units.clear()
+        self._uploaded_textures.clear()
+        self._ready = False
+        Gtk.GLArea.do_unrealize(self)
+        return
+
+    def on_motion(self, _widget, event: Gdk.EventMotion):
+        self._pointer = (event.x, event.y)
+        return False
+
+    def is_hidden(self) -> bool:
+        if not self.get_mapped():
+            return True
+        alloc = self.get_allocation()
+        if alloc.width <= 1 or alloc.height <= 1:  # type: ignore
+            return True
+        window = self.get_window()
+        if window is None:
+            return True
+        state = window.get_toplevel().get_state()
+        return bool(state & (Gdk.WindowState.ICONIFIED | Gdk.WindowState.WITHDRAWN))
+
+    def do_start_ticking(self):
+        if self._tick_id or self._paused or (self._pause_when_hidden and self.is_hidden()):
+            return
+        self._tick_id = self.add_tick_callback(self.on_tick)
+
+    def do_stop_ticking(self):
+        if self._paused_at is None:
+            self._paused_at = GLib.get_monotonic_time() / 1e6
+        if self._tick_id:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = 0
+
+    def on_visibility_changed(self, *_) -> bool:
+        self.do_start_ticking()
+        return False
+
+    def on_tick(self, _widget, _frame_clock) -> bool:
+        now = GLib.get_monotonic_time() / 1e6
+        if self._paused or (self._pause_when_hidden and self.is_hidden()):
+            # stop waking up the frame clock until we're shown or resumed
+            if self._paused_at is None:
+                self._paused_at = now
+            self._tick_id = 0
+            return False
+
+        if self._paused_at is not None:
+            # freeze the playback clock while nothing was drawn
+            skipped = now - self._paused_at
+            self._start_time += skipped
+            self._frame_time += skipped
+            self._paused_at = None
+
+        # small slack so a 30fps cap doesn't drop to 20 on a 60Hz clock
+        if self._max_fps and now - self._last_queued < (1.0 / self._max_fps) - 0.002:
+            return True
+
+        self._last_queued = now
+        self.queue_draw()
+        return True
+
     def do_get_timing(self) -> tuple[float, float, float]:
         current_time = GLib.get_monotonic_time() / 1e6
         delta_time = current_time - self._frame_time
@@ -231,43 +532,58 @@ class Shadertoy(Gtk.GLArea, Widget):
         return
 
     def do_render(self, ctx: Gdk.GLContext):
+        if not self._program and self._bake_id:
+            # still compiling, show nothing instead of garbage
+            GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+            return True
         if not self._program:
             if self._tick_id:
                 self.remove_tick_callback(self._tick_id)
             self._tick_id = 0
             return False
 
+        render_start = time.perf_counter()
         GL.glUseProgram(self._program)
 
         # clear up for next frame
         GL.glClear(GL.GL_COLOR_BUFFER_BIT)
 
+        # programs are shared, so another widget may have left its own
+        # values in them since our last frame
+        cached = cast(_CachedProgram, self._cached_program)
+        if cached.owner is not self:
+            cached.owner = self
+            self._dirty_uniforms.update(self._uniform_values)
+
         alloc = self.get_allocation()
         width: int = alloc.width  # type: ignore
         height: int = alloc.height  # type: ignore
-        mouse_pos = cast(tuple[int, int], self.get_pointer())
 
         current_time, delta_time, frame_rate = self.do_get_timing()
 
-        self.set_uniform(
+        self.do_store_uniform(
             "iTime", ShadertoyUniformType.FLOAT, current_time - self._start_time
         )
-        self.set_uniform("iFrame", ShadertoyUniformType.INTEGER, self._frame_count)
-        self.set_uniform("iTimeDelta", ShadertoyUniformType.FLOAT, delta_time)
-        self.set_uniform("iFrameRate", ShadertoyUniformType.FLOAT, frame_rate)
-        self.set_uniform(
+        self.do_store_uniform("iFrame", ShadertoyUniformType.INTEGER, self._frame_count)
+        self.do_store_uniform("iTimeDelta", ShadertoyUniformType.FLOAT, delta_time)
+        self.do_store_uniform("iFrameRate", ShadertoyUniformType.FLOAT, frame_rate)
+        self.do_store_uniform(
             "iResolution", ShadertoyUniformType.VECTOR, (width, height, 1.0)
         )
-        self.set_uniform(
+        self.do_store_uniform(
             "iMouse",
             ShadertoyUniformType.VECTOR,
-            (mouse_pos[0], height - mouse_pos[1], 0, 0),
+            (self._pointer[0], height - self._pointer[1], 0, 0),
         )
+        self.do_upload_uniforms()
 
         # paint the quad
         GL.glBindVertexArray(self._vao)
         GL.glDrawArrays(GL.GL_TRIANGLE_STRIP, 0, 4)
         self.do_post_render(current_time)
+
+        elapsed_ms = (time.perf_counter() - render_start) * 1000
+        self._frame_time_ms += (elapsed_ms - self._frame_time_ms) * FRAME_TIME_SMOOTHING
         return True
 
     def do_resize(self, width: int, height: int):
@@ -307,61 +623,96 @@ class Shadertoy(Gtk.GLArea, Widget):
         type: ShadertoyUniformType,
         value: bool | float | int | tuple[float, ...] | GdkPixbuf.Pixbuf,
     ):
-        if not self._program:
-            raise RuntimeError("the shader program is not initialized")
-        GL.glUseProgram(self._program)
-        location = GL.glGetUniformLocation(self._program, name)
-        match type:
-            case ShadertoyUniformType.VECTOR:
-                value = cast(tuple[float, ...], value)
-                (
-                    GL.glUniform2f
-                    if (vlen := len(value)) == 2
-                    else GL.glUniform3f
-                    if vlen == 3
-                    else GL.glUniform4f
-                )(location, *value)
-            case ShadertoyUniformType.FLOAT:
-                GL.glUniform1f(location, value)
-            case ShadertoyUniformType.INTEGER:
-                GL.glUniform1i(location, value)
-            case ShadertoyUniformType.TEXTURE:
-                # who dislikes boilerplate?
-                value = cast(GdkPixbuf.Pixbuf, value).flip(False)
-                format = GL.GL_RGBA if value.get_has_alpha() else GL.GL_RGB
-
-                if name not in self._texture_units:
-                    texture = GL.glGenTextures(1)
-                    self._texture_units[name] = (len(self._texture_units), texture)
-                else:
-                    texture_unit, texture = self._texture_units[name]
-
-                texture_unit = self._texture_units[name][0]
-                GL.glActiveTexture(GL.GL_TEXTURE0 + texture_unit)
-                GL.glBindTexture(GL.GL_TEXTURE_2D, texture)
-
-                GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_REPEAT)
-                GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_REPEAT)
-                GL.glTexParameteri(
-                    GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR
-                )
-                GL.glTexParameteri(
-                    GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR
-                )
+        # values are only recorded here and sent with the next frame,
+        # which is also the only time the GL context is guaranteed current
+        if self.do_store_uniform(name, type, value) and self._ready:
+            self.queue_draw()
 
-                # "upload" the texture
-                GL.glTexImage2D(
-                    GL.GL_TEXTURE_2D,
-                    0,  # detail level (woah?)
-                    format,  # result format
-                    value.get_width(),
-                    value.get_height(),
-                    0,  # "border"
-                    format,  # input format
-                    GL.GL_UNSIGNED_BYTE,
-                    value.get_pixels(),
+    def do_store_uniform(self, name: str, type: ShadertoyUniformType, value) -> bool:
+        if self._uniform_values.get(name) == (type, value):
+            return False
+        self._uniform_values[name] = (type, value)
+        self._dirty_uniforms.add(name)
+        return True
+
+    def do_upload_uniforms(self):
+        # expects the program to be in use
+        for name in self._dirty_uniforms:
+            type, value = self._uniform_values[name]
+            location = self._uniform_locations.get(name)
+            if location is None:
+                location = self._uniform_locations[name] = GL.glGetUniformLocation(
+                    self._program, name
                 )
-                GL.glGenerateMipmap(GL.GL_TEXTURE_2D)
+            match type:
+                case ShadertoyUniformType.VECTOR:
+                    if location == -1:
+                        continue
+                    value = cast(tuple[float, ...], value)
+                    (
+                        GL.glUniform2f
+                        if (vlen := len(value)) == 2
+                        else GL.glUniform3f
+                        if vlen == 3
+                        else GL.glUniform4f
+                    )(location, *value)
+                case ShadertoyUniformType.FLOAT:
+                    if location != -1:
+                        GL.glUniform1f(location, value)
+                case ShadertoyUniformType.INTEGER:
+                    if location != -1:
+                        GL.glUniform1i(location, value)
+                case ShadertoyUniformType.TEXTURE:
+                    texture_unit = self.do_upload_texture(
+                        name, cast(GdkPixbuf.Pixbuf, value)
+                    )
+                    # all aboard...
+                    if location != -1:
+                        GL.glUniform1i(location, texture_unit)
+        self._dirty_uniforms.clear()
+
+        # gtk uses the texture units for its own compositing between our
+        # frames, so the bindings are restored every frame (no uploads)
+        for texture_unit, texture in self._texture_units.values():
+            GL.glActiveTexture(GL.GL_TEXTURE0 + texture_unit)
+            GL.glBindTexture(GL.GL_TEXTURE_2D, texture)
+        return
+
+    def do_upload_texture(self, name: str, pixbuf: GdkPixbuf.Pixbuf) -> int:
+        if name not in self._texture_units:
+            texture = GL.glGenTextures(1)
+            self._texture_units[name] = (len(self._texture_units), texture)
+        texture_unit, texture = self._texture_units[name]
+
+        # the same pixbuf is only flipped and uploaded once
+        if self._uploaded_textures.get(name) is pixbuf:
+            return texture_unit
+
+        # who dislikes boilerplate?
+        flipped = pixbuf.flip(False)
+        format = GL.GL_RGBA if flipped.get_has_alpha() else GL.GL_RGB
+
+        GL.glActiveTexture(GL.GL_TEXTURE0 + texture_unit)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, texture)
+
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_REPEAT)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_REPEAT)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+
+        # "upload" the texture
+        GL.glTexImage2D(
+            GL.GL_TEXTURE_2D,
+            0,  # detail level (woah?)
+            format,  # result format
+            flipped.get_width(),
+            flipped.get_height(),
+            0,  # "border"
+            format,  # input format
+            GL.GL_UNSIGNED_BYTE,
+            flipped.get_pixels(),
+        )
+        GL.glGenerateMipmap(GL.GL_TEXTURE_2D)
 
-                # all aboard...
-                GL.glUniform1i(location, texture_unit)
+        self._uploaded_textures[name] = pixbuf
+        return texture_unit